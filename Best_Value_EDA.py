@@ -1,44 +1,51 @@
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from storage import latest_version, read_dataset
+from ranking import top_n
+
 DATA_FILE = "banggood_transformed_data.csv"
+COLUMNS = ['Category', 'Name', 'Price', 'Reviews']  # Only what this analysis reads
 sns.set_style("whitegrid")
 
-def load_data(file_path):
+def load_data(file_path, columns=None):
     try:
-        df = pd.read_csv(file_path)
+        df = read_dataset(latest_version(file_path), columns=columns)
         return df
     except FileNotFoundError:
         print(f"❌ Error: File '{file_path}' not found.")
         return None
 
-def analyze_best_value(df):
+def summarize_best_value(df, by_category=None):
+    """Ranks the best-value product of each category without modifying `df`."""
+    # Tabular Analysis: Best Value in Each Category (partial selection, no full sort)
+    best_value_per_category = top_n(df, 'Value_Metric', n=1, by='Category', columns=['Category', 'Name', 'Price', 'Reviews'])
+    return {'best_value': best_value_per_category.sort_values(by='Value_Metric', ascending=False)}
+
+def plot_best_value(df, summary):
+    # Visualization: Bar Plot of Best Value Products
+    fig = plt.figure(figsize=(10, 6))
+    sns.barplot(x='Value_Metric', y='Category', data=summary['best_value'], palette='viridis')
+    plt.title('Best Value Metric (Reviews/Price) by Category')
+    plt.xlabel('Max Value Metric (Reviews per Dollar)')
+    plt.ylabel('Category')
+    return fig
+
+def analyze_best_value(df, summary=None, plot=True):
     """Calculates and ranks products by the 'Reviews per Dollar' metric."""
+    summary = summary or summarize_best_value(df)
     print("\n" + "="*50)
     print("## 4. Best Value Metric (Reviews per Dollar) 🏆")
     
-    # Create the Value Metric
-    df['Value_Metric'] = df['Reviews'] / df['Price']
-    df['Value_Metric'].replace([np.inf, -np.inf], 0, inplace=True)
-
-    # Tabular Analysis: Best Value in Each Category
-    best_value_per_category = df.loc[df.groupby('Category')['Value_Metric'].idxmax()]
-    
     print("\n--- Best Value Product in Each Category (Highest Reviews/Price) ---")
-    best_value_display = best_value_per_category[['Category', 'Name', 'Price', 'Reviews', 'Value_Metric']].sort_values(by='Value_Metric', ascending=False)
-    print(best_value_display)
+    print(summary['best_value'])
     
-    # Visualization: Bar Plot of Best Value Products
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x='Value_Metric', y='Category', data=best_value_display, palette='viridis')
-    plt.title('Best Value Metric (Reviews/Price) by Category')
-    plt.xlabel('Max Value Metric (Reviews per Dollar)')
-    plt.ylabel('Category')
-    plt.show()
+    if plot:
+        plot_best_value(df, summary)
+        plt.show()
 
 if __name__ == "__main__":
-    df = load_data(DATA_FILE)
+    df = load_data(DATA_FILE, columns=COLUMNS)
     if df is not None:
-        analyze_best_value(df.copy())
\ No newline at end of file
+        analyze_best_value(df)
\ No newline at end of file
@@ -1,11 +1,23 @@
+import io
+import argparse
+import contextlib
 import pandas as pd
 import numpy as np
 
+from storage import FORMATS, latest_version, read_dataset, remove_versions, with_format, write_dataset
+from instrumentation import print_summary, span
+
+RAW_FILE = "banggood_5_categories.csv"
+OUTPUT_FILE = "banggood_transformed_data.csv"
+# Incremental mode: only the products the scraper flagged as new/changed
+CHANGES_FILE = "banggood_changed_products.csv"
+OUTPUT_CHANGES_FILE = "banggood_transformed_changes.csv"
+
 # --- 1. Load Scraped Data ---
-def load_data(file_path="banggood_5_categories.csv"):
-    """Loads the data and prints initial info."""
+def load_data(file_path=RAW_FILE):
+    """Loads the data and prints initial info (from a Parquet/Arrow copy if that is newer)."""
     try:
-        df = pd.read_csv(file_path)
+        df = read_dataset(latest_version(file_path))
         print(f"✅ Data loaded successfully. Shape: {df.shape}")
         print("\n--- Initial Missing Values ---")
         print(df.isnull().sum())
@@ -56,7 +68,33 @@ def clean_data(df):
     return df
 
 # --- 3. Create Additional Derived Features ---
-def feature_engineering(df):
+PRICE_BINS = [0, 10, 50, 200]
+PRICE_LABELS = ['Budget (<$10)', 'Mid-Range ($10-50)', 'Premium ($50-200)', 'High-End (>$200)']
+
+def price_segment(prices, last_bin=None):
+    """Bins prices into the four PRICE_LABELS segments.
+
+    The last edge only has to lie above every price being binned, so it can be
+    derived from `prices` (default) or passed in, e.g. np.inf when prices
+    arrive in chunks and the global max is not known yet.
+    """
+    # Rationale: The original bins failed if df['Price'].max() <= 200.
+    bins = list(PRICE_BINS)
+    
+    if last_bin is None:
+        # 💡 FIX: Ensure the final bin edge is strictly greater than the preceding one (200).
+        max_price_plus_one = prices.max() + 1
+        
+        # If the max price is 150, last_bin becomes max(201, 151) = 201.
+        # If the max price is 500, last_bin becomes max(201, 501) = 501.
+        # This prevents the non-monotonic error.
+        last_bin = max(201, max_price_plus_one) 
+    
+    bins.append(last_bin) # Add the safe last bin
+
+    return pd.cut(prices, bins=bins, labels=PRICE_LABELS, right=False, include_lowest=True)
+
+def feature_engineering(df, last_bin=None):
     """Creates new, insightful features."""
     if df.empty:
         return df
@@ -64,22 +102,7 @@ def feature_engineering(df):
     print("\n--- Creating Derived Features ---")
     
     # FEATURE 1: Price Segment (Categorical feature based on price)
-    # Rationale: The original bins failed if df['Price'].max() <= 200.
-    
-    bins = [0, 10, 50, 200]
-    labels = ['Budget (<$10)', 'Mid-Range ($10-50)', 'Premium ($50-200)', 'High-End (>$200)']
-    
-    # 💡 FIX: Ensure the final bin edge is strictly greater than the preceding one (200).
-    max_price_plus_one = df['Price'].max() + 1
-    
-    # If the max price is 150, last_bin becomes max(201, 151) = 201.
-    # If the max price is 500, last_bin becomes max(201, 501) = 501.
-    # This prevents the non-monotonic error.
-    last_bin = max(201, max_price_plus_one) 
-    
-    bins.append(last_bin) # Add the safe last bin
-
-    df['Price_Segment'] = pd.cut(df['Price'], bins=bins, labels=labels, right=False, include_lowest=True)
+    df['Price_Segment'] = price_segment(df['Price'], last_bin)
     print("    - Feature 'Price_Segment' created.")
 
     # FEATURE 2: Product Name Length (Numeric feature)
@@ -95,18 +118,167 @@ def feature_engineering(df):
 
     return df
 
+# --- 4. Vectorized Engine (same output, no per-row Python) ---
+def clean_data_vectorized(df):
+    """Same result as clean_data(), using .str regex extraction instead of a per-row apply."""
+    if df.empty:
+        return df
+
+    print("\n--- Starting Data Cleaning ---")
+
+    # A. Clean 'Price': keep digits and '.', then convert only strings float() accepts
+    raw_price = df['Price']
+    cleaned = raw_price.astype(str).str.replace(r'[^\d.]', '', regex=True)
+    valid = cleaned.str.fullmatch(r'\d+\.?\d*|\.\d+') & raw_price.notna() & (raw_price != 'N/A')
+    price = pd.Series(np.nan, index=df.index)
+    price[valid] = cleaned[valid].astype(float)
+    df['Price'] = price
+    print(f"    - Price cleaned: Converted to numeric (float). Missing values: {df['Price'].isnull().sum()}")
+
+    # B. Clean 'Rating' and 'Reviews'
+    df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce').fillna(0.0)
+    df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce').fillna(0).astype(int)
+
+    # C. Handle Missing Values
+    df.dropna(subset=['Name', 'Price'], inplace=True)
+    df['URL'] = df['URL'].fillna('NO_URL_FOUND')
+
+    print(f"    - Cleaned shape after dropping critical NaNs: {df.shape}")
+    print("    - Rating and Reviews standardized (filled NaNs with 0).")
+    return df
+
+def feature_engineering_vectorized(df, last_bin=None):
+    """Same result as feature_engineering(), using .str.len() and array arithmetic."""
+    if df.empty:
+        return df
+
+    print("\n--- Creating Derived Features ---")
+
+    df['Price_Segment'] = price_segment(df['Price'], last_bin)
+    print("    - Feature 'Price_Segment' created.")
+
+    name = df['Name']
+    df['Name_Length'] = name.astype(str).str.len().where(name.notna(), 0).astype('int64')
+    print("    - Feature 'Name_Length' created.")
+
+    length = df['Name_Length']
+    df['Price_Per_Char'] = np.where(length > 0, df['Price'] / length.where(length > 0, 1), 0.0)
+    print("    - Feature 'Price_Per_Char' created.")
+
+    return df
+
+# Engine name -> (clean, featurize)
+ENGINES = {
+    'python': (clean_data, feature_engineering),
+    'vectorized': (clean_data_vectorized, feature_engineering_vectorized),
+}
+
+# --- 5. Chunked Streaming Mode ---
+CHUNK_SIZE = 100_000
+# Text columns are read as str so every chunk sees the same dtypes as a full read
+RAW_DTYPES = {'Category': str, 'Name': str, 'Price': str, 'URL': str}
+
+def transform_in_chunks(input_file=RAW_FILE, output_file=OUTPUT_FILE, chunksize=CHUNK_SIZE, engine='vectorized', stats=None):
+    """Cleans and featurizes the raw CSV chunk by chunk, appending each chunk to `output_file`.
+
+    Only one chunk is held in memory at a time. Price_Segment is the one
+    feature that depends on a global statistic (the max price sets the last
+    bin edge); since that edge only has to lie above every price, chunks are
+    binned with an open last edge (np.inf), which yields the same labels as a
+    full-file run. If `stats` (an online_stats.OnlineSummary) is given, it is
+    updated with every transformed chunk, so summaries need no second pass.
+    """
+    clean, featurize = ENGINES[engine]
+    rows_in = rows_out = 0
+    header_written = False
+
+    print(f"\n--- Streaming '{input_file}' in chunks of {chunksize:,} rows ---")
+    remove_versions(output_file, keep=['csv'])  # Columnar copies of an earlier run would be preferred by readers
+    with open(output_file, 'w', encoding='utf-8', newline='') as out:
+        for i, chunk in enumerate(pd.read_csv(input_file, chunksize=chunksize, dtype=RAW_DTYPES)):
+            chunk_rows = len(chunk)
+            with contextlib.redirect_stdout(io.StringIO()):  # Per-stage prints would repeat every chunk
+                with span('clean', rows=chunk_rows, engine=engine, chunk=i + 1):
+                    df = clean(chunk)
+                with span('featurize', rows=len(df), engine=engine, chunk=i + 1):
+                    df = featurize(df, last_bin=np.inf)
+            rows_in += chunk_rows
+            if df.empty:
+                continue
+            df.to_csv(out, header=not header_written, index=False)
+            header_written = True
+            if stats is not None:
+                stats.update(df)
+            rows_out += len(df)
+            print(f"    - Chunk {i + 1}: {chunk_rows:,} rows in, {len(df):,} rows out")
+
+    print(f"✅ Streamed {rows_in:,} rows in, {rows_out:,} rows written to '{output_file}'")
+    return rows_in, rows_out
+
 # --- Main Execution ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean and featurize the scraped Banggood data.")
+    parser.add_argument("--incremental", action="store_true", help="Process only the new/changed products from the last scrape.")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="vectorized", help="Row-wise 'python' functions or the 'vectorized' engine.")
+    parser.add_argument("--stream", action="store_true", help="Process the input in fixed-size chunks with bounded memory (CSV in and out).")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="Rows per chunk in --stream mode.")
+    parser.add_argument("--stats", action="store_true", help="With --stream, also print one-pass price summaries of the output.")
+    parser.add_argument("--format", choices=sorted(FORMATS), nargs='+', default=["csv"], help="Extra output format(s), next to the CSV; Parquet/Arrow keep dtypes such as the Price_Segment categorical.")
+    parser.add_argument("--compact", action="store_true", help="Write Parquet/Arrow copies in the compact layout (categoricals, Arrow strings, Product_ID instead of URL).")
+    parser.add_argument("--dedup", choices=["exact", "near"], default=None, help="Drop repeated products before cleaning: same product ID ('exact'), or also similar names of rows without one ('near').")
+    parser.add_argument("--history", action="store_true", help="Also append the transformed data to the price history (see price_history.py).")
+    args = parser.parse_args()
+    if args.dedup and args.stream:
+        parser.error("--dedup needs the whole scrape in memory and cannot be combined with --stream.")
+    if args.stream and (set(args.format) != {'csv'} or args.compact):
+        parser.error("--stream writes CSV only; run without it for Parquet/Arrow copies (--format, --compact).")
+    if args.history and args.incremental:
+        parser.error("--history needs the full scrape; with --incremental every unchanged product would count as delisted.")
+    clean, featurize = ENGINES[args.engine]
+
+    input_file, output_file = (CHANGES_FILE, OUTPUT_CHANGES_FILE) if args.incremental else (RAW_FILE, OUTPUT_FILE)
+
+    if args.stream:
+        try:
+            stats = None
+            if args.stats:
+                from online_stats import OnlineSummary
+                stats = OnlineSummary()
+            transform_in_chunks(input_file, output_file, chunksize=args.chunksize, engine=args.engine, stats=stats)
+            if stats is not None:
+                print("\n--- Price per Category (one pass, median approximate) ---")
+                print(stats.describe('Price', 'Category').sort_values(by='mean', ascending=False))
+            if args.history:
+                from price_history import VALUE_COLUMNS, append_snapshot, report_snapshot
+                report_snapshot(*append_snapshot(read_dataset(output_file, columns=VALUE_COLUMNS + ['URL'])))
+        except FileNotFoundError:
+            print(f"❌ Error: File not found at {input_file}. Ensure the scraping script ran.")
+        print_summary("CLEANING TIMING")
+        raise SystemExit(0)
     
     # 1. Load Data
-    df_raw = load_data()
+    df_raw = load_data(input_file)
+
+    if df_raw.empty and args.incremental:
+        # Don't let the loader pick up the previous run's changes
+        remove_versions(output_file)
+        print("\nℹ️ No new or changed products since the last run.")
+
+    if not df_raw.empty and args.dedup:
+        from dedup import deduplicate, report_duplicates
+        with span('dedup', rows=len(df_raw), mode=args.dedup):
+            deduped, duplicates = deduplicate(df_raw, near=args.dedup == 'near')
+        report_duplicates(df_raw, duplicates)
+        df_raw = deduped
 
     if not df_raw.empty:
         # 2. Clean Data
-        df_cleaned = clean_data(df_raw.copy())
+        with span('clean', rows=len(df_raw), engine=args.engine):
+            df_cleaned = clean(df_raw.copy())
 
         # 3. Create Features
-        df_final = feature_engineering(df_cleaned.copy())
+        with span('featurize', rows=len(df_cleaned), engine=args.engine):
+            df_final = featurize(df_cleaned.copy())
 
         # --- Final Summary ---
         print("\n--- FINAL DATASET SUMMARY ---")
@@ -116,6 +288,20 @@ if __name__ == "__main__":
         print("\nExample Data:")
         print(df_final[['Category', 'Name', 'Price', 'Price_Segment', 'Name_Length', 'Price_Per_Char']].head())
         
-        # Save the final transformed data
-        df_final.to_csv("banggood_transformed_data.csv", index=False)
-        print("\n✅ Transformed data saved to 'banggood_transformed_data.csv'")
\ No newline at end of file
+        # Save the final transformed data, always with a CSV export; copies in other formats would be stale
+        formats = sorted(set(args.format) | {'csv'})
+        remove_versions(output_file, keep=formats)
+        for fmt in formats:
+            data = df_final
+            if args.compact and fmt != 'csv':
+                from compact_frame import compact_frame
+                data = compact_frame(df_final)
+            saved_file = write_dataset(data, with_format(output_file, fmt))
+            print(f"\n✅ Transformed data saved to '{saved_file}'")
+
+        if args.history:
+            from price_history import append_snapshot, report_snapshot
+            with span('history', rows=len(df_final)):
+                report_snapshot(*append_snapshot(df_final))
+
+    print_summary("CLEANING TIMING")
\ No newline at end of file
@@ -0,0 +1,166 @@
+import os
+import html
+import base64
+import argparse
+import multiprocessing
+from time import perf_counter
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # Headless: never open a window, safe in scheduled jobs and worker processes
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from EDA_Runner import ANALYSES, DATA_FILE, compute_summaries, load_shared
+from eda_cache import AggregateCache
+from instrumentation import print_summary, record_span, span
+from storage import latest_version
+
+REPORT_DIR = "eda_report"
+REPORT_FILE = "report.html"
+IMAGE_FORMATS = ['png', 'svg']
+
+# Report section titles, in ANALYSES order
+TITLES = {
+    'price_distribution': "1. Price Distribution per Category",
+    'rating_vs_price': "2. Rating vs. Price Correlation",
+    'top_reviewed': "3. Most Reviewed Products",
+    'best_value': "4. Best Value Metric (Reviews per Dollar)",
+    'stock_proxy': "5. Product Detail Analysis (Name Length Proxy)",
+}
+
+# --- 1. Chart Rendering (worker processes) ---
+def render_chart(name, df, summary, output_dir, image_format='png', dpi=100):
+    """Draws one analysis chart and saves it to `output_dir`. Returns (file path, seconds)."""
+    start = perf_counter()
+    fig = ANALYSES[name][3](df, summary)
+    file_path = os.path.join(output_dir, f"{name}.{image_format}")
+    fig.savefig(file_path, format=image_format, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return file_path, perf_counter() - start
+
+def render_charts(df, summaries, output_dir, image_format='png', max_workers=None):
+    """Renders every chart in its own process. Returns {name: (file path, seconds)}.
+
+    Each worker gets only the columns its analysis reads. Workers are
+    spawned, not forked: the pipeline calls this from a worker thread while
+    other threads (the load, the event log writer) may hold locks a forked
+    child would inherit locked.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {
+            name: executor.submit(render_chart, name, df[ANALYSES[name][0].COLUMNS], summary, output_dir, image_format)
+            for name, summary in summaries.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+# --- 2. HTML Assembly ---
+def summary_html(summary):
+    """Tables for the DataFrame/Series entries of a summary, plain text for scalars."""
+    parts = []
+    for key, value in summary.items():
+        label = html.escape(key.replace('_', ' ').capitalize())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            table = value.to_frame() if isinstance(value, pd.Series) else value
+            parts.append(f"<h3>{label}</h3>\n{table.to_html(float_format=lambda x: f'{x:,.3f}', na_rep='-', border=0)}")
+        elif isinstance(value, float):
+            parts.append(f"<p><b>{label}:</b> {value:.3f}</p>")
+        elif key != 'n':
+            parts.append(f"<p><b>{label}:</b> {html.escape(str(value))}</p>")
+    return "\n".join(parts)
+
+def image_html(file_path):
+    """Embeds an image as a data URI, so the report is one self-contained file."""
+    mime = 'image/svg+xml' if file_path.endswith('.svg') else 'image/png'
+    with open(file_path, 'rb') as f:
+        data = base64.b64encode(f.read()).decode('ascii')
+    return f'<img src="data:{mime};base64,{data}" alt="{html.escape(os.path.basename(file_path))}">'
+
+def build_report(summaries, charts, timings, n_rows, data_file):
+    sections = []
+    for name, summary in summaries.items():
+        chart = image_html(charts[name][0]) if name in charts else ""
+        sections.append(f"<section>\n<h2>{html.escape(TITLES[name])}</h2>\n{summary_html(summary)}\n{chart}\n</section>")
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Banggood EDA Report</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }}
+table {{ border-collapse: collapse; margin-bottom: 1em; font-size: 0.9em; }}
+th, td {{ padding: 4px 10px; border-bottom: 1px solid #ddd; text-align: right; }}
+img {{ max-width: 100%; }}
+section {{ margin-bottom: 3em; }}
+</style>
+</head>
+<body>
+<h1>Banggood EDA Report</h1>
+<p>{n_rows:,} products from <code>{html.escape(data_file)}</code>, generated {datetime.now():%Y-%m-%d %H:%M}.</p>
+{chr(10).join(sections)}
+<h2>Timing (seconds)</h2>
+{timings.to_html(float_format=lambda x: f'{x:.4f}', border=0)}
+</body>
+</html>
+"""
+
+# --- 3. Report Pipeline ---
+def generate_report(names=tuple(ANALYSES), data_file=DATA_FILE, output_dir=REPORT_DIR, image_format='png', max_workers=None, charts=True, cache=None):
+    """Loads the data once, computes the summaries, renders the charts in parallel and writes one HTML report.
+
+    Summaries found in `cache` (an AggregateCache) for the current data are
+    reused. Returns the report path, or None when the data file is missing.
+    """
+    start = perf_counter()
+    with span('eda.load', rows=None) as s:
+        df = load_shared(names, data_file)
+        s.rows = len(df) if df is not None else None
+    if df is None:
+        return None
+    timings = {'load': {'summary': perf_counter() - start, 'render': 0.0}}
+
+    fingerprint = cache.fingerprint(latest_version(data_file)) if cache is not None else None
+    summaries, summary_secs = compute_summaries(df, names, cache=cache, fingerprint=fingerprint)
+    timings['shared aggregates'] = {'summary': summary_secs['shared aggregates'], 'render': 0.0}
+
+    start = perf_counter()
+    rendered = render_charts(df, summaries, output_dir, image_format, max_workers) if charts else {}
+    wall_render = perf_counter() - start
+    for name in names:
+        timings[name] = {'summary': summary_secs[name], 'render': rendered[name][1] if name in rendered else 0.0}
+        if name in rendered:
+            record_span(f'eda.{name}.render', rendered[name][1], image_format=image_format)
+    timings = pd.DataFrame(timings).T
+    timings.loc['charts (wall clock)'] = [0.0, wall_render]
+
+    os.makedirs(output_dir, exist_ok=True)
+    report_path = os.path.join(output_dir, REPORT_FILE)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(build_report(summaries, rendered, timings, len(df), data_file))
+
+    print(timings.round(4))
+    return report_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the EDA analyses headlessly into one static HTML report.")
+    parser.add_argument("--analyses", nargs='+', choices=list(ANALYSES), default=list(ANALYSES), help="Analyses to include (default: all).")
+    parser.add_argument("--input", default=DATA_FILE, help="Transformed dataset (its newest CSV/Parquet/Arrow copy is used).")
+    parser.add_argument("--output-dir", default=REPORT_DIR, help="Directory for the chart files and report.html.")
+    parser.add_argument("--image-format", choices=IMAGE_FORMATS, default='png', help="Chart file format.")
+    parser.add_argument("--workers", type=int, default=None, help="Chart rendering processes (default: one per CPU).")
+    parser.add_argument("--no-charts", action="store_true", help="Tables only.")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every summary instead of using the aggregate cache.")
+    args = parser.parse_args()
+
+    names = [name for name in ANALYSES if name in args.analyses]
+    print("--- HEADLESS EDA REPORT ---")
+    cache = None if args.no_cache else AggregateCache()
+    report_path = generate_report(names, args.input, args.output_dir, args.image_format, args.workers, charts=not args.no_charts, cache=cache)
+    if report_path:
+        print(f"✅ Report written to '{report_path}'")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Aggregate cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+    print_summary("REPORT TIMING")
\ No newline at end of file
@@ -0,0 +1,198 @@
+import inspect
+import argparse
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+import Price_Distribution_EDA
+import Rating_Price_Correlation_EDA
+import Top_Reviewed_EDA
+import Best_Value_EDA
+import Stock_Availability_EDA
+from eda_cache import AggregateCache
+from compact_frame import compact_frame
+from instrumentation import print_summary, span
+from storage import latest_version
+
+DATA_FILE = "banggood_transformed_data.csv"
+
+# Analysis name -> (module, summarize, analyze, plot); run in this order
+ANALYSES = {
+    'price_distribution': (Price_Distribution_EDA, Price_Distribution_EDA.summarize_price_distribution, Price_Distribution_EDA.analyze_price_distribution, Price_Distribution_EDA.plot_price_distribution),
+    'rating_vs_price': (Rating_Price_Correlation_EDA, Rating_Price_Correlation_EDA.summarize_rating_vs_price, Rating_Price_Correlation_EDA.analyze_rating_vs_price, Rating_Price_Correlation_EDA.plot_rating_vs_price),
+    'top_reviewed': (Top_Reviewed_EDA, Top_Reviewed_EDA.summarize_top_reviewed, Top_Reviewed_EDA.analyze_top_reviewed, Top_Reviewed_EDA.plot_top_reviewed),
+    'best_value': (Best_Value_EDA, Best_Value_EDA.summarize_best_value, Best_Value_EDA.analyze_best_value, Best_Value_EDA.plot_best_value),
+    'stock_proxy': (Stock_Availability_EDA, Stock_Availability_EDA.summarize_stock_proxy, Stock_Availability_EDA.analyze_stock_proxy, Stock_Availability_EDA.plot_stock_proxy),
+}
+
+# --- 1. Load Once ---
+def load_shared(names, file_path=DATA_FILE, window=None):
+    """Reads the union of the columns the selected analyses need, once, in the compact layout.
+
+    Category and Price_Segment become categoricals, so every groupby works on
+    integer codes, and Price_Segment sorts by price level. With
+    window=(since, until) the rows come from the price history instead:
+    every product listed in that window, with its last values there.
+    """
+    columns = []
+    for name in names:
+        columns += [c for c in ANALYSES[name][0].COLUMNS if c not in columns]
+    if window is not None:
+        from price_history import load_window
+        df = load_window(*window)[columns]
+        if df.empty:
+            print("❌ Error: The price history has no products in that window.")
+            return None
+    else:
+        df = Price_Distribution_EDA.load_data(file_path, columns=columns)
+    return compact_frame(df) if df is not None else None
+
+# --- 2. Shared Aggregates ---
+def category_aggregates(df):
+    """One groupby('Category') pass for every per-category statistic the analyses print.
+
+    Columns are named '<column>_<stat>'; aggregates whose input column was
+    not loaded are left out.
+    """
+    named = {}
+    if 'Price' in df:
+        for stat in ['count', 'mean', 'median', 'std', 'min', 'max']:
+            named[f'Price_{stat}'] = ('Price', stat)
+    if 'Name_Length' in df:
+        for stat in ['mean', 'median', 'std', 'count']:
+            named[f'Name_Length_{stat}'] = ('Name_Length', stat)
+    return df.groupby('Category', observed=True).agg(**named)
+
+# --- 3. Runner ---
+def analysis_params(name, window=None):
+    """Cache key parameters of an analysis: its summarize function's settings (e.g. top_reviewed's n), plus the history window."""
+    signature = inspect.signature(ANALYSES[name][1])
+    params = {key: p.default for key, p in signature.parameters.items() if key != 'by_category' and p.default is not p.empty}
+    if window is not None:
+        params['window'] = [str(bound) for bound in window]
+    return params
+
+def compute_summaries(df, names=tuple(ANALYSES), max_workers=4, cache=None, fingerprint=None, window=None):
+    """Computes the shared aggregates, then the summaries of the selected analyses in parallel.
+
+    The summaries only read `df` and the shared aggregates, so they run on a
+    thread pool. With an AggregateCache, summaries cached for `fingerprint`
+    and analysis_params() are reused and the rest are stored; `df` may be
+    None when every summary is cached. Returns ({name: summary}, {name: seconds}).
+    """
+    summaries, seconds = {}, {'shared aggregates': 0.0}
+    if cache is not None:
+        for name in names:
+            start = perf_counter()
+            summary = cache.get(fingerprint, name, analysis_params(name, window))
+            if summary is not None:
+                summaries[name] = summary
+                seconds[name] = perf_counter() - start
+    missing = [name for name in names if name not in summaries]
+    if not missing:
+        return summaries, seconds
+
+    start = perf_counter()
+    with span('eda.shared_aggregates', rows=len(df)):
+        by_category = category_aggregates(df)
+    seconds['shared aggregates'] = perf_counter() - start
+
+    def summarize(name):
+        start = perf_counter()
+        with span(f'eda.{name}', rows=len(df)):
+            summary = ANALYSES[name][1](df, by_category)
+        if cache is not None:
+            cache.put(fingerprint, name, summary, analysis_params(name, window))
+        return summary, perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(missing, executor.map(summarize, missing)))
+    for name, (summary, secs) in results.items():
+        summaries[name] = summary
+        seconds[name] = secs
+    return summaries, seconds
+
+def run_analyses(df, names=tuple(ANALYSES), max_workers=4, plot=True, cache=None, fingerprint=None, window=None):
+    """Computes (or fetches from `cache`) the summaries, then prints (and plots) them in order.
+
+    Printing and matplotlib stay on the main thread. Returns a timing table
+    in seconds per analysis.
+    """
+    summaries, summary_secs = compute_summaries(df, names, max_workers, cache, fingerprint, window)
+    timings = {'shared aggregates': {'summary': summary_secs['shared aggregates'], 'report': 0.0}}
+    for name in names:
+        start = perf_counter()
+        with span(f'eda.{name}.report', plot=plot):
+            ANALYSES[name][2](df, summary=summaries[name], plot=plot)
+        timings[name] = {'summary': summary_secs[name], 'report': perf_counter() - start}
+
+    timings = pd.DataFrame(timings).T
+    timings['total'] = timings['summary'] + timings['report']
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the EDA analyses against one shared copy of the dataset.")
+    parser.add_argument("--analyses", nargs='+', choices=list(ANALYSES), default=list(ANALYSES), help="Analyses to run (default: all).")
+    parser.add_argument("--workers", type=int, default=4, help="Threads computing the summaries.")
+    parser.add_argument("--no-plots", action="store_true", help="Print the tables only.")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every summary instead of using the aggregate cache.")
+    parser.add_argument("--since", default=None, help="Analyze the price history from this UTC date/time instead of the current data.")
+    parser.add_argument("--until", default=None, help="Analyze the price history up to this UTC date/time (default: now).")
+    parser.add_argument("--sql", action="store_true", help="Aggregate in the configured database (see load_to_sql.py) instead of pandas; tables only.")
+    parser.add_argument("--db-backend", default=None, help="Override the configured database backend for --sql.")
+    args = parser.parse_args()
+
+    names = [name for name in ANALYSES if name in args.analyses]
+    if args.sql:
+        if args.since or args.until:
+            parser.error("--sql reads the loaded table; it cannot be combined with --since/--until")
+        from db_backends import DB_ERRORS, get_backend, load_db_config
+        from sql_analytics import SQL_SUMMARIES, sql_summaries
+        config = load_db_config()
+        if args.db_backend:
+            config['backend'] = args.db_backend
+        try:
+            backend = get_backend(config)
+        except ValueError as ex:
+            parser.error(str(ex))
+        for name in names:
+            if name not in SQL_SUMMARIES:
+                print(f"ℹ️ {name} has no SQL version yet; skipped (run without --sql).")
+        names = [name for name in names if name in SQL_SUMMARIES]
+        try:
+            summaries = sql_summaries(names, backend)
+        except (ImportError,) + DB_ERRORS as ex:
+            print(f"❌ Query failed on {backend.describe()}: {ex}")
+            raise SystemExit(1)
+        for name in names:
+            ANALYSES[name][2](None, summary=summaries[name], plot=False)
+        print_summary("EDA TIMING (SQL)")
+        raise SystemExit(0)
+    cache = None if args.no_cache else AggregateCache()
+    window = None
+    if args.since or args.until:
+        from price_history import parse_time, window_fingerprint
+        window = (parse_time(args.since), parse_time(args.until, end=True))
+        fingerprint = window_fingerprint(*window) if cache else None
+    else:
+        fingerprint = cache.fingerprint(latest_version(DATA_FILE)) if cache else None
+
+    start = perf_counter()
+    # Tables alone need no data when every summary is cached
+    all_cached = cache is not None and all(cache.contains(fingerprint, name, analysis_params(name, window)) for name in names)
+    with span('eda.load') as s:
+        df = None if args.no_plots and all_cached else load_shared(names, window=window)
+        s.rows = len(df) if df is not None else None
+    load_secs = perf_counter() - start
+    if df is not None or all_cached:
+        timings = run_analyses(df, names, max_workers=args.workers, plot=not args.no_plots, cache=cache, fingerprint=fingerprint, window=window)
+        timings = pd.concat([pd.DataFrame([[load_secs, 0.0, load_secs]], index=['load'], columns=timings.columns), timings])
+        print("\n" + "="*50)
+        rows = f"{len(df)} rows" if df is not None else "data not loaded"
+        print(f"--- EDA Timing ({rows}, seconds) ---")
+        print(timings.round(4))
+        print(f"Total: {timings['total'].sum():.4f}s")
+        if cache is not None:
+            stats = cache.stats()
+            print(f"Aggregate cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+    print_summary("EDA TIMING")
\ No newline at end of file
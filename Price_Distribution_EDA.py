@@ -2,39 +2,53 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from storage import latest_version, read_dataset
+
 DATA_FILE = "banggood_transformed_data.csv"
+COLUMNS = ['Category', 'Price']  # Only what this analysis reads
 sns.set_style("whitegrid")
 
-def load_data(file_path):
+def load_data(file_path, columns=None):
     try:
-        df = pd.read_csv(file_path)
+        df = read_dataset(latest_version(file_path), columns=columns)
         return df
     except FileNotFoundError:
         print(f"❌ Error: File '{file_path}' not found.")
         return None
 
-def analyze_price_distribution(df):
-    """Calculates and visualizes the statistical summary of prices by category."""
-    print("\n" + "="*50)
-    print("## 1. Price Distribution per Category 💰")
-    
-    price_summary = df.groupby('Category')['Price'].agg(
-        ['count', 'mean', 'median', 'std', 'min', 'max']
-    ).sort_values(by='mean', ascending=False)
-    
-    print("\n--- Summary Statistics (Price per Category) ---")
-    print(price_summary)
+def summarize_price_distribution(df, by_category=None):
+    """Price statistics per category. `by_category` is the shared per-category aggregate frame (see EDA_Runner.py)."""
+    stats = ['count', 'mean', 'median', 'std', 'min', 'max']
+    if by_category is None:
+        price_summary = df.groupby('Category', observed=True)['Price'].agg(stats)
+    else:
+        price_summary = by_category[[f'Price_{stat}' for stat in stats]].set_axis(stats, axis=1)
+    return {'price_summary': price_summary.sort_values(by='mean', ascending=False)}
 
+def plot_price_distribution(df, summary):
     # Visualization: Box Plot
-    plt.figure(figsize=(10, 6))
+    fig = plt.figure(figsize=(10, 6))
     sns.boxplot(x='Category', y='Price', data=df)
     plt.title('Price Distribution by Category (Box Plot)')
     plt.xlabel('Category')
     plt.ylabel('Price (USD)')
     plt.ylim(0, df['Price'].quantile(0.95))
-    plt.show()
+    return fig
+
+def analyze_price_distribution(df, summary=None, plot=True):
+    """Calculates and visualizes the statistical summary of prices by category."""
+    summary = summary or summarize_price_distribution(df)
+    print("\n" + "="*50)
+    print("## 1. Price Distribution per Category 💰")
+    
+    print("\n--- Summary Statistics (Price per Category) ---")
+    print(summary['price_summary'])
+
+    if plot:
+        plot_price_distribution(df, summary)
+        plt.show()
 
 if __name__ == "__main__":
-    df = load_data(DATA_FILE)
+    df = load_data(DATA_FILE, columns=COLUMNS)
     if df is not None:
-        analyze_price_distribution(df.copy())
\ No newline at end of file
+        analyze_price_distribution(df)
\ No newline at end of file
@@ -2,40 +2,65 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from storage import latest_version, read_dataset
+
 DATA_FILE = "banggood_transformed_data.csv"
+COLUMNS = ['Category', 'Price', 'Rating', 'Price_Segment']  # Only what this analysis reads
+# Scatter plots above this many rows are drawn from a random sample
+SCATTER_MAX_POINTS = 20_000
+# From this many rows on, a hexbin density plot replaces the scatter
+HEXBIN_MIN_ROWS = 500_000
 sns.set_style("whitegrid")
 
-def load_data(file_path):
+def load_data(file_path, columns=None):
     try:
-        df = pd.read_csv(file_path)
+        df = read_dataset(latest_version(file_path), columns=columns)
         return df
     except FileNotFoundError:
         print(f"❌ Error: File '{file_path}' not found.")
         return None
 
-def analyze_rating_vs_price(df):
-    """Calculates correlation and visualizes the relationship between rating and price."""
-    print("\n" + "="*50)
-    print("## 2. Rating vs. Price Correlation 📈")
-
+def summarize_rating_vs_price(df, by_category=None):
     # Tabular Analysis: Overall Correlation
     correlation = df['Rating'].corr(df['Price'])
-    print(f"\nOverall Pearson Correlation (Rating vs. Price): {correlation:.3f}")
-
     # Analysis by Price Segment
-    segment_correlation = df.groupby('Price_Segment')['Price', 'Rating'].corr().unstack().iloc[:, 1]
-    print("\nCorrelation by Price Segment:")
-    print(segment_correlation)
+    segment_correlation = df.groupby('Price_Segment', observed=False)[['Price', 'Rating']].corr().unstack().iloc[:, 1]
+    return {'correlation': correlation, 'segment_correlation': segment_correlation}
 
-    # Visualization: Scatter Plot
-    plt.figure(figsize=(8, 5))
-    sns.scatterplot(x='Price', y='Rating', hue='Category', data=df)
-    plt.title(f'Rating vs. Price (Correlation: {correlation:.3f})')
+def plot_rating_vs_price(df, summary, max_points=SCATTER_MAX_POINTS, hexbin_rows=HEXBIN_MIN_ROWS):
+    """Scatter of rating vs. price; large frames are sampled down, very large ones drawn as a hexbin."""
+    title = f"Rating vs. Price (Correlation: {summary['correlation']:.3f})"
+    fig = plt.figure(figsize=(8, 5))
+    if len(df) >= hexbin_rows:
+        # Visualization: Density (one hexbin instead of millions of markers)
+        plt.hexbin(df['Price'], df['Rating'], gridsize=60, bins='log', mincnt=1, cmap='viridis')
+        plt.colorbar(label='Products (log)')
+    else:
+        # Visualization: Scatter Plot
+        points = df.sample(max_points, random_state=0) if len(df) > max_points else df
+        sns.scatterplot(x='Price', y='Rating', hue='Category', data=points)
+        if len(points) < len(df):
+            title += f" - {len(points):,} of {len(df):,} shown"
+    plt.title(title)
     plt.xlabel('Price (USD)')
     plt.ylabel('Rating')
-    plt.show()
+    return fig
+
+def analyze_rating_vs_price(df, summary=None, plot=True):
+    """Calculates correlation and visualizes the relationship between rating and price."""
+    summary = summary or summarize_rating_vs_price(df)
+    print("\n" + "="*50)
+    print("## 2. Rating vs. Price Correlation 📈")
+
+    print(f"\nOverall Pearson Correlation (Rating vs. Price): {summary['correlation']:.3f}")
+    print("\nCorrelation by Price Segment:")
+    print(summary['segment_correlation'])
+
+    if plot:
+        plot_rating_vs_price(df, summary)
+        plt.show()
 
 if __name__ == "__main__":
-    df = load_data(DATA_FILE)
+    df = load_data(DATA_FILE, columns=COLUMNS)
     if df is not None:
-        analyze_rating_vs_price(df.copy())
\ No newline at end of file
+        analyze_rating_vs_price(df)
\ No newline at end of file
@@ -2,45 +2,62 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from storage import latest_version, read_dataset
+
 DATA_FILE = "banggood_transformed_data.csv"
+COLUMNS = ['Category', 'Name_Length', 'Price_Segment']  # Only what this analysis reads
 sns.set_style("whitegrid")
 
-def load_data(file_path):
+def load_data(file_path, columns=None):
     try:
-        df = pd.read_csv(file_path)
+        df = read_dataset(latest_version(file_path), columns=columns)
         return df
     except FileNotFoundError:
         print(f"❌ Error: File '{file_path}' not found.")
         return None
 
-def analyze_stock_proxy(df):
-    """Analyzes the average name length across price segments as a proxy for inventory detail."""
-    print("\n" + "="*50)
-    print("## 5. Product Detail Analysis (Name Length Proxy) 🏷️")
-    
+def summarize_stock_proxy(df, by_category=None):
     # Tabular Analysis: Average Name Length by Category
-    name_length_summary = df.groupby('Category')['Name_Length'].agg(
-        ['mean', 'median', 'std', 'count']
-    ).sort_values(by='mean', ascending=False)
-    
-    print("\n--- Average Product Name Length by Category ---")
-    print(name_length_summary)
-    
+    stats = ['mean', 'median', 'std', 'count']
+    if by_category is None:
+        name_length_summary = df.groupby('Category', observed=True)['Name_Length'].agg(stats)
+    else:
+        name_length_summary = by_category[[f'Name_Length_{stat}' for stat in stats]].set_axis(stats, axis=1)
     # Tabular Analysis: Name Length by Price Segment
-    name_length_segment = df.groupby('Price_Segment')['Name_Length'].mean()
-    print("\nAverage Name Length by Price Segment:")
-    print(name_length_segment)
-    
+    name_length_segment = df.groupby('Price_Segment', observed=False)['Name_Length'].mean()
+    return {
+        'name_length_summary': name_length_summary.sort_values(by='mean', ascending=False),
+        'name_length_segment': name_length_segment,
+    }
+
+def plot_stock_proxy(df, summary):
     # Visualization: Bar Plot
-    plt.figure(figsize=(8, 5))
+    name_length_segment = summary['name_length_segment']
+    fig = plt.figure(figsize=(8, 5))
     sns.barplot(x=name_length_segment.index, y=name_length_segment.values, palette='magma')
     plt.title('Average Name Length by Price Segment')
     plt.xlabel('Price Segment')
     plt.ylabel('Average Product Name Length')
     plt.xticks(rotation=45, ha='right')
-    plt.show()
+    return fig
+
+def analyze_stock_proxy(df, summary=None, plot=True):
+    """Analyzes the average name length across price segments as a proxy for inventory detail."""
+    summary = summary or summarize_stock_proxy(df)
+    print("\n" + "="*50)
+    print("## 5. Product Detail Analysis (Name Length Proxy) 🏷️")
+    
+    print("\n--- Average Product Name Length by Category ---")
+    print(summary['name_length_summary'])
+    
+    print("\nAverage Name Length by Price Segment:")
+    print(summary['name_length_segment'])
+    
+    if plot:
+        plot_stock_proxy(df, summary)
+        plt.show()
 
 if __name__ == "__main__":
-    df = load_data(DATA_FILE)
+    df = load_data(DATA_FILE, columns=COLUMNS)
     if df is not None:
-        analyze_stock_proxy(df.copy())
\ No newline at end of file
+        analyze_stock_proxy(df)
\ No newline at end of file
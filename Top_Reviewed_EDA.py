@@ -2,37 +2,51 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from storage import latest_version, read_dataset
+from ranking import top_n
+
 DATA_FILE = "banggood_transformed_data.csv"
+COLUMNS = ['Category', 'Name', 'Reviews', 'Price', 'Rating']  # Only what this analysis reads
 sns.set_style("whitegrid")
 
-def load_data(file_path):
+def load_data(file_path, columns=None):
     try:
-        df = pd.read_csv(file_path)
+        df = read_dataset(latest_version(file_path), columns=columns)
         return df
     except FileNotFoundError:
         print(f"❌ Error: File '{file_path}' not found.")
         return None
 
-def analyze_top_reviewed(df, n=5):
-    """Identifies the top N products based on review count."""
-    print("\n" + "="*50)
-    print(f"## 3. Top {n} Most Reviewed Products ⭐")
-    
-    # Tabular Analysis: Top N
-    top_reviewed = df.sort_values(by='Reviews', ascending=False).head(n)
+def summarize_top_reviewed(df, by_category=None, n=5):
+    # Tabular Analysis: Top N (partial selection instead of sorting every row)
+    top_reviewed = top_n(df, 'Reviews', n, columns=['Category', 'Name', 'Reviews', 'Price', 'Rating'])
+    return {'n': n, 'top_reviewed': top_reviewed}
 
-    print(f"\n--- Top {n} Products by Review Count ---")
-    print(top_reviewed[['Category', 'Name', 'Reviews', 'Price', 'Rating']])
-    
+def plot_top_reviewed(df, summary):
     # Visualization: Bar Plot of Top N
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x='Reviews', y='Name', data=top_reviewed, hue='Category', dodge=False)
+    n = summary['n']
+    fig = plt.figure(figsize=(10, 6))
+    sns.barplot(x='Reviews', y='Name', data=summary['top_reviewed'], hue='Category', dodge=False)
     plt.title(f'Top {n} Products by Review Count')
     plt.xlabel('Reviews Count')
     plt.ylabel('Product Name')
-    plt.show()
+    return fig
+
+def analyze_top_reviewed(df, n=5, summary=None, plot=True):
+    """Identifies the top N products based on review count."""
+    summary = summary or summarize_top_reviewed(df, n=n)
+    n = summary['n']
+    print("\n" + "="*50)
+    print(f"## 3. Top {n} Most Reviewed Products ⭐")
+
+    print(f"\n--- Top {n} Products by Review Count ---")
+    print(summary['top_reviewed'])
+
+    if plot:
+        plot_top_reviewed(df, summary)
+        plt.show()
 
 if __name__ == "__main__":
-    df = load_data(DATA_FILE)
+    df = load_data(DATA_FILE, columns=COLUMNS)
     if df is not None:
-        analyze_top_reviewed(df.copy(), n=5)
\ No newline at end of file
+        analyze_top_reviewed(df, n=5)
\ No newline at end of file
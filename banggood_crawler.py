@@ -0,0 +1,237 @@
+import os
+import json
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+import numpy as np
+import pandas as pd
+
+from banggood_scraper import (
+    CATEGORIES, MAX_BROWSERS, HOST_MIN_INTERVAL, HTTP_POOL_SIZE, DriverPool, HostRateLimiter,
+    log_progress, new_driver, new_http_session, fetch_http, load_page, parse_cards
+)
+from instrumentation import print_summary
+from storage import remove_versions
+
+OUTPUT_FILE = "banggood_5_categories.csv"
+CHECKPOINT_FILE = "crawl_checkpoint.json"
+# --fixtures serves OUTPUT_FILE back as pages, so that crawl goes elsewhere
+FIXTURE_OUTPUT_FILE = "banggood_fixture_crawl.csv"
+FIXTURE_CHECKPOINT_FILE = "fixture_crawl_checkpoint.json"
+OUTPUT_COLUMNS = ["Category", "Name", "Price", "Rating", "Reviews", "URL"]
+
+# Pager markup seen on listing pages, most specific first
+NEXT_PAGE_SELECTORS = ["link[rel=next]", "a[rel=next]", "a.next", ".page-next a", "a.page-next"]
+
+# --- 1. Next-Page Discovery ---
+def find_next_page(page_html, page_url):
+    """Returns the absolute URL of the next listing page, or None on the last page."""
+    soup = BeautifulSoup(page_html, "html.parser")
+    for selector in NEXT_PAGE_SELECTORS:
+        tag = soup.select_one(selector)
+        if tag and tag.get("href") and not tag["href"].startswith("javascript"):
+            return urljoin(page_url, tag["href"])
+    return None
+
+# --- 2. Resumable Checkpoint ---
+class CrawlCheckpoint:
+    """On-disk crawl state: the next page to fetch per category and the pages already done.
+
+    The checkpoint also records how many bytes of the output CSV belong to
+    finished pages. Rows and checkpoint are updated under one lock, so on
+    restart the CSV is cut back to that size and no page is written twice.
+    """
+
+    def __init__(self, path=CHECKPOINT_FILE, output_file=OUTPUT_FILE):
+        self.path = path
+        self.output_file = output_file
+        self.frontier = {}     # Category -> next page URL (None once the category is finished)
+        self.done = set()      # Page URLs already written to the output
+        self.rows = {}         # Category -> rows written so far
+        self.output_bytes = 0
+        self._lock = threading.Lock()
+
+    def load_or_start(self, categories):
+        """Resumes from the checkpoint file if there is one, otherwise starts fresh."""
+        if os.path.exists(self.path) and os.path.exists(self.output_file):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.frontier = state['frontier']
+            self.done = set(state['done'])
+            self.rows = state['rows']
+            self.output_bytes = state['output_bytes']
+            # Categories added since the last run still need their first page
+            for cat_name, cat_url in categories.items():
+                self.frontier.setdefault(cat_name, cat_url)
+                self.rows.setdefault(cat_name, 0)
+            # Drop rows of a page that was being written when the crawl stopped
+            with open(self.output_file, 'a', encoding='utf-8') as f:
+                f.truncate(self.output_bytes)
+            pending = sum(url is not None for url in self.frontier.values())
+            log_progress(f"Resuming crawl: {len(self.done)} pages done, {pending} categories pending.")
+        else:
+            self.frontier = dict(categories)
+            self.done = set()
+            self.rows = {cat_name: 0 for cat_name in categories}
+            with open(self.output_file, 'w', encoding='utf-8', newline='') as f:
+                f.write(','.join(OUTPUT_COLUMNS) + '\n')
+                self.output_bytes = f.tell()
+            self._save()
+
+    def next_url(self, category_name):
+        with self._lock:
+            return self.frontier.get(category_name)
+
+    def complete_page(self, category_name, page_url, df, next_url):
+        """Appends the page's rows to the output and records the page as done."""
+        with self._lock:
+            if not df.empty:
+                with open(self.output_file, 'a', encoding='utf-8', newline='') as f:
+                    df.reindex(columns=OUTPUT_COLUMNS).to_csv(f, header=False, index=False)
+                    self.output_bytes = f.tell()
+            self.done.add(page_url)
+            self.rows[category_name] += len(df)
+            if next_url in self.done:
+                next_url = None  # Pager loops back to a page we already have
+            self.frontier[category_name] = next_url
+            self._save()
+
+    def _save(self):
+        state = {
+            'frontier': self.frontier,
+            'done': sorted(self.done),
+            'rows': self.rows,
+            'output_bytes': self.output_bytes,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)  # Atomic, so a crash never leaves half a checkpoint
+
+# --- 3. Pagination Crawler ---
+def crawl_all(categories, output_file=OUTPUT_FILE, checkpoint_file=CHECKPOINT_FILE, max_pages=None,
+              max_workers=MAX_BROWSERS, min_interval=HOST_MIN_INTERVAL, driver_factory=new_driver, backend="selenium"):
+    """Follows the next-page links of every category and streams the rows into `output_file`.
+
+    Categories are crawled concurrently (pages within a category follow the
+    pager one after another). Re-running after a crash continues from
+    `checkpoint_file`. Returns the rows written per category.
+    """
+    remove_versions(output_file, keep=['csv'])  # Readers would prefer a columnar copy of an older scrape
+    checkpoint = CrawlCheckpoint(checkpoint_file, output_file)
+    checkpoint.load_or_start(categories)
+
+    pool = DriverPool(size=max_workers, factory=driver_factory)
+    limiter = HostRateLimiter(min_interval)
+    session = new_http_session(pool_size=max(max_workers, HTTP_POOL_SIZE)) if backend == "http" else None
+
+    def fetch(url, cat_name):
+        """Returns (page_html, rows) for one listing page."""
+        if session is not None:
+            page_html = fetch_http(url, session, limiter)
+            if page_html is not None:
+                df = parse_cards(page_html, cat_name)
+                if not df.empty:
+                    return page_html, df
+            log_progress(f"No cards in static HTML for {url}, falling back to Selenium.")
+        with pool.session() as driver:
+            page_html = load_page(driver, url, limiter)
+        return page_html, parse_cards(page_html, cat_name)
+
+    def crawl_category(cat_name):
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            url = checkpoint.next_url(cat_name)
+            if url is None:
+                break
+            try:
+                page_html, df = fetch(url, cat_name)
+            except Exception as e:
+                log_progress(f"Error in {cat_name} at {url}: {e}")
+                break  # Frontier keeps the URL, so the next run retries it
+            checkpoint.complete_page(cat_name, url, df, find_next_page(page_html, url))
+            pages += 1
+            log_progress(f"{cat_name}: page {pages} done, {len(df)} rows (total {checkpoint.rows[cat_name]}).")
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(crawl_category, categories))
+    finally:
+        pool.close()
+        if session is not None:
+            session.close()
+
+    if all(url is None for url in checkpoint.frontier.values()):
+        order_by_category(output_file, list(categories))
+        os.remove(checkpoint_file)  # Crawl complete, next run starts over
+        log_progress("Crawl complete, checkpoint removed.")
+    return dict(checkpoint.rows)
+
+def order_by_category(output_file, categories):
+    """Rewrites a finished crawl grouped by category (in `categories` order), pages in crawl order.
+
+    Workers append pages as they finish, so categories interleave
+    differently on every run; this makes the output the same each time.
+    """
+    df = pd.read_csv(output_file, dtype=str, keep_default_na=False)
+    rank = df['Category'].map({cat: i for i, cat in enumerate(categories)}).fillna(len(categories))
+    tmp_path = output_file + '.tmp'
+    df.iloc[np.argsort(rank.to_numpy(), kind='stable')].to_csv(tmp_path, index=False)
+    os.replace(tmp_path, output_file)
+
+# --- MAIN EXECUTION BLOCK ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl every listing page of the Banggood categories.")
+    parser.add_argument("--workers", type=int, default=MAX_BROWSERS, help="Categories crawled in parallel.")
+    parser.add_argument("--min-interval", type=float, default=HOST_MIN_INTERVAL, help="Seconds between page loads on the same host.")
+    parser.add_argument("--max-pages", type=int, default=None, help="Stop each category after this many pages in this run.")
+    parser.add_argument("--backend", choices=["selenium", "http"], default="selenium", help="Fetch pages with Chrome, or over HTTP with Chrome as fallback.")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window.")
+    parser.add_argument("--fresh", action="store_true", help="Ignore an existing checkpoint and start over.")
+    parser.add_argument("--fixtures", action="store_true", help="Crawl paginated local fixture pages instead of banggood.com.")
+    parser.add_argument("--incremental", action="store_true", help="After a complete crawl, also write only new/changed products.")
+    args = parser.parse_args()
+
+    output_file, checkpoint_file = (FIXTURE_OUTPUT_FILE, FIXTURE_CHECKPOINT_FILE) if args.fixtures else (OUTPUT_FILE, CHECKPOINT_FILE)
+    # The fixture server gets a new port every run, so its page URLs can never be resumed
+    if (args.fresh or args.fixtures) and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+    categories = CATEGORIES
+    fixture_server = None
+    if args.fixtures:
+        from fixture_server import start_fixture_server, fixture_categories
+        fixture_server, base_url = start_fixture_server(page_size=20)
+        categories = fixture_categories(base_url)
+
+    print("--- PAGINATED CRAWL STARTED ---")
+    try:
+        rows = crawl_all(
+            categories,
+            output_file=output_file,
+            checkpoint_file=checkpoint_file,
+            max_pages=args.max_pages,
+            max_workers=args.workers,
+            min_interval=args.min_interval,
+            driver_factory=lambda: new_driver(headless=args.headless),
+            backend=args.backend
+        )
+    finally:
+        if fixture_server is not None:
+            fixture_server.shutdown()
+
+    print("\n--- CRAWL SUMMARY ---")
+    print(pd.Series(rows, name='Rows'))
+    print(f"Total Products Scraped: {sum(rows.values())}")
+    print(f"Data streamed to '{output_file}'")
+
+    if args.incremental:
+        if os.path.exists(checkpoint_file):
+            print("Crawl not finished yet, skipping change detection until it completes.")
+        else:
+            from incremental import write_changes
+            write_changes(pd.read_csv(output_file, dtype=str, keep_default_na=False))
+
+    print_summary("CRAWL TIMING")
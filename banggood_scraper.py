@@ -1,84 +1,332 @@
 import time
-from datetime import datetime
+import queue
+import argparse
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from selenium import webdriver
+try:
+    import lxml.html as lxml_html
+    from lxml import etree
+    from cssselect import GenericTranslator
+except ImportError:
+    lxml_html = None  # Falls back to the BeautifulSoup parser
+import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import os
 
+from storage import FORMATS, remove_versions, with_format, write_dataset
+from instrumentation import log_message, print_summary, span
+
+# 5 Categories ki List (Dictionary)
+CATEGORIES = {
+    "Sports": "https://www.banggood.com/Wholesale-Sports-and-Outdoors-ca-6001.html",
+    "Electronics": "https://www.banggood.com/Wholesale-Consumer-Electronics-ca-4001.html",
+    "Tools": "https://www.banggood.com/Wholesale-Tools-ca-3001.html",
+    "Toys": "https://www.banggood.com/Wholesale-Toys-Hobbies-and-Robot-ca-7001.html",
+    "Automobiles": "https://www.banggood.com/Wholesale-Automobiles-and-Motorcycles-ca-8001.html"
+}
+
+OUTPUT_FILE = "banggood_5_categories.csv"
+FIXTURE_OUTPUT_FILE = "banggood_fixture_scrape.csv"  # --fixtures serves OUTPUT_FILE back as pages
+
+# Engine settings for concurrent extraction
+MAX_BROWSERS = 3          # Upper bound on Chrome sessions open at the same time
+HOST_MIN_INTERVAL = 2.0   # Seconds between two page loads on the same host
+
+# Lazy-load detection settings
+SCROLL_MAX_WAIT = 20.0      # Ceiling on seconds spent scrolling one page
+SCROLL_POLL = 0.5           # Seconds between two card counts
+SCROLL_STABLE_CHECKS = 3    # Counts in a row without new cards before we stop
+FIXED_SCROLL_TIME = 13.0    # Dead time of the old schedule (5 x 2 s scrolls + 3 s wait)
+
+# HTTP fast path settings
+HTTP_POOL_SIZE = 10       # Keep-alive connections kept open per host
+HTTP_TIMEOUT = 20         # Seconds before a request is abandoned
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+CARD_COUNT_JS = (
+    "return document.querySelectorAll('.product-item').length"
+    " || document.querySelectorAll('.p-wrap').length;"
+)
+
 # --- STEP 0: Log Function ---
 def log_progress(message):
-    timestamp_format = '%Y-%m-%d-%H:%M:%S'
-    now = datetime.now()
-    timestamp = now.strftime(timestamp_format)
-    print(f"{timestamp} : {message}")
-    try:
-        with open('code_log.txt', 'a', encoding='utf-8') as f:
-            f.write(timestamp + ' : ' + message + '\n')
-    except:
-        pass
+    """Prints a progress line; code_log.txt and the JSON event log are written in the background."""
+    log_message(message)
 
-# --- STEP 1: Extract Function ---
-def extract(url, category_name):
-    log_progress(f"Starting extraction for Category: {category_name}")
-    
+# --- STEP 0b: Browser Sessions & Rate Limiting ---
+def new_driver(headless=False):
+    """Starts a new Chrome session."""
     options = webdriver.ChromeOptions()
     options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(options=options)
+    if headless:
+        options.add_argument("--headless=new")
+    return webdriver.Chrome(options=options)
+
+
+class DriverPool:
+    """Bounded pool of reusable Chrome sessions shared by the worker threads.
+
+    Sessions are started lazily, at most `size` of them, and handed back to
+    the pool after each category instead of being quit.
+    """
+
+    def __init__(self, size=MAX_BROWSERS, factory=new_driver):
+        self.size = size
+        self.factory = factory
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._drivers = []
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_start = len(self._drivers) < self.size
+            if can_start:
+                self._drivers.append(None)  # Reserve the slot before the slow start-up
+
+        if not can_start:
+            return self._idle.get()  # Wait for another worker to release one
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quits every session the pool has started."""
+        with self._lock:
+            drivers, self._drivers = [d for d in self._drivers if d is not None], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class HostRateLimiter:
+    """Spaces out page loads so each host sees at most one request per `min_interval` seconds."""
+
+    def __init__(self, min_interval=HOST_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# --- STEP 0c: Lazy-Load Detection ---
+def scroll_until_loaded(driver, max_wait=SCROLL_MAX_WAIT, poll=SCROLL_POLL, stable_checks=SCROLL_STABLE_CHECKS):
+    """Scrolls to the bottom until the product card count stops growing.
+
+    Stops after `stable_checks` polls in a row without new cards (once at least
+    one card is on the page), or after `max_wait` seconds. Returns
+    (card_count, seconds_spent).
+    """
+    start = time.monotonic()
+    last_count = 0
+    stable = 0
+    while True:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        count = driver.execute_script(CARD_COUNT_JS) or 0
+        if count > last_count:
+            last_count = count
+            stable = 0
+        elif count > 0:
+            stable += 1
+
+        elapsed = time.monotonic() - start
+        if stable >= stable_checks or elapsed + poll > max_wait:
+            return last_count, elapsed
+        time.sleep(poll)
+
+# --- STEP 1: Card Parser ---
+def _card_row(category_name, name, price, product_url):
+    """Builds one output row; relative product links are made absolute."""
+    if product_url != "N/A" and not product_url.startswith("http"):
+        product_url = "https://www.banggood.com" + product_url
+    return {
+        "Category": category_name,  # <--- Naya Column
+        "Name": name,
+        "Price": price,
+        "Rating": "N/A", # Placeholder
+        "Reviews": "0",  # Placeholder
+        "URL": product_url
+    }
+
+def parse_cards_bs4(page_html, category_name):
+    """Original BeautifulSoup (html.parser) card extraction."""
+    soup = BeautifulSoup(page_html, "html.parser")
+    data = []
     
-    try:
-        driver.get(url)
-        log_progress(f"URL Opened: {url}")
-        
-        # Scrolling
-        log_progress("Scrolling to load products...")
-        for i in range(1, 6):
-            driver.execute_script(f"window.scrollTo(0, document.body.scrollHeight * {i/6});")
-            time.sleep(2)
-        time.sleep(3)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        data = []
+    # Finding Cards
+    cards = soup.select(".product-item")
+    if not cards:
+        cards = soup.select(".p-wrap") # Fallback
         
-        # Finding Cards
-        cards = soup.select(".product-item")
-        if not cards:
-            cards = soup.select(".p-wrap") # Fallback
+    log_progress(f"Found {len(cards)} cards in {category_name}.")
+
+    for c in cards:
+        try:
+            # Name
+            link_tag = c.select_one("a")
+            name = link_tag.get("title") if link_tag else None
+            if not name: 
+                img_tag = c.select_one("img")
+                name = img_tag.get("alt") if img_tag else None
+
+            # Price
+            price_tag = c.select_one(".price")
+            if not price_tag: price_tag = c.select_one(".price-box")
+            price = price_tag.get_text(strip=True) if price_tag else "N/A"
             
-        log_progress(f"Found {len(cards)} cards in {category_name}.")
+            # URL
+            product_url = link_tag["href"] if link_tag else "N/A"
 
-        for c in cards:
-            try:
-                # Name
-                link_tag = c.select_one("a")
-                name = link_tag.get("title") if link_tag else None
-                if not name: 
-                    img_tag = c.select_one("img")
-                    name = img_tag.get("alt") if img_tag else None
-
-                # Price
-                price_tag = c.select_one(".price")
-                if not price_tag: price_tag = c.select_one(".price-box")
-                price = price_tag.get_text(strip=True) if price_tag else "N/A"
-                
-                # URL
-                product_url = link_tag["href"] if link_tag else "N/A"
-                if product_url != "N/A" and not product_url.startswith("http"):
-                    product_url = "https://www.banggood.com" + product_url
-
-                # Add Data if Name exists
-                if name:
-                    data.append({
-                        "Category": category_name,  # <--- Naya Column
-                        "Name": name,
-                        "Price": price,
-                        "Rating": "N/A", # Placeholder
-                        "Reviews": "0",  # Placeholder
-                        "URL": product_url
-                    })
-            except:
-                continue
-
-        df = pd.DataFrame(data)
+            # Add Data if Name exists
+            if name:
+                data.append(_card_row(category_name, name, price, product_url))
+        except:
+            continue
+
+    return data
+
+# Selectors compiled once per run into XPath (lxml backend only)
+if lxml_html is not None:
+    def _compile(css, prefix="descendant::"):
+        return etree.XPath(GenericTranslator().css_to_xpath(css, prefix=prefix))
+
+    LXML_SELECTORS = {
+        "cards": _compile(".product-item", prefix="descendant-or-self::"),
+        "cards_fallback": _compile(".p-wrap", prefix="descendant-or-self::"),
+        "link": _compile("a"),
+        "img": _compile("img"),
+        "price": _compile(".price"),
+        "price_fallback": _compile(".price-box"),
+    }
+
+def parse_cards_lxml(page_html, category_name):
+    """lxml card extraction with precompiled selectors; same rules as parse_cards_bs4()."""
+    sel = LXML_SELECTORS
+    data = []
+    if not page_html.strip():
+        log_progress(f"Found 0 cards in {category_name}.")
+        return data
+    root = lxml_html.fromstring(page_html)
+
+    cards = sel["cards"](root)
+    if not cards:
+        cards = sel["cards_fallback"](root)
+
+    log_progress(f"Found {len(cards)} cards in {category_name}.")
+
+    for c in cards:
+        links = sel["link"](c)
+        link_tag = links[0] if links else None
+        name = link_tag.get("title") if link_tag is not None else None
+        if not name:
+            imgs = sel["img"](c)
+            name = imgs[0].get("alt") if imgs else None
+
+        price_tags = sel["price"](c) or sel["price_fallback"](c)
+        price = "".join(t.strip() for t in price_tags[0].itertext()) if price_tags else "N/A"
+
+        if link_tag is None:
+            product_url = "N/A"
+        elif link_tag.get("href") is None:
+            continue  # Same as the KeyError the bs4 path skips
+        else:
+            product_url = link_tag.get("href")
+
+        if name:
+            data.append(_card_row(category_name, name, price, product_url))
+
+    return data
+
+CARD_PARSERS = {"bs4": parse_cards_bs4}
+if lxml_html is not None:
+    CARD_PARSERS["lxml"] = parse_cards_lxml
+DEFAULT_PARSER = "lxml" if "lxml" in CARD_PARSERS else "bs4"
+
+def parse_cards(page_html, category_name, parser=None):
+    """Parses the product cards of a category page into the scraper's DataFrame columns.
+
+    `parser` picks a backend from CARD_PARSERS; lxml is used when installed.
+    """
+    parser = parser or DEFAULT_PARSER
+    with span('parse', category=category_name, parser=parser) as s:
+        df = pd.DataFrame(CARD_PARSERS[parser](page_html, category_name))
+        s.rows = len(df)
+    return df
+
+# --- STEP 2: Extract Function (Selenium) ---
+def load_page(driver, url, rate_limiter=None):
+    """Opens `url` in the browser, scrolls until the cards settle and returns the page HTML."""
+    if rate_limiter is not None:
+        rate_limiter.wait(url)
+    with span('fetch', url=url, backend='selenium'):
+        driver.get(url)
+    log_progress(f"URL Opened: {url}")
+    
+    # Scrolling (stops as soon as the card count settles)
+    log_progress("Scrolling to load products...")
+    with span('scroll', url=url) as s:
+        loaded, scroll_time = scroll_until_loaded(driver)
+        s.rows = loaded
+    log_progress(
+        f"Scrolling done: {loaded} cards after {scroll_time:.1f}s "
+        f"(saved {FIXED_SCROLL_TIME - scroll_time:.1f}s vs fixed waits)"
+    )
+    return driver.page_source
+
+def extract(url, category_name, driver=None, rate_limiter=None):
+    """Scrapes one category page.
+
+    When `driver` is given (e.g. from a DriverPool) it is reused and left open;
+    otherwise a private Chrome session is started and quit at the end.
+    """
+    log_progress(f"Starting extraction for Category: {category_name}")
+    
+    owns_driver = driver is None
+    if owns_driver:
+        driver = new_driver()
+    
+    try:
+        df = parse_cards(load_page(driver, url, rate_limiter), category_name)
         log_progress(f"Finished {category_name}. Extracted: {len(df)} rows")
         return df
         
@@ -86,44 +334,174 @@ def extract(url, category_name):
         log_progress(f"Error in {category_name}: {e}")
         return pd.DataFrame()
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
 
-# --- MAIN EXECUTION BLOCK (Loop for 5 Categories) ---
-if __name__ == "__main__":
-    
-    # 5 Categories ki List (Dictionary)
-    categories = {
-        "Sports": "https://www.banggood.com/Wholesale-Sports-and-Outdoors-ca-6001.html",
-        "Electronics": "https://www.banggood.com/Wholesale-Consumer-Electronics-ca-4001.html",
-        "Tools": "https://www.banggood.com/Wholesale-Tools-ca-3001.html",
-        "Toys": "https://www.banggood.com/Wholesale-Toys-Hobbies-and-Robot-ca-7001.html",
-        "Automobiles": "https://www.banggood.com/Wholesale-Automobiles-and-Motorcycles-ca-8001.html"
-    }
+# --- STEP 3: Extract Function (HTTP fast path) ---
+def new_http_session(pool_size=HTTP_POOL_SIZE):
+    """Creates a pooled keep-alive session that asks for gzip responses."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+def fetch_http(url, session, rate_limiter=None):
+    """Downloads a page over the pooled session. Returns the HTML, or None on HTTP errors."""
+    try:
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        with span('fetch', url=url, backend='http') as s:
+            response = session.get(url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            s.fields['bytes'] = len(response.content)
+        log_progress(f"URL Fetched: {url} ({len(response.content)} bytes)")
+        return response.text
+    except requests.RequestException as e:
+        log_progress(f"HTTP error for {url}: {e}")
+        return None
 
-    all_data_frames = [] # Yahan sab jama karenge
+def extract_http(url, category_name, session, rate_limiter=None):
+    """Scrapes one category page without a browser.
 
-    print("--- BATCH EXTRACTION STARTED ---")
+    Returns None when the static HTML holds no product cards, i.e. the page
+    needs JavaScript and should be handed to the Selenium extract().
+    """
+    log_progress(f"Starting HTTP extraction for Category: {category_name}")
+    page_html = fetch_http(url, session, rate_limiter)
+    if page_html is None:
+        return None
 
-    # Loop chalao har category ke liye
-    for cat_name, cat_url in categories.items():
-        print(f"\nProcessing: {cat_name}...")
-        df_temp = extract(cat_url, cat_name)
-        
+    df = parse_cards(page_html, category_name)
+    if df.empty:
+        return None
+    log_progress(f"Finished {category_name}. Extracted: {len(df)} rows")
+    return df
+
+# --- STEP 4: Concurrent Extraction Engine ---
+def extract_all(categories, max_workers=MAX_BROWSERS, min_interval=HOST_MIN_INTERVAL, driver_factory=new_driver, backend="selenium"):
+    """Runs extract() for every category concurrently and merges the results.
+
+    Each worker borrows a Chrome session from a bounded pool, and page loads are
+    rate limited per host. With backend="http" pages are fetched over a pooled
+    HTTP session first, and Chrome is only started for pages that need
+    JavaScript. The merged DataFrame keeps the order of `categories`.
+    """
+    pool = DriverPool(size=max_workers, factory=driver_factory)
+    limiter = HostRateLimiter(min_interval)
+    session = new_http_session(pool_size=max(max_workers, HTTP_POOL_SIZE)) if backend == "http" else None
+
+    def run(item):
+        cat_name, cat_url = item
+        try:
+            if session is not None:
+                df_temp = extract_http(cat_url, cat_name, session, rate_limiter=limiter)
+                if df_temp is not None:
+                    return df_temp
+                log_progress(f"No cards in static HTML for {cat_name}, falling back to Selenium.")
+            with pool.session() as driver:
+                return extract(cat_url, cat_name, driver=driver, rate_limiter=limiter)
+        except Exception as e:
+            log_progress(f"Error in {cat_name}: {e}")
+            return pd.DataFrame()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, categories.items()))
+    finally:
+        pool.close()
+        if session is not None:
+            session.close()
+
+    all_data_frames = []
+    for cat_name, df_temp in zip(categories, results):
         if not df_temp.empty:
             all_data_frames.append(df_temp)
         else:
             print(f"Skipping {cat_name} due to error.")
 
+    if not all_data_frames:
+        return pd.DataFrame()
+    return pd.concat(all_data_frames, ignore_index=True)
+
+# --- STEP 5: Backend Throughput Comparison ---
+def compare_backends(categories, backends=("http", "selenium"), **engine_options):
+    """Scrapes the same categories with each backend and prints pages/sec and rows/sec."""
+    results = {}
+    for backend in backends:
+        start = time.perf_counter()
+        df = extract_all(categories, backend=backend, **engine_options)
+        elapsed = time.perf_counter() - start
+        results[backend] = {
+            'rows': len(df),
+            'seconds': elapsed,
+            'pages_per_sec': len(categories) / elapsed,
+            'rows_per_sec': len(df) / elapsed,
+        }
+
+    print("\n--- BACKEND THROUGHPUT ---")
+    print(pd.DataFrame(results).T[['rows', 'seconds', 'pages_per_sec', 'rows_per_sec']].round(2))
+    return results
+
+# --- MAIN EXECUTION BLOCK (Concurrent run over all Categories) ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Banggood category pages.")
+    parser.add_argument("--workers", type=int, default=MAX_BROWSERS, help="Number of Chrome sessions to run in parallel.")
+    parser.add_argument("--min-interval", type=float, default=HOST_MIN_INTERVAL, help="Seconds between page loads on the same host.")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window.")
+    parser.add_argument("--fixtures", action="store_true", help="Scrape local fixture pages instead of banggood.com.")
+    parser.add_argument("--backend", choices=["selenium", "http"], default="selenium", help="Fetch pages with Chrome, or over HTTP with Chrome as fallback.")
+    parser.add_argument("--compare-backends", action="store_true", help="Time both backends on the same pages and exit.")
+    parser.add_argument("--incremental", action="store_true", help="Also write only new/changed products for cleaning and loading.")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv", help="Extra file format of the saved scrape (the CSV is always written).")
+    args = parser.parse_args()
+
+    categories = CATEGORIES
+    fixture_server = None
+    if args.fixtures:
+        from fixture_server import start_fixture_server, fixture_categories
+        fixture_server, base_url = start_fixture_server()
+        categories = fixture_categories(base_url)
+
+    engine_options = dict(
+        max_workers=args.workers,
+        min_interval=args.min_interval,
+        driver_factory=lambda: new_driver(headless=args.headless)
+    )
+
+    if args.compare_backends:
+        try:
+            compare_backends(categories, **engine_options)
+        finally:
+            if fixture_server is not None:
+                fixture_server.shutdown()
+        raise SystemExit(0)
+
+    print("--- BATCH EXTRACTION STARTED ---")
+
+    try:
+        final_df = extract_all(categories, backend=args.backend, **engine_options)
+    finally:
+        if fixture_server is not None:
+            fixture_server.shutdown()
+
     # Sab ko Join (Concat) karo
-    if all_data_frames:
-        final_df = pd.concat(all_data_frames, ignore_index=True)
-        
+    if not final_df.empty:
         print("\n--- FINAL SUCCESS ---")
         print(f"Total Products Scraped: {len(final_df)}")
         print(final_df['Category'].value_counts()) # Har category me kitne items aye
         
-        # Final Save
-        final_df.to_csv("banggood_5_categories.csv", index=False)
-        print("Data saved to 'banggood_5_categories.csv'")
+        # Final Save: the CSV export is always kept; an older copy in another format would be read instead
+        output_file = FIXTURE_OUTPUT_FILE if args.fixtures else OUTPUT_FILE
+        formats = sorted({args.format, 'csv'})
+        remove_versions(output_file, keep=formats)
+        for fmt in formats:
+            print(f"Data saved to '{write_dataset(final_df, with_format(output_file, fmt))}'")
+
+        if args.incremental:
+            from incremental import write_changes
+            write_changes(final_df)
     else:
-        print("No data extracted from any category.")
\ No newline at end of file
+        print("No data extracted from any category.")
+    print_summary("SCRAPE TIMING")
\ No newline at end of file
@@ -0,0 +1,51 @@
+import io
+import time
+import argparse
+import contextlib
+import pandas as pd
+
+from Data_Cleaning_Transformation import RAW_FILE, ENGINES
+from synthetic_catalog import CatalogProfile, generate_catalog
+
+# --- 1. Synthetic Raw Rows ---
+def synthetic_raw(n_rows, seed=42, file_path=RAW_FILE):
+    """Synthetic scrape rows shaped like the real file, with some N/A prices and missing names."""
+    return generate_catalog(n_rows, seed, profile=CatalogProfile.from_file(file_path), missing_name_rate=0.01)
+
+# --- 2. Throughput ---
+def run_engine(engine, df):
+    """Runs clean + featurize on a copy of `df`. Returns (output, seconds)."""
+    clean, featurize = ENGINES[engine]
+    data = df.copy()
+    with contextlib.redirect_stdout(io.StringIO()):  # Stage progress prints are not what we time
+        start = time.perf_counter()
+        out = featurize(clean(data))
+        elapsed = time.perf_counter() - start
+    return out, elapsed
+
+def benchmark_cleaning(sizes=(10_000, 100_000, 1_000_000)):
+    results = []
+    for n_rows in sizes:
+        df = synthetic_raw(n_rows)
+        outputs = {}
+        for engine in ENGINES:
+            outputs[engine], elapsed = run_engine(engine, df)
+            results.append({'rows': n_rows, 'engine': engine, 'seconds': elapsed, 'rows_per_sec': n_rows / elapsed})
+        identical = outputs['python'].to_csv(index=False) == outputs['vectorized'].to_csv(index=False)
+        print(f"    - {n_rows:>9,} rows: outputs byte-identical: {identical}")
+
+    summary = pd.DataFrame(results).pivot(index='rows', columns='engine', values='rows_per_sec')
+    summary['speedup'] = summary['vectorized'] / summary['python']
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare rows/sec of the python and vectorized cleaning engines.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    # The real scrape must give byte-identical output too
+    real = pd.read_csv(RAW_FILE)
+    same = run_engine('python', real)[0].to_csv(index=False) == run_engine('vectorized', real)[0].to_csv(index=False)
+    print(f"--- CLEANING BENCHMARK ---\n    - '{RAW_FILE}': outputs byte-identical: {same}")
+
+    print(benchmark_cleaning(args.sizes).round(1))
@@ -0,0 +1,115 @@
+import io
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+
+from synthetic_catalog import CatalogProfile, generate_catalog
+from dedup import THRESHOLD, find_duplicates, near_duplicates, tokenize
+
+SIZES = [100_000, 1_000_000, 2_000_000]
+BRUTE_FORCE_ROWS = 5_000   # All-pairs comparison is O(n^2); this is as far as it goes in seconds
+EXTRA_WORDS = ['New', '2PCS', 'Upgraded', 'Version', 'Original', 'Hot']
+MIN_NEAR_WORDS = 10        # Near copies come from names long enough that one edit keeps them above THRESHOLD
+
+# --- 1. Catalog with Known Duplicates ---
+def with_duplicates(df, exact_rate=0.05, near_rate=0.05, seed=0):
+    """Appends re-listed copies of random rows. Returns (catalog, index labels of the copies).
+
+    Exact copies keep the product ID but move to another category and get
+    a flash-deal 'ID=' query parameter. Near copies lose the product ID
+    from the link (as shared or tracking links do) and get one word added
+    to or dropped from the name.
+    """
+    rng = np.random.default_rng(seed)
+    categories = df['Category'].unique()
+
+    exact = df.sample(int(len(df) * exact_rate), random_state=seed)
+    exact = exact.assign(
+        Category=rng.choice(categories, size=len(exact)),
+        URL=exact['URL'].str.replace(r'\?.*$', '', regex=True) + '?ID=' + pd.Series(rng.integers(10 ** 5, 10 ** 6, len(exact)), index=exact.index).astype(str),
+    )
+
+    long_names = df[df['Name'].str.split().str.len() >= MIN_NEAR_WORDS]
+    near = long_names.sample(min(int(len(df) * near_rate), len(long_names)), random_state=seed + 1)
+    words = near['Name'].str.split()
+    append = rng.random(len(near)) < 0.5
+    extra = rng.choice(EXTRA_WORDS, size=len(near))
+    edited = [' '.join(w + [x] if add else w[:-1]) for w, add, x in zip(words.tolist(), append, extra)]
+    near = near.assign(Name=edited, URL=near['URL'].str.replace(r'-p-\d+\.html', '.html', regex=True))
+
+    copies = pd.concat([exact, near])
+    copies.index = pd.RangeIndex(len(df), len(df) + len(copies))
+    return pd.concat([df, copies]), set(copies.index)
+
+# --- 2. Throughput & Recall ---
+def run_dedup(df, near):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        duplicates = find_duplicates(df, near=near)
+        elapsed = time.perf_counter() - start
+    return duplicates, elapsed
+
+def benchmark_dedup(sizes=SIZES, profile=None):
+    """rows/sec of exact-only and exact + near dedup, and the share of injected copies each finds."""
+    profile = profile or CatalogProfile.from_file()
+    results = []
+    for n_rows in sizes:
+        df, injected = with_duplicates(generate_catalog(n_rows, profile=profile))
+        for mode, near in [('exact', False), ('exact+near', True)]:
+            duplicates, elapsed = run_dedup(df, near)
+            dropped = duplicates[duplicates['Match'] != 'candidate']
+            found = injected & set(dropped.index)
+            results.append({
+                'rows': len(df), 'mode': mode, 'seconds': elapsed, 'rows_per_sec': len(df) / elapsed,
+                'injected': len(injected), 'recall': len(found) / len(injected),
+                # Rows the catalog repeats by itself (short names sampled twice), not injected copies
+                'other_found': len(dropped) - len(found),
+                # Similar names with different product IDs: reported, not dropped
+                'candidates': len(duplicates) - len(dropped),
+            })
+            print(f"    - {len(df):>10,} rows, {mode:<10}: {elapsed:7.2f}s, {len(df) / elapsed:>10,.0f} rows/sec")
+    return pd.DataFrame(results)
+
+# --- 3. LSH vs All-Pairs ---
+def all_pairs_duplicates(names, threshold=THRESHOLD):
+    """Positions of names at least `threshold` similar to an earlier name, comparing every pair."""
+    token_rows, token_codes, vocabulary = tokenize(names)
+    words = np.zeros((len(names), len(vocabulary)), dtype=np.float32)
+    words[token_rows, token_codes] = 1
+    shared = words @ words.T
+    sizes = words.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - shared
+    similarity = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+    return np.flatnonzero((np.tril(similarity, k=-1) >= threshold).any(axis=1))
+
+def compare_with_all_pairs(n_rows=BRUTE_FORCE_ROWS, sizes=SIZES, profile=None, threshold=THRESHOLD):
+    """Recall of LSH against the exact all-pairs answer, and the time all-pairs would take at the benchmark sizes."""
+    df, _ = with_duplicates(generate_catalog(n_rows, seed=7, profile=profile), exact_rate=0.0, near_rate=0.1)
+    names = df['Name'].reset_index(drop=True)
+
+    start = time.perf_counter()
+    truth = set(all_pairs_duplicates(names, threshold).tolist())
+    brute_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    found = set(near_duplicates(names, threshold)[0].tolist())
+    lsh_seconds = time.perf_counter() - start
+
+    print(f"\n--- LSH vs All-Pairs ({len(names):,} names) ---")
+    print(f"All-pairs: {len(truth):,} near duplicates in {brute_seconds:.2f}s | LSH: {len(found):,} in {lsh_seconds:.2f}s")
+    print(f"LSH recall: {len(found & truth) / max(len(truth), 1):.1%} | LSH matches not in all-pairs: {len(found - truth):,}")
+    for size in sizes:
+        # All-pairs work grows with n^2 (and its similarity matrix would need n^2 * 4 bytes)
+        print(f"    - {size:>10,} rows: all-pairs would take ~{brute_seconds * (size / len(names)) ** 2 / 3600:,.1f} hours")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dedup throughput and recall on synthetic catalogs with injected duplicates.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES, help="Catalog sizes before the injected copies.")
+    args = parser.parse_args()
+
+    profile = CatalogProfile.from_file()
+    print("--- DEDUP BENCHMARK ---")
+    summary = benchmark_dedup(args.sizes, profile)
+    print(summary.round(3).to_string(index=False))
+    compare_with_all_pairs(sizes=args.sizes, profile=profile)
\ No newline at end of file
@@ -0,0 +1,80 @@
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+from benchmark_storage import synthetic_transformed
+from price_history import (append_snapshot, category_price_movement, largest_drops, load_window,
+                           price_history, read_snapshots, snapshot_files, snapshot_rows, store_summary)
+
+PRICE_CHANGE_RATE = 0.03   # Share of products whose price changes between two daily scrapes
+REVIEW_CHANGE_RATE = 0.02  # Share of products that get a new review
+DELIST_RATE = 0.001        # Share of products that disappear from a scrape
+
+# --- 1. Simulated Daily Scrapes ---
+def daily_scrapes(n_rows, days, seed=42):
+    """Yields (scraped_at, transformed frame) for `days` daily scrapes of one synthetic catalog."""
+    rng = np.random.default_rng(seed)
+    df = synthetic_transformed(n_rows)
+    start = pd.Timestamp('2026-01-01 06:00')
+    for day in range(days):
+        if day:
+            change = rng.random(len(df)) < PRICE_CHANGE_RATE
+            df.loc[change, 'Price'] = (df.loc[change, 'Price'] * rng.uniform(0.7, 1.2, change.sum())).round(2)
+            df.loc[rng.random(len(df)) < REVIEW_CHANGE_RATE, 'Reviews'] += 1
+        yield start + pd.Timedelta(days=day), df[rng.random(len(df)) >= DELIST_RATE]
+
+def directory_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+# --- 2. Benchmark ---
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def benchmark_history(n_rows, days, directory):
+    """Builds a delta store and an every-day-full store of the same scrapes, then times the queries on both."""
+    delta_dir, full_dir = os.path.join(directory, 'delta'), os.path.join(directory, 'full')
+    append_secs = {'delta': 0.0, 'full': 0.0}
+    for scraped_at, df in daily_scrapes(n_rows, days):
+        append_secs['delta'] += timed(lambda: append_snapshot(df, scraped_at, delta_dir))[1]
+        append_secs['full'] += timed(lambda: append_snapshot(df, scraped_at, full_dir, full=True))[1]
+
+    files = snapshot_files(delta_dir)
+    end = files['scraped_at'].max()
+    week_ago = end - pd.Timedelta(days=7)
+    product = int(snapshot_rows(df)['Product_ID'].iloc[len(df) // 2])
+    queries = {
+        'product history': lambda store: price_history(product, history_dir=store),
+        'movement (last 7 days)': lambda store: category_price_movement(week_ago, end, store),
+        'top 10 drops (last 7 days)': lambda store: largest_drops(week_ago, end, 10, store),
+        'EDA window (last day)': lambda store: load_window(end - pd.Timedelta(days=1), end, store),
+    }
+    results = []
+    for name, query in queries.items():
+        results.append({'query': name, 'delta_store': timed(lambda: query(delta_dir))[1], 'full_store': timed(lambda: query(full_dir))[1]})
+    # What every query would cost without keyframes and file pruning: reading all of history
+    results.append({'query': 'scan all history', 'delta_store': timed(lambda: read_snapshots(files))[1],
+                    'full_store': timed(lambda: read_snapshots(snapshot_files(full_dir)))[1]})
+
+    print(f"\n--- Store Size ({days} daily scrapes of {len(df):,} products) ---")
+    print(store_summary(delta_dir)[['snapshots', 'rows', 'bytes']])
+    delta_bytes, full_bytes = directory_bytes(delta_dir), directory_bytes(full_dir)
+    print(f"Delta store: {delta_bytes / 1e6:,.1f} MB | Full every day: {full_bytes / 1e6:,.1f} MB ({full_bytes / delta_bytes:.1f}x larger)")
+    print(f"Append time: delta {append_secs['delta']:.2f}s | full {append_secs['full']:.2f}s (all {days} scrapes)")
+    return pd.DataFrame(results).set_index('query')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Size and query speed of the price history on simulated daily scrapes.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic catalog size.")
+    parser.add_argument("--days", type=int, default=30, help="Daily scrapes to simulate.")
+    args = parser.parse_args()
+
+    print("--- PRICE HISTORY BENCHMARK ---")
+    with tempfile.TemporaryDirectory() as directory:
+        timings = benchmark_history(args.rows, args.days, directory)
+    print("\n--- Query Time (seconds) ---")
+    print(timings.round(3))
\ No newline at end of file
@@ -0,0 +1,93 @@
+import io
+import time
+import argparse
+import contextlib
+import pandas as pd
+
+from db_backends import BACKENDS
+from load_to_sql import BATCH_SIZE, add_product_keys, create_table_schema, insert_data, insert_data_bulk, merge_data, validate_insertion
+from benchmark_storage import synthetic_transformed
+
+def local_backend(name='sqlite', db_path=":memory:"):
+    """An in-memory SQLite or DuckDB backend standing in for SQL Server."""
+    return BACKENDS[name]({'backend': name, 'path': db_path})
+
+def fresh_cursor(backend):
+    """Connects to `backend` and creates an empty table. Returns (connection, cursor)."""
+    conn = backend.connect()
+    cursor = conn.cursor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_table_schema(cursor, backend=backend)
+    return conn, cursor
+
+def run_loader(loader, df, backend):
+    """Loads `df` into a fresh table with `loader`. Returns (seconds, row count in the table)."""
+    conn, cursor = fresh_cursor(backend)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            ok = loader(cursor, df)
+            elapsed = time.perf_counter() - start
+            actual = validate_insertion(cursor, len(df))
+        if not ok:
+            raise RuntimeError(f"{loader.__name__} failed")
+        return elapsed, actual
+    finally:
+        conn.close()
+
+def loadable_frame(n_rows):
+    df = synthetic_transformed(n_rows)
+    df['Price_Segment'] = df['Price_Segment'].astype(object)
+    return add_product_keys(df)
+
+def benchmark_load(n_rows, batch_size=BATCH_SIZE, backend_name='sqlite'):
+    df = loadable_frame(n_rows)
+    backend = local_backend(backend_name)
+    loaders = {
+        f'bulk (batch={batch_size})': lambda cursor, df: insert_data_bulk(cursor, df, batch_size, backend=backend),
+    }
+    if not backend.supports_frame_insert:
+        # DuckDB's executemany runs row by row; only time it where it is the real path
+        loaders = {'executemany': insert_data, **loaders}
+    results = {}
+    for name, loader in loaders.items():
+        elapsed, actual = run_loader(loader, df, backend)
+        results[name] = {'rows': actual, 'seconds': elapsed, 'rows_per_sec': len(df) / elapsed, 'count_ok': actual == len(df)}
+    return pd.DataFrame(results).T
+
+def benchmark_merge(n_rows, changed_fraction=0.05, batch_size=BATCH_SIZE, backend_name='sqlite'):
+    """Merges a re-scrape with a few changed prices and new products into a loaded table."""
+    df = loadable_frame(n_rows).drop_duplicates(subset='ProductKey', keep='last')
+    n_changed = int(len(df) * changed_fraction)
+    rescrape = df.copy()
+    rescrape.iloc[:n_changed, rescrape.columns.get_loc('Price')] += 1.0
+    new_rows = df.iloc[:n_changed].assign(ProductKey=lambda d: 'new-' + d['ProductKey'])
+    rescrape = pd.concat([rescrape, new_rows], ignore_index=True)
+
+    backend = local_backend(backend_name)
+    conn, cursor = fresh_cursor(backend)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            merge_data(cursor, df, backend=backend, batch_size=batch_size)
+            start = time.perf_counter()
+            counts = merge_data(cursor, rescrape, backend=backend, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+        counts['seconds'] = elapsed
+        counts['rows_per_sec'] = len(rescrape) / elapsed
+        return pd.Series(counts)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the SQL loaders against an in-memory SQLite or DuckDB stand-in.")
+    parser.add_argument("--rows", type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--backend", nargs='+', choices=['sqlite', 'duckdb'], default=['sqlite', 'duckdb'])
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        for backend_name in args.backend:
+            print(f"\n--- LOAD BENCHMARK ({n_rows:,} rows, {backend_name}) ---")
+            print(benchmark_load(n_rows, args.batch_size, backend_name).round(2))
+            print(f"\n--- MERGE RE-LOAD ({n_rows:,} rows, 5% changed + 5% new, {backend_name}) ---")
+            print(benchmark_merge(n_rows, batch_size=args.batch_size, backend_name=backend_name).round(2))
\ No newline at end of file
@@ -0,0 +1,62 @@
+import os
+import glob
+import time
+import argparse
+import pandas as pd
+
+import banggood_scraper
+from banggood_scraper import CARD_PARSERS
+from fixture_server import load_fixture_rows, render_category_page
+
+# --- 1. Benchmark Pages ---
+def load_saved_pages(pages_dir):
+    """Reads saved category pages (*.html); the file name is used as the category."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    return pages
+
+def build_fixture_pages(repeat=1):
+    """Renders the scraped CSV as category pages, with each card repeated `repeat` times."""
+    pages = []
+    for cat, rows in load_fixture_rows().items():
+        pages.append((cat, render_category_page(cat, pd.concat([rows] * repeat))))
+    return pages
+
+# --- 2. Parse Throughput ---
+def benchmark_parsers(pages, rounds=5):
+    """Parses every page `rounds` times with each backend and reports cards/sec."""
+    banggood_scraper.log_progress = lambda message: None  # Keep console/file I/O out of the timings
+
+    results = {}
+    reference = None
+    for name, parse in CARD_PARSERS.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            rows = [row for cat, page_html in pages for row in parse(page_html, cat)]
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference = rows
+        results[name] = {
+            'cards': len(rows),
+            'seconds': elapsed / rounds,
+            'cards_per_sec': len(rows) * rounds / elapsed,
+            'same_rows': rows == reference,
+        }
+
+    summary = pd.DataFrame(results).T
+    summary['speedup'] = summary['cards_per_sec'] / summary.loc['bs4', 'cards_per_sec']
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare card parse throughput of the parser backends.")
+    parser.add_argument("--pages-dir", help="Directory of saved category pages (*.html). Defaults to fixture pages.")
+    parser.add_argument("--repeat", type=int, default=10, help="Card repetitions per fixture page.")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed passes over all pages.")
+    args = parser.parse_args()
+
+    pages = load_saved_pages(args.pages_dir) if args.pages_dir else build_fixture_pages(args.repeat)
+    print(f"--- PARSER BENCHMARK ({len(pages)} pages, {args.rounds} rounds) ---")
+    print(benchmark_parsers(pages, rounds=args.rounds))
@@ -0,0 +1,82 @@
+import time
+import argparse
+import pandas as pd
+
+from ranking import StreamingTopN, metric_values, top_n
+from benchmark_storage import synthetic_transformed
+
+def timed(func, repeat=3):
+    """Best of `repeat` runs. Returns (result, seconds)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+# --- 1. Global Top-N ---
+def benchmark_top_reviewed(df, n=5):
+    approaches = {
+        'sort_values().head()': lambda: df.sort_values(by='Reviews', ascending=False).head(n),
+        'top_n (argpartition)': lambda: top_n(df, 'Reviews', n),
+    }
+    results = {name: timed(func) for name, func in approaches.items()}
+    reference = results['sort_values().head()'][0]['Reviews'].to_numpy()
+    return {name: {'seconds': secs, 'same_values': (out['Reviews'].to_numpy() == reference).all()} for name, (out, secs) in results.items()}
+
+# --- 2. Best Value per Category ---
+def benchmark_best_value(df):
+    def idxmax_gather():
+        value = metric_values(df, 'Value_Metric')
+        return df.loc[value.groupby(df['Category']).idxmax()].assign(Value_Metric=lambda d: metric_values(d, 'Value_Metric'))
+
+    approaches = {
+        'groupby().idxmax() + loc': idxmax_gather,
+        'top_n (per-group argpartition)': lambda: top_n(df, 'Value_Metric', 1, by='Category'),
+    }
+    results = {name: timed(func) for name, func in approaches.items()}
+    reference = results['groupby().idxmax() + loc'][0]['Value_Metric'].to_numpy()
+    return {name: {'seconds': secs, 'same_values': (out['Value_Metric'].to_numpy() == reference).all()} for name, (out, secs) in results.items()}
+
+def benchmark_category_top(df, n=5):
+    def sort_head():
+        ranked = df.assign(Value_Metric=metric_values(df, 'Value_Metric'))
+        return ranked.sort_values(['Category', 'Value_Metric'], ascending=[True, False], kind='stable').groupby('Category').head(n)
+
+    approaches = {
+        'sort_values() + groupby().head()': sort_head,
+        'top_n (per-group argpartition)': lambda: top_n(df, 'Value_Metric', n, by='Category'),
+    }
+    results = {name: timed(func) for name, func in approaches.items()}
+    reference = results['sort_values() + groupby().head()'][0]['Value_Metric'].to_numpy()
+    return {name: {'seconds': secs, 'same_values': (out['Value_Metric'].to_numpy() == reference).all()} for name, (out, secs) in results.items()}
+
+# --- 3. Streaming ---
+def benchmark_streaming(df, n=5, chunk_size=10_000):
+    """Feeds `df` in scrape-sized chunks and compares with one top_n over everything."""
+    def stream():
+        top = StreamingTopN('Value_Metric', n, by='Category')
+        for start in range(0, len(df), chunk_size):
+            top.update(df.iloc[start:start + chunk_size])
+        return top.result()
+
+    out, secs = timed(stream, repeat=1)
+    reference = top_n(df, 'Value_Metric', n, by='Category')['Value_Metric'].to_numpy()
+    return {f'StreamingTopN (chunks of {chunk_size:,})': {'seconds': secs, 'same_values': (out['Value_Metric'].to_numpy() == reference).all()}}
+
+def benchmark_ranking(n_rows):
+    df = synthetic_transformed(n_rows)
+    results = {}
+    for name, func in [('top reviewed', benchmark_top_reviewed), ('best value', benchmark_best_value), ('top 5 per category', benchmark_category_top), ('streaming', benchmark_streaming)]:
+        for approach, row in func(df).items():
+            results[(name, approach)] = {**row, 'rows_per_sec': len(df) / row['seconds']}
+    return pd.DataFrame(results).T
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare full sorts with partial selection for the top-N queries.")
+    parser.add_argument("--rows", type=int, nargs='+', default=[1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        print(f"\n--- RANKING BENCHMARK ({n_rows:,} rows) ---")
+        print(benchmark_ranking(n_rows).to_string())
\ No newline at end of file
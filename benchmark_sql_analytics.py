@@ -0,0 +1,103 @@
+import io
+import os
+import time
+import argparse
+import tempfile
+import contextlib
+import pandas as pd
+
+from benchmark_storage import synthetic_transformed
+from benchmark_load import local_backend
+from benchmark_suite import load_frame
+from EDA_Runner import ANALYSES, load_shared
+from sql_analytics import INDEXES, SQL_SUMMARIES, ensure_indexes
+from load_to_sql import TABLE_NAME
+
+SIZES = [100_000, 1_000_000]
+
+# --- 1. Both Paths ---
+def pandas_path(csv_file, names):
+    """What EDA_Runner does today: pull the needed columns of the whole CSV into pandas, then aggregate."""
+    df = load_shared(names, csv_file)
+    return {name: ANALYSES[name][1](df) for name in names}
+
+def sql_path(backend, names):
+    conn = backend.connect()
+    try:
+        cursor = conn.cursor()
+        return {name: SQL_SUMMARIES[name](cursor, backend) for name in names}
+    finally:
+        conn.close()
+
+def drop_indexes(backend):
+    conn = backend.connect()
+    try:
+        cursor = conn.cursor()
+        for suffix in INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS IX_{TABLE_NAME}_{suffix}")
+        conn.commit()
+    finally:
+        conn.close()
+
+def create_indexes(backend):
+    conn = backend.connect()
+    try:
+        ensure_indexes(conn.cursor(), backend)
+    finally:
+        conn.close()
+
+def same_summaries(left, right):
+    """True when every table of two summary dicts matches (floats to 1e-9 relative)."""
+    for name in left:
+        for key, value in left[name].items():
+            other = right[name][key]
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                try:
+                    check = pd.testing.assert_frame_equal if isinstance(value, pd.DataFrame) else pd.testing.assert_series_equal
+                    check(value.reset_index(drop=True), other.reset_index(drop=True), check_dtype=False, check_names=False, check_categorical=False, rtol=1e-9)
+                except AssertionError:
+                    return False
+            elif value != other:
+                return False
+    return True
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+# --- 2. Benchmark ---
+def benchmark_sql_analytics(sizes=SIZES, backends=('sqlite', 'duckdb'), directory='.'):
+    names = list(SQL_SUMMARIES)
+    results = []
+    for n_rows in sizes:
+        df = synthetic_transformed(n_rows)
+        csv_file = os.path.join(directory, "bench_transformed.csv")
+        df.to_csv(csv_file, index=False)
+        expected, seconds = timed(lambda: pandas_path(csv_file, names))
+        results.append({'rows': len(df), 'path': 'pandas (read CSV + aggregate)', 'seconds': seconds, 'same_result': True})
+
+        for name in backends:
+            backend = local_backend(name, os.path.join(directory, f"bench.{name}.db"))
+            with contextlib.redirect_stdout(io.StringIO()):
+                load_frame(df, backend)
+            drop_indexes(backend)
+            got, seconds = timed(lambda: sql_path(backend, names))
+            results.append({'rows': len(df), 'path': f'{name} (no indexes)', 'seconds': seconds, 'same_result': same_summaries(expected, got)})
+            _, index_seconds = timed(lambda: create_indexes(backend))
+            got, seconds = timed(lambda: sql_path(backend, names))
+            results.append({'rows': len(df), 'path': f'{name} (indexed)', 'seconds': seconds, 'same_result': same_summaries(expected, got),
+                            'index_build_seconds': index_seconds})
+            print(f"    - {len(df):>10,} rows, {name}: done")
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the EDA aggregates in pandas with the same aggregates pushed down to SQL.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES)
+    parser.add_argument("--backends", choices=["sqlite", "duckdb"], nargs='+', default=["sqlite", "duckdb"])
+    args = parser.parse_args()
+
+    print("--- SQL ANALYTICS BENCHMARK ---")
+    with tempfile.TemporaryDirectory() as directory:
+        results = benchmark_sql_analytics(args.sizes, args.backends, directory)
+    print(results.round(3).to_string(index=False))
\ No newline at end of file
@@ -0,0 +1,51 @@
+import io
+import os
+import time
+import argparse
+import tempfile
+import contextlib
+import pandas as pd
+
+from storage import FORMATS, read_dataset, with_format, write_dataset
+from benchmark_cleaning import synthetic_raw
+from Data_Cleaning_Transformation import ENGINES
+
+SUBSET = ['Category', 'Price']  # Typical EDA read
+
+def synthetic_transformed(n_rows):
+    """Synthetic rows pushed through the vectorized clean + featurize engine."""
+    clean, featurize = ENGINES['vectorized']
+    with contextlib.redirect_stdout(io.StringIO()):
+        return featurize(clean(synthetic_raw(n_rows)))
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def benchmark_storage(n_rows, directory):
+    df = synthetic_transformed(n_rows)
+    results = {}
+    for fmt in FORMATS:
+        file_path = with_format(os.path.join(directory, "bench_transformed.csv"), fmt)
+        _, write_s = timed(write_dataset, df, file_path)
+        loaded, read_s = timed(read_dataset, file_path)
+        _, subset_s = timed(read_dataset, file_path, columns=SUBSET)
+        results[fmt] = {
+            'size_mb': os.path.getsize(file_path) / 1e6,
+            'write_s': write_s,
+            'read_all_s': read_s,
+            'read_subset_s': subset_s,
+            'keeps_category': isinstance(loaded['Price_Segment'].dtype, pd.CategoricalDtype),
+        }
+    return pd.DataFrame(results).T
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare file size and load time of CSV, Parquet and Arrow.")
+    parser.add_argument("--rows", type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in args.rows:
+            print(f"\n--- STORAGE BENCHMARK ({n_rows:,} rows; subset = {SUBSET}) ---")
+            print(benchmark_storage(n_rows, directory).round(3))
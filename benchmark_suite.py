@@ -0,0 +1,239 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from synthetic_catalog import CatalogProfile, generate_catalog, write_catalog
+from Data_Cleaning_Transformation import ENGINES, transform_in_chunks
+from load_to_sql import add_product_keys, insert_data_bulk
+from benchmark_load import fresh_cursor, local_backend
+from EDA_Runner import ANALYSES, compute_summaries
+from online_stats import summarize_file
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+MAX_IN_MEMORY = 2_000_000   # Larger sizes run the chunked (streaming) variant of each stage
+CHUNK_SIZE = 100_000
+RESULTS_DIR = "benchmark_results"
+TOLERANCE = 1.2             # --compare flags stages more than 20% slower than the baseline
+MIN_COMPARE_SECONDS = 0.5   # Faster stages are too noisy to flag
+
+# --- 1. Peak Memory ---
+def status_kb(field):
+    """A memory field of /proc/self/status (e.g. 'VmRSS', 'VmHWM') in kB."""
+    with open('/proc/self/status', encoding='ascii') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return None
+
+def reset_peak_rss():
+    """Resets the kernel's resident-set high-water mark (Linux only)."""
+    with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+        f.write('5')
+
+def check_memory_method(method):
+    if method == 'rss':
+        try:
+            reset_peak_rss()
+        except OSError:
+            print("⚠️ Peak RSS cannot be reset on this system; memory is not measured (try --memory tracemalloc).")
+            return 'none'
+    return method
+
+class PeakMemory:
+    """Measures the peak memory of the block, in MB.
+
+    'rss' resets the kernel's high-water mark of the resident set before
+    the block and reads it afterwards, which costs nothing. 'tracemalloc'
+    counts Python and NumPy allocations exactly but slows pandas code down
+    several times, so its timings are not comparable with untraced runs.
+    """
+
+    def __init__(self, method='rss'):
+        self.method = method
+        self.peak_mb = None
+        self.added_mb = None  # Peak minus the memory in use when the block started
+        self._baseline = 0.0
+        self._started = False
+
+    def __enter__(self):
+        if self.method == 'rss':
+            reset_peak_rss()
+            self._baseline = status_kb('VmRSS') * 1024 / 1e6
+        elif self.method == 'tracemalloc':
+            self._started = not tracemalloc.is_tracing()
+            if self._started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0] / 1e6
+        return self
+
+    def __exit__(self, *exc):
+        if self.method == 'rss':
+            self.peak_mb = status_kb('VmHWM') * 1024 / 1e6
+        elif self.method == 'tracemalloc':
+            self.peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+            if self._started:
+                tracemalloc.stop()
+        if self.peak_mb is not None:
+            self.added_mb = self.peak_mb - self._baseline
+        return False
+
+# --- 2. Stage Runner ---
+def run_stage(results, n_rows, stage, mode, memory, func, rows=None):
+    """Times func() and its peak memory, appends one result record and returns func()'s result.
+
+    `rows` is how many rows the stage processed (default `n_rows`); it sets the throughput.
+    """
+    with PeakMemory(memory) as mem:
+        with contextlib.redirect_stdout(io.StringIO()):  # Stage progress prints are not what we time
+            start = time.perf_counter()
+            out = func()
+            seconds = time.perf_counter() - start
+    rows = n_rows if rows is None else rows
+    results.append({
+        'rows': n_rows, 'stage': stage, 'mode': mode, 'rows_in': rows, 'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds > 0 else None, 'peak_mb': mem.peak_mb, 'added_mb': mem.added_mb,
+    })
+    peak = f"peak {mem.peak_mb:,.0f} MB (+{mem.added_mb:,.0f})" if mem.peak_mb is not None else ""
+    print(f"    - {stage:<10} {seconds:9.2f}s {rows / max(seconds, 1e-9):>14,.0f} rows/sec  {peak}")
+    return out
+
+def load_frame(df, backend):
+    """Loads one transformed frame into a fresh table, like load_to_sql.py --bulk."""
+    conn, cursor = fresh_cursor(backend)
+    try:
+        frame = add_product_keys(df.assign(Price_Segment=df['Price_Segment'].astype(object)))
+        if not insert_data_bulk(cursor, frame, backend=backend):
+            raise RuntimeError("bulk insert failed")
+    finally:
+        conn.close()
+
+def load_file(file_path, backend, chunksize=CHUNK_SIZE):
+    """Loads a transformed CSV chunk by chunk into a fresh table. Returns the rows loaded."""
+    conn, cursor = fresh_cursor(backend)
+    loaded = 0
+    try:
+        for chunk in pd.read_csv(file_path, chunksize=chunksize):
+            if not insert_data_bulk(cursor, add_product_keys(chunk), backend=backend):
+                raise RuntimeError("bulk insert failed")
+            loaded += len(chunk)
+    finally:
+        conn.close()
+    return loaded
+
+# --- 3. Suites ---
+def bench_in_memory(n_rows, results, profile, directory, memory='rss', engine='vectorized', backend_name='sqlite', seed=42):
+    """Each stage on a whole DataFrame, as the scripts run today."""
+    clean, featurize = ENGINES[engine]
+    backend = local_backend(backend_name, os.path.join(directory, f"bench.{backend_name}.db"))
+    stage = lambda name, func, rows=None: run_stage(results, n_rows, name, 'in-memory', memory, func, rows)
+
+    df = stage('generate', lambda: generate_catalog(n_rows, seed, profile=profile))
+    df = stage('clean', lambda: clean(df))
+    df = stage('featurize', lambda: featurize(df), rows=len(df))
+    stage('load', lambda: load_frame(df, backend), rows=len(df))
+    stage('eda', lambda: compute_summaries(df, tuple(ANALYSES), max_workers=1), rows=len(df))
+
+def bench_streaming(n_rows, results, profile, directory, memory='rss', engine='vectorized', backend_name='sqlite', seed=42):
+    """Each stage chunk by chunk through CSV files, for sizes that do not fit in memory."""
+    raw_file = os.path.join(directory, "bench_raw.csv")
+    transformed_file = os.path.join(directory, "bench_transformed.csv")
+    backend = local_backend(backend_name, os.path.join(directory, f"bench.{backend_name}.db"))
+    stage = lambda name, func, rows=None: run_stage(results, n_rows, name, 'streaming', memory, func, rows)
+
+    stage('generate', lambda: write_catalog(n_rows, raw_file, seed, profile=profile))
+    _, rows_out = stage('transform', lambda: transform_in_chunks(raw_file, transformed_file, engine=engine))
+    stage('load', lambda: load_file(transformed_file, backend), rows=rows_out)
+    stage('eda', lambda: summarize_file(transformed_file), rows=rows_out)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(sizes=SIZES, max_in_memory=MAX_IN_MEMORY, memory='rss', engine='vectorized', backend_name='sqlite', seed=42, workdir=None):
+    """Runs every stage at every size. Returns the results document (metadata + one record per size and stage)."""
+    memory = check_memory_method(memory)
+    profile = CatalogProfile.from_file()
+    results = []
+    for n_rows in sizes:
+        mode = 'in-memory' if n_rows <= max_in_memory else 'streaming'
+        print(f"\n⏳ {n_rows:,} rows ({mode}):")
+        with tempfile.TemporaryDirectory(dir=workdir) as directory:
+            suite = bench_in_memory if mode == 'in-memory' else bench_streaming
+            suite(n_rows, results, profile, directory, memory, engine, backend_name, seed)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {'engine': engine, 'backend': backend_name, 'memory': memory, 'seed': seed, 'max_in_memory': max_in_memory},
+        'results': results,
+    }
+
+# --- 4. Regression Check ---
+def compare_results(current, baseline, tolerance=TOLERANCE):
+    """Seconds per (rows, stage, mode) against a baseline results file.
+
+    A stage 'regressed' when it took more than `tolerance` times its
+    baseline time, ignoring stages under MIN_COMPARE_SECONDS.
+    """
+    key = ['rows', 'stage', 'mode']
+    now = pd.DataFrame(current['results']).set_index(key)[['seconds', 'peak_mb']]
+    before = pd.DataFrame(baseline['results']).set_index(key)[['seconds', 'peak_mb']]
+    joined = now.join(before, lsuffix='', rsuffix='_baseline', how='inner')
+    joined['ratio'] = joined['seconds'] / joined['seconds_baseline']
+    joined['regressed'] = (joined['ratio'] > tolerance) & (joined['seconds'] >= MIN_COMPARE_SECONDS)
+    return joined[['seconds_baseline', 'seconds', 'ratio', 'peak_mb_baseline', 'peak_mb', 'regressed']]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic data at several scales.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES, help="Row counts to benchmark.")
+    parser.add_argument("--max-in-memory", type=int, default=MAX_IN_MEMORY, help="Larger sizes use the chunked variants of each stage.")
+    parser.add_argument("--memory", choices=["rss", "tracemalloc", "none"], default="rss", help="How peak memory is measured (tracemalloc slows the stages down).")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="vectorized", help="Cleaning engine.")
+    parser.add_argument("--backend", choices=["sqlite", "duckdb"], default="sqlite", help="Database the load stage writes to.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default=None, help="Directory for the temporary data files and database (default: system temp).")
+    parser.add_argument("--output", default=None, help=f"Results JSON (default: {RESULTS_DIR}/suite-<timestamp>.json).")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to check for regressions.")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Slowdown ratio that counts as a regression.")
+    args = parser.parse_args()
+
+    print("--- BENCHMARK SUITE ---")
+    document = run_suite(args.sizes, args.max_in_memory, args.memory, args.engine, args.backend, args.seed, args.workdir)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"suite-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"\n✅ Results written to '{output}'.")
+
+    summary = pd.DataFrame(document['results']).set_index(['rows', 'stage'])
+    print(summary[['mode', 'seconds', 'rows_per_sec', 'peak_mb', 'added_mb']].round(2).to_string())
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison = compare_results(document, baseline, args.tolerance)
+        print(f"\n--- Compared with '{args.compare}' ---")
+        print(comparison.round(3).to_string())
+        if comparison['regressed'].any():
+            print(f"❌ {int(comparison['regressed'].sum())} stage(s) took more than {args.tolerance:.0%} of their baseline time.")
+            sys.exit(1)
+        print("✅ No regressions.")
\ No newline at end of file
@@ -0,0 +1,403 @@
+import os
+import queue
+import sqlite3
+import threading
+import configparser
+from contextlib import contextmanager
+
+try:
+    import pyodbc
+except ImportError:
+    pyodbc = None  # SQL Server backend unavailable without an ODBC driver manager
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# --- 1. Configuration ---
+DB_CONFIG_FILE = "db_config.ini"
+
+# Used when neither the environment nor the config file says otherwise
+DEFAULT_DB_CONFIG = {
+    'backend': 'sqlserver',
+    'connection_string': 'DRIVER={ODBC Driver 17 for SQL Server};SERVER=INTELPROGRAMER;DATABASE=Banggood_Final;Trusted_Connection=yes;',
+    'path': 'banggood.db',  # SQLite / DuckDB database file
+    'pool_size': '2',
+}
+
+# Environment variable -> config key (environment wins over the file)
+ENV_OVERRIDES = {
+    'BANGGOOD_DB_BACKEND': 'backend',
+    'BANGGOOD_DB_CONNECTION_STRING': 'connection_string',
+    'BANGGOOD_DB_PATH': 'path',
+    'BANGGOOD_DB_POOL_SIZE': 'pool_size',
+}
+
+def load_db_config(file_path=None):
+    """Reads the [database] section of db_config.ini (or $BANGGOOD_DB_CONFIG), then applies env overrides."""
+    config = dict(DEFAULT_DB_CONFIG)
+    file_path = file_path or os.environ.get('BANGGOOD_DB_CONFIG', DB_CONFIG_FILE)
+    if os.path.exists(file_path):
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.read(file_path, encoding='utf-8')
+        if parser.has_section('database'):
+            config.update(parser['database'])
+    for env_name, key in ENV_OVERRIDES.items():
+        if os.environ.get(env_name):
+            config[key] = os.environ[env_name]
+    return config
+
+# --- 2. DuckDB DB-API Shim ---
+class DuckDBCursor:
+    """Gives a DuckDB connection the cursor interface the loader uses (execute, fetchone, .connection)."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._conn = connection.raw
+
+    def execute(self, sql, params=None):
+        self.connection.begin_if_needed()
+        self._conn.execute(sql, params or [])
+        return self
+
+    def executemany(self, sql, rows):
+        self.connection.begin_if_needed()
+        self._conn.executemany(sql, rows)
+        return self
+
+    def fetchone(self):
+        return self._conn.fetchone()
+
+    def fetchall(self):
+        return self._conn.fetchall()
+
+    @property
+    def description(self):
+        return self._conn.description
+
+class DuckDBConnection:
+    """DuckDB autocommits by default; this opens a transaction on first use so commit/rollback behave like pyodbc."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._in_transaction = False
+
+    def begin_if_needed(self):
+        if not self._in_transaction:
+            self.raw.begin()
+            self._in_transaction = True
+
+    def cursor(self):
+        return DuckDBCursor(self)
+
+    def commit(self):
+        if self._in_transaction:
+            self.raw.commit()
+            self._in_transaction = False
+
+    def rollback(self):
+        if self._in_transaction:
+            self.raw.rollback()
+            self._in_transaction = False
+
+    def close(self):
+        self.rollback()
+        self.raw.close()
+
+# --- 3. Backends ---
+class DatabaseBackend:
+    """Connection and dialect details for one database engine.
+
+    The loader writes portable SQL with '?' placeholders; everything that
+    differs between engines (DDL, temp tables, MERGE, NULL-safe compare)
+    comes from the backend.
+    """
+    name = None
+    label = None
+    supports_frame_insert = False
+
+    def __init__(self, config):
+        self.config = config
+
+    def connect(self):
+        raise NotImplementedError
+
+    def create_table_statements(self, table_name, drop_existing):
+        raise NotImplementedError
+
+    def stage_table(self, table_name):
+        raise NotImplementedError
+
+    def create_stage_statement(self, stage, table_name, cols):
+        raise NotImplementedError
+
+    def differs(self, left, right):
+        """NULL-safe 'left is different from right'."""
+        return f"{left} IS DISTINCT FROM {right}"
+
+    def merge_statements(self, table_name, stage, key, cols, keep=()):
+        """Default upsert: UPDATE ... FROM for changed matches, INSERT ... SELECT for new keys.
+
+        Columns in `keep` are only written for new keys: matched rows are
+        neither compared nor updated on them.
+        """
+        compared = [c for c in cols if c != key and c not in keep]
+        changed = ' OR '.join(self.differs(f"t.{c}", f"s.{c}") for c in compared)
+        sets = ', '.join(f"{c} = s.{c}" for c in compared)
+        col_list = ', '.join(cols)
+        return [
+            f"""UPDATE {table_name} AS t SET {sets}
+                FROM {stage} AS s WHERE t.{key} = s.{key} AND ({changed})""",
+            f"""INSERT INTO {table_name} ({col_list})
+                SELECT {col_list} FROM {stage} AS s
+                WHERE NOT EXISTS (SELECT 1 FROM {table_name} AS t WHERE t.{key} = s.{key})""",
+        ]
+
+    def create_index_statement(self, table_name, index_name, columns):
+        return f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)})"
+
+    def limit(self, sql, n):
+        """`sql` (ending in ORDER BY) cut to its first n rows."""
+        return f"{sql} LIMIT {int(n)}"
+
+    def describe(self):
+        return self.label
+
+class SQLServerBackend(DatabaseBackend):
+    name = 'sqlserver'
+    label = 'SQL Server'
+    dialect = 'mssql'
+
+    def connect(self):
+        if pyodbc is None:
+            raise ImportError("pyodbc (and an ODBC driver manager) is required for the SQL Server backend.")
+        return pyodbc.connect(self.config['connection_string'])
+
+    def describe(self):
+        for part in self.config['connection_string'].split(';'):
+            if part.upper().startswith('DATABASE='):
+                return f"SQL Server database {part.split('=', 1)[1]}"
+        return self.label
+
+    def create_table_statements(self, table_name, drop_existing):
+        table_sql = f"""
+    CREATE TABLE {table_name} (
+        ProductID INT PRIMARY KEY IDENTITY(1,1),
+        ProductKey NVARCHAR(20),
+        Category NVARCHAR(50),
+        Name NVARCHAR(500) NOT NULL,
+        Price DECIMAL(10, 2),
+        Rating DECIMAL(3, 2),
+        Reviews INT,
+        URL NVARCHAR(1000),
+        Price_Segment NVARCHAR(50),
+        Name_Length INT,
+        Price_Per_Char DECIMAL(10, 4)
+    );
+    -- Natural key lookups for merge loads
+    CREATE INDEX IX_{table_name}_ProductKey ON {table_name} (ProductKey);
+    """
+        if drop_existing:
+            return [f"""
+    -- Drop the table if it exists to allow fresh runs
+    IF OBJECT_ID('{table_name}', 'U') IS NOT NULL
+        DROP TABLE {table_name};
+        """ + table_sql]
+        # Keep existing rows; only create the table on the first run
+        return [f"""
+    IF OBJECT_ID('{table_name}', 'U') IS NULL
+    BEGIN
+    {table_sql}
+    END
+    """]
+
+    def stage_table(self, table_name):
+        return f"#{table_name}_Stage"
+
+    def create_index_statement(self, table_name, index_name, columns):
+        return f"""
+    IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{index_name}' AND object_id = OBJECT_ID('{table_name}'))
+        CREATE INDEX {index_name} ON {table_name} ({', '.join(columns)});
+    """
+
+    def limit(self, sql, n):
+        return f"{sql} OFFSET 0 ROWS FETCH NEXT {int(n)} ROWS ONLY"
+
+    def create_stage_statement(self, stage, table_name, cols):
+        return f"SELECT {', '.join(cols)} INTO {stage} FROM {table_name} WHERE 1 = 0"
+
+    def differs(self, left, right):
+        return f"({left} <> {right} OR ({left} IS NULL AND {right} IS NOT NULL) OR ({left} IS NOT NULL AND {right} IS NULL))"
+
+    def merge_statements(self, table_name, stage, key, cols, keep=()):
+        compared = [c for c in cols if c != key and c not in keep]
+        changed = ' OR '.join(self.differs(f"t.{c}", f"s.{c}") for c in compared)
+        sets = ', '.join(f"t.{c} = s.{c}" for c in compared)
+        values = ', '.join(f"s.{c}" for c in cols)
+        return [f"""
+        MERGE {table_name} AS t
+        USING {stage} AS s ON t.{key} = s.{key}
+        WHEN MATCHED AND ({changed}) THEN UPDATE SET {sets}
+        WHEN NOT MATCHED BY TARGET THEN INSERT ({', '.join(cols)}) VALUES ({values});
+    """]
+
+class SQLiteBackend(DatabaseBackend):
+    name = 'sqlite'
+    label = 'SQLite'
+    dialect = 'sqlite'
+
+    def connect(self):
+        # Pooled connections may be handed to another thread
+        return sqlite3.connect(self.config['path'], check_same_thread=False)
+
+    def describe(self):
+        return f"SQLite file {self.config['path']}"
+
+    def create_table_statements(self, table_name, drop_existing):
+        statements = [f"DROP TABLE IF EXISTS {table_name}"] if drop_existing else []
+        return statements + [
+            f"""
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        ProductID INTEGER PRIMARY KEY AUTOINCREMENT,
+        ProductKey TEXT,
+        Category TEXT,
+        Name TEXT NOT NULL,
+        Price REAL,
+        Rating REAL,
+        Reviews INTEGER,
+        URL TEXT,
+        Price_Segment TEXT,
+        Name_Length INTEGER,
+        Price_Per_Char REAL
+    )""",
+            f"CREATE INDEX IF NOT EXISTS IX_{table_name}_ProductKey ON {table_name} (ProductKey)",
+        ]
+
+    def stage_table(self, table_name):
+        return f"temp.{table_name}_Stage"
+
+    def create_stage_statement(self, stage, table_name, cols):
+        return f"CREATE TEMP TABLE {stage.split('.')[-1]} AS SELECT {', '.join(cols)} FROM {table_name} WHERE 0"
+
+    def differs(self, left, right):
+        return f"{left} IS NOT {right}"
+
+class DuckDBBackend(DatabaseBackend):
+    name = 'duckdb'
+    label = 'DuckDB'
+    dialect = 'duckdb'
+    supports_frame_insert = True
+
+    def connect(self):
+        if duckdb is None:
+            raise ImportError("duckdb is required for the DuckDB backend.")
+        return DuckDBConnection(duckdb.connect(self.config['path']))
+
+    def describe(self):
+        return f"DuckDB file {self.config['path']}"
+
+    def create_table_statements(self, table_name, drop_existing):
+        statements = [f"DROP TABLE IF EXISTS {table_name}", f"DROP SEQUENCE IF EXISTS {table_name}_Seq"] if drop_existing else []
+        return statements + [
+            f"CREATE SEQUENCE IF NOT EXISTS {table_name}_Seq",
+            f"""
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        ProductID INTEGER PRIMARY KEY DEFAULT nextval('{table_name}_Seq'),
+        ProductKey VARCHAR,
+        Category VARCHAR,
+        Name VARCHAR NOT NULL,
+        Price DECIMAL(10, 2),
+        Rating DECIMAL(3, 2),
+        Reviews INTEGER,
+        URL VARCHAR,
+        Price_Segment VARCHAR,
+        Name_Length INTEGER,
+        Price_Per_Char DECIMAL(10, 4)
+    )""",
+            f"CREATE INDEX IF NOT EXISTS IX_{table_name}_ProductKey ON {table_name} (ProductKey)",
+        ]
+
+    def stage_table(self, table_name):
+        return f"temp.{table_name}_Stage"
+
+    def create_stage_statement(self, stage, table_name, cols):
+        return f"CREATE TEMP TABLE {stage.split('.')[-1]} AS SELECT {', '.join(cols)} FROM {table_name} WHERE false"
+
+    def insert_frame(self, cursor, df, table_name):
+        """Inserts a DataFrame in one statement; DuckDB's executemany goes row by row."""
+        cursor.connection.begin_if_needed()
+        raw = cursor.connection.raw
+        raw.register('_load_batch', df)
+        try:
+            raw.execute(f"INSERT INTO {table_name} ({', '.join(df.columns)}) SELECT * FROM _load_batch")
+        finally:
+            raw.unregister('_load_batch')
+
+BACKENDS = {backend.name: backend for backend in (SQLServerBackend, SQLiteBackend, DuckDBBackend)}
+
+# Driver errors the loader handles, for whichever drivers are installed
+DB_ERRORS = (sqlite3.Error,) \
+    + ((pyodbc.Error,) if pyodbc is not None else ()) \
+    + ((duckdb.Error,) if duckdb is not None else ())
+
+def get_backend(config=None):
+    """Builds the configured backend (see load_db_config())."""
+    config = config or load_db_config()
+    try:
+        return BACKENDS[config['backend'].lower()](config)
+    except KeyError:
+        raise ValueError(f"Unknown database backend '{config['backend']}'. Choose one of: {', '.join(BACKENDS)}")
+
+# --- 4. Connection Pool ---
+class ConnectionPool:
+    """Bounded pool of open connections to one backend, reused across loads and reports."""
+
+    def __init__(self, backend, size=None):
+        self.backend = backend
+        self.size = int(size or backend.config.get('pool_size', 2))
+        self._idle = queue.Queue()
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._open < self.size
+            if can_open:
+                self._open += 1
+        if not can_open:
+            return self._idle.get()
+        try:
+            return self.backend.connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+
+    def release(self, conn):
+        try:
+            conn.rollback()  # Never hand out a connection with a half-done transaction
+        except DB_ERRORS:
+            pass
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._open -= 1
@@ -0,0 +1,275 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+from storage import latest_version, pa, read_dataset, write_dataset
+from incremental import RAW_FILE
+from compact_frame import product_ids
+
+try:
+    import pyarrow.compute as pc
+except ImportError:
+    pc = None
+
+DEDUP_FILE = "banggood_deduplicated.csv"
+DUPLICATES_FILE = "banggood_duplicates.csv"
+THRESHOLD = 0.8     # Word-set Jaccard similarity at which two names count as the same listing
+NUM_PERM = 32       # MinHash values per name
+BANDS = 8           # LSH bands of NUM_PERM // BANDS values; pairs above ~0.6 similarity usually share one
+BATCH_PAIRS = 1_000_000   # Candidate pairs compared at a time
+ESTIMATE_SLACK = 0.2      # Candidates whose MinHash estimate is this far below the threshold still get the exact check
+TOKEN_STRIP = r'[^0-9a-z]+'
+EMPTY = np.iinfo(np.uint32).max  # Signature value of names without any word
+
+# --- 1. Hash Index ---
+def mix64(x):
+    """splitmix64 finalizer: spreads uint64 keys over all 64 bits (wraps on overflow by design)."""
+    x = np.asarray(x, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def first_occurrence(keys):
+    """For each key, the position of its first occurrence (itself when it is the first).
+
+    One hash-table pass (pd.factorize) instead of comparing rows with each
+    other: factorize numbers keys in order of first appearance, so a
+    position is a first occurrence exactly when its code is a new maximum.
+    """
+    codes, _ = pd.factorize(keys)
+    positions = np.arange(len(codes))
+    if len(codes) == 0:
+        return positions
+    is_first = np.r_[True, codes[1:] > np.maximum.accumulate(codes)[:-1]]
+    first = np.empty(codes.max() + 1, dtype=np.int64)
+    first[codes[is_first]] = positions[is_first]
+    return first[codes]
+
+def exact_duplicates(ids):
+    """(duplicate, kept) positions of rows whose product ID (float, NaN for none) is the same as an earlier row's.
+
+    Rows without a product ID are never exact duplicates; near_duplicates() may still match them.
+    """
+    has_id = ~np.isnan(ids)
+    positions = np.flatnonzero(has_id)
+    first = positions[first_occurrence(ids[has_id])]
+    duplicate = first != positions
+    return positions[duplicate], first[duplicate]
+
+# --- 2. MinHash / LSH ---
+def tokenize(names):
+    """Lower-cased alphanumeric words of every name as (row of each token, token code, vocabulary).
+
+    Names are split on whitespace and punctuation is then stripped once per
+    distinct word ('1:18' -> '118', 'Wi-Fi' -> 'wifi') rather than once per
+    token, which keeps regex work proportional to the vocabulary.
+    """
+    names = pd.Series(names).reset_index(drop=True)
+    if pc is not None:
+        lists = pc.utf8_split_whitespace(pc.utf8_lower(pa.array(names.astype(object), type=pa.string(), from_pandas=True)))
+        encoded = pc.list_flatten(lists).dictionary_encode()
+        rows = pc.list_parent_indices(lists).to_numpy()
+        codes, words = encoded.indices.to_numpy(), encoded.dictionary.to_numpy(zero_copy_only=False)
+    else:
+        tokens = names.str.lower().str.split().explode().dropna()
+        rows = tokens.index.to_numpy()
+        codes, words = pd.factorize(tokens)
+    normalized = pd.Series(words, dtype=object).str.replace(TOKEN_STRIP, '', regex=True)
+    word_codes, vocabulary = pd.factorize(normalized.where(normalized != ''))  # Punctuation-only words get -1
+    codes = word_codes[codes]
+    keep = codes >= 0
+    return rows[keep].astype(np.int64), codes[keep].astype(np.int64), np.asarray(vocabulary, dtype=object)
+
+def minhash_signatures(token_rows, token_codes, vocabulary, n_rows, num_perm=NUM_PERM, seed=0):
+    """(n_rows, num_perm) uint32 MinHash signatures of the word sets; rows without words get EMPTY.
+
+    Each of the num_perm hash functions is the word hash mixed with its own
+    salt. The values are computed once per vocabulary word, so each token
+    costs one table lookup plus the row minimum. One hash function at a
+    time: 1-D reduceat is several times faster than along axis 0 of a 2-D
+    array, and only one value per token is in memory at once.
+    """
+    salts = np.random.default_rng(seed).integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    word_hashes = pd.util.hash_array(vocabulary).astype(np.uint64)
+    table = (mix64(word_hashes[None, :] ^ salts[:, None]) >> np.uint64(32)).astype(np.uint32)
+
+    signatures = np.full((n_rows, num_perm), EMPTY, dtype=np.uint32)
+    if len(token_rows) == 0:
+        return signatures
+    row_starts = np.flatnonzero(np.r_[True, token_rows[1:] != token_rows[:-1]])
+    rows = token_rows[row_starts]
+    for perm in range(num_perm):
+        signatures[rows, perm] = np.minimum.reduceat(table[perm][token_codes], row_starts)
+    return signatures
+
+def band_keys(signatures, bands=BANDS):
+    """One uint64 bucket key per row and band; rows share a bucket when the band's values are all equal."""
+    n_rows, num_perm = signatures.shape
+    width = num_perm // bands
+    weights = mix64(np.arange(1, width + 1, dtype=np.uint64)) | np.uint64(1)  # Odd multipliers
+    keys = np.empty((n_rows, bands), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for band in range(bands):
+            block = signatures[:, band * width:(band + 1) * width].astype(np.uint64)
+            keys[:, band] = mix64((block * weights).sum(axis=1, dtype=np.uint64) + np.uint64(band))
+    return keys
+
+def estimated_similarity(signatures, a, b):
+    """Share of equal MinHash values of rows a and b: an unbiased estimate of their Jaccard similarity."""
+    estimate = np.empty(len(a))
+    for start in range(0, len(a), BATCH_PAIRS):
+        stop = start + BATCH_PAIRS
+        estimate[start:stop] = (signatures[a[start:stop]] == signatures[b[start:stop]]).mean(axis=1)
+    return estimate
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def near_duplicates(names, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """(duplicate, kept, similarity) positions of names whose word sets are at least `threshold` similar.
+
+    Locality-sensitive hashing: rows sharing any band bucket with an earlier
+    row become candidates, instead of comparing all n*(n-1)/2 pairs. A
+    candidate is paired with the first row of its bucket, so each row costs
+    at most `bands` pairs. Pairs whose signatures are clearly too different
+    are dropped in bulk; the rest get an exact Jaccard check.
+    """
+    n_rows = len(names)
+    if n_rows == 0:
+        return (np.array([], dtype=np.int64),) * 2 + (np.array([]),)
+    token_rows, token_codes, vocabulary = tokenize(names)
+    signatures = minhash_signatures(token_rows, token_codes, vocabulary, n_rows, num_perm)
+    has_words = np.zeros(n_rows, dtype=bool)
+    has_words[token_rows] = True
+    positions = np.flatnonzero(has_words)
+    keys = band_keys(signatures[has_words], bands)
+
+    candidates = []
+    for band in range(bands):
+        first = positions[first_occurrence(keys[:, band])]
+        shared = first != positions
+        candidates.append(positions[shared] * n_rows + first[shared])
+    del keys
+    pairs = pd.unique(np.concatenate(candidates))
+    later, earlier = pairs // n_rows, pairs % n_rows
+    likely = estimated_similarity(signatures, later, earlier) >= threshold - ESTIMATE_SLACK
+    later, earlier = later[likely], earlier[likely]
+    del signatures
+
+    # Exact check: word-code sets of the rows still involved
+    bounds = np.searchsorted(token_rows, np.arange(n_rows + 1))
+    involved = pd.unique(np.concatenate([later, earlier]))
+    words = {row: set(token_codes[bounds[row]:bounds[row + 1]].tolist()) for row in involved.tolist()}
+    similarity = np.array([jaccard(words[a], words[b]) for a, b in zip(later.tolist(), earlier.tolist())])
+    match = similarity >= threshold
+    return later[match], earlier[match], similarity[match]
+
+# --- 3. Dedup Stage ---
+def resolve_clusters(duplicate, kept, matches, has_id):
+    """Union-find over the matched pairs.
+
+    Each cluster keeps one row: its row with a product ID if there is one,
+    else its earliest row. A near match never merges two clusters that both
+    hold a product ID, since different IDs are different products; the pair
+    becomes a candidate instead.
+    Returns ({position: (kept row, (match, similarity))} for every row to
+    drop, {position: (kept row, ('candidate', similarity))} for the later
+    row of each candidate pair). Both are reported for the row they linked.
+    """
+    parent, linked_by, flagged = {}, {}, []
+    def root(x):
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])  # Path halving
+            x = parent[x]
+        return x
+    for a, b, match in zip(duplicate.tolist(), kept.tolist(), matches):
+        ra, rb = root(a), root(b)
+        if ra == rb:
+            continue
+        if match[0] == 'near' and has_id[ra] and has_id[rb]:
+            flagged.append((a, b, match[1]))
+            continue
+        winner, loser = sorted((ra, rb), key=lambda r: (not has_id[r], r))
+        parent[loser] = winner
+        linked_by[loser] = match
+    dropped = {x: (root(x), linked_by[x]) for x in parent}
+    candidates = {}
+    for a, b, similarity in flagged:
+        first, later = sorted((root(a), root(b)))
+        candidates.setdefault(later, (first, ('candidate', similarity)))
+    return dropped, candidates
+
+def match_rows(df, near=True, threshold=THRESHOLD):
+    """resolve_clusters() over the exact and (with near=True) near matches of `df`, by position.
+
+    Exact matches (same product ID in the URL, e.g. one product listed in
+    several categories or flash-deal slots) are resolved first; near
+    matches on the listing name then run on the remaining rows, but only
+    drop rows without a product ID.
+    """
+    ids = product_ids(df['URL'].to_numpy()).to_numpy()
+    has_id = ~np.isnan(ids)
+    duplicate, kept = exact_duplicates(ids)
+    matches = [('exact', 1.0)] * len(duplicate)
+    if near:
+        remaining = np.setdiff1d(np.arange(len(df)), duplicate)
+        dup_near, kept_near, similarity = near_duplicates(df['Name'].iloc[remaining], threshold)
+        duplicate = np.concatenate([duplicate, remaining[dup_near]])
+        kept = np.concatenate([kept, remaining[kept_near]])
+        matches += [('near', s) for s in similarity.tolist()]
+    return resolve_clusters(duplicate, kept, matches, has_id)
+
+def duplicates_frame(df, dropped, candidates):
+    """One row per match_rows() entry: Duplicate_Of (index label of the kept row), Match, Similarity and Cross_Category."""
+    linked = {**dropped, **candidates}
+    positions = sorted(linked)
+    kept = [linked[pos][0] for pos in positions]
+    category = df['Category'].to_numpy()
+    return pd.DataFrame({
+        'Duplicate_Of': df.index[kept],
+        'Match': [linked[pos][1][0] for pos in positions],
+        'Similarity': [linked[pos][1][1] for pos in positions],
+        'Cross_Category': category[positions] != category[kept],
+    }, index=df.index[positions])
+
+def find_duplicates(df, near=True, threshold=THRESHOLD):
+    """Every duplicate of `df` ('exact'/'near', dropped by deduplicate()) and every 'candidate' (kept), as duplicates_frame()."""
+    return duplicates_frame(df, *match_rows(df, near, threshold))
+
+def deduplicate(df, near=True, threshold=THRESHOLD):
+    """Returns (df without duplicates, find_duplicates() report). Rows are dropped by position, so repeated index labels are safe."""
+    dropped, candidates = match_rows(df, near, threshold)
+    keep = np.ones(len(df), dtype=bool)
+    keep[list(dropped)] = False
+    return df[keep], duplicates_frame(df, dropped, candidates)
+
+def report_duplicates(df, duplicates):
+    print("\n--- Deduplication ---")
+    counts = duplicates['Match'].value_counts()
+    dropped = duplicates['Match'] != 'candidate'
+    cross = (duplicates['Cross_Category'] & dropped).sum()
+    print(f"Exact (same product ID): {counts.get('exact', 0):,} | Near (similar names): {counts.get('near', 0):,} | Across categories: {cross:,}")
+    if counts.get('candidate', 0):
+        print(f"ℹ️ {counts['candidate']:,} similar names with different product IDs kept (Match 'candidate' in the report).")
+    print(f"✅ {len(df) - dropped.sum():,} of {len(df):,} rows kept.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drop repeated products from a scrape before cleaning.")
+    parser.add_argument("--input", default=RAW_FILE, help="Raw scrape (its newest CSV/Parquet/Arrow copy is used).")
+    parser.add_argument("--output", default=DEDUP_FILE, help="Deduplicated scrape (format from the extension).")
+    parser.add_argument("--duplicates", default=DUPLICATES_FILE, help="CSV listing every dropped row and the row it duplicates.")
+    parser.add_argument("--exact-only", action="store_true", help="Match product IDs only, not similar names.")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Name similarity (word-set Jaccard) that counts as a duplicate.")
+    args = parser.parse_args()
+
+    try:
+        raw = read_dataset(latest_version(args.input))
+    except FileNotFoundError:
+        print(f"❌ Error: File not found at {args.input}. Ensure the scraping script ran.")
+        raise SystemExit(1)
+    deduped, duplicates = deduplicate(raw, near=not args.exact_only, threshold=args.threshold)
+    report_duplicates(raw, duplicates)
+    write_dataset(deduped, args.output)
+    duplicates.join(raw[['Category', 'Name']]).to_csv(args.duplicates, index_label='Row')
+    print(f"✅ Saved '{args.output}' and '{args.duplicates}'.")
\ No newline at end of file
@@ -0,0 +1,147 @@
+import os
+import glob
+import json
+import pickle
+import hashlib
+import threading
+
+CACHE_DIR = ".eda_cache"
+FINGERPRINT_FILE = "fingerprints.json"
+# Bump when a summarize_* function changes what it returns, so old entries are not reused
+CACHE_VERSION = 3
+HASH_CHUNK = 1 << 20  # Bytes read per step while hashing a data file
+MAX_ENTRIES = 200                # Summaries kept; the least recently used go first
+MAX_BYTES = 256 * (1 << 20)      # ... and at most this much on disk
+
+# --- 1. Input Fingerprints ---
+def file_digest(file_path):
+    """BLAKE2b of the file contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def params_digest(params):
+    return hashlib.blake2b(json.dumps(params, sort_keys=True, default=str).encode('utf-8'), digest_size=8).hexdigest()
+
+# --- 2. Aggregate Cache ---
+class AggregateCache:
+    """On-disk cache of analysis summaries keyed by (data fingerprint, analysis, parameters).
+
+    The fingerprint is a hash of the data file contents, so a rewritten file
+    invalidates its entries even when the name stays the same. The hash
+    itself is remembered per (path, size, mtime), so an unchanged file is not
+    read again. Entries for different data (the full file, price-history
+    windows) live side by side; once there are more than MAX_ENTRIES or
+    MAX_BYTES, the least recently used are evicted.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def fingerprint(self, file_path):
+        """Content hash of `file_path`, or None if it does not exist."""
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        index_path = os.path.join(self.cache_dir, FINGERPRINT_FILE)
+        with self._lock:
+            index = self._read_json(index_path)
+            path_key = os.path.abspath(file_path)
+            entry = index.get(path_key)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                return entry['digest']
+            digest = file_digest(file_path)
+            index[path_key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+            self._write_atomic(index_path, json.dumps(index).encode('utf-8'))
+            return digest
+
+    def _entry_path(self, fingerprint, name, params):
+        return os.path.join(self.cache_dir, f"{name}-{params_digest(params)}-{fingerprint}.pkl")
+
+    def get(self, fingerprint, name, params=None):
+        """Returns the cached summary, or None (counted as a miss)."""
+        params = {'version': CACHE_VERSION, **(params or {})}
+        value = None
+        if fingerprint is not None:
+            entry_path = self._entry_path(fingerprint, name, params)
+            try:
+                with open(entry_path, 'rb') as f:
+                    value = pickle.load(f)
+                os.utime(entry_path)  # Mark as recently used for eviction
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def contains(self, fingerprint, name, params=None):
+        """True if get() would hit; does not touch the counters."""
+        params = {'version': CACHE_VERSION, **(params or {})}
+        return fingerprint is not None and os.path.exists(self._entry_path(fingerprint, name, params))
+
+    def put(self, fingerprint, name, value, params=None):
+        """Stores `value`, then evicts the least recently used entries beyond MAX_ENTRIES/MAX_BYTES."""
+        if fingerprint is None:
+            return
+        params = {'version': CACHE_VERSION, **(params or {})}
+        self._write_atomic(self._entry_path(fingerprint, name, params), pickle.dumps(value))
+        self.evict()
+
+    def evict(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, '*.pkl')):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # Removed by a concurrent run
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort(reverse=True)  # Most recently used first
+        total = 0
+        for i, (_, size, path) in enumerate(entries):
+            total += size
+            if i >= max_entries or total > max_bytes:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def get_or_compute(self, fingerprint, name, compute, params=None):
+        value = self.get(fingerprint, name, params)
+        if value is None:
+            value = compute()
+            self.put(fingerprint, name, value, params)
+        return value
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0}
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.cache_dir, '*')):
+            os.remove(path)
+
+    @staticmethod
+    def _read_json(file_path):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _write_atomic(file_path, data):
+        tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)  # Readers never see half an entry
\ No newline at end of file
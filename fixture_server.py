@@ -0,0 +1,98 @@
+import html
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, unquote, parse_qs
+import pandas as pd
+
+FIXTURE_FILE = "banggood_5_categories.csv"
+
+# --- 1. Fixture Pages ---
+def load_fixture_rows(file_path=FIXTURE_FILE):
+    """Groups previously scraped rows by category so they can be served back as pages."""
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    return {cat: group for cat, group in df.groupby('Category', sort=False)}
+
+def render_category_page(category_name, rows, next_url=None):
+    """Renders a minimal category page using the same card markup as banggood.com."""
+    cards = []
+    for _, row in rows.iterrows():
+        name = html.escape(row['Name'], quote=True)
+        url = html.escape(row['URL'], quote=True)
+        price = html.escape(row['Price'])
+        cards.append(
+            f'<li class="product-item"><a href="{url}" title="{name}"><img alt="{name}"></a>'
+            f'<span class="price">{price}</span></li>'
+        )
+    pager = f'<a class="next" rel="next" href="{html.escape(next_url, quote=True)}">Next</a>' if next_url else ''
+    return (
+        f"<html><head><title>{html.escape(category_name)}</title></head><body>"
+        f"<ul class=\"goodlist\">{''.join(cards)}</ul>{pager}</body></html>"
+    )
+
+# --- 2. Stand-in HTTP Server ---
+class FixtureHandler(BaseHTTPRequestHandler):
+    pages = {}
+    page_size = None  # Cards per page; None serves each category as a single page
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        category_name = unquote(parsed.path.strip('/')).removesuffix('.html')
+        rows = self.pages.get(category_name)
+        if rows is None:
+            self.send_error(404)
+            return
+
+        next_url = None
+        if self.page_size:
+            page = int(parse_qs(parsed.query).get('page', ['1'])[0])
+            start = (page - 1) * self.page_size
+            if start >= len(rows) and page > 1:
+                self.send_error(404)
+                return
+            if start + self.page_size < len(rows):
+                next_url = f"{parsed.path}?page={page + 1}"
+            rows = rows.iloc[start:start + self.page_size]
+
+        body = render_category_page(category_name, rows, next_url).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scraper output readable
+
+def start_fixture_server(file_path=FIXTURE_FILE, host='127.0.0.1', port=0, page_size=None):
+    """Serves the fixture pages from a background thread. Returns (server, base_url).
+
+    With `page_size` set, each category is split into pages linked by a
+    "next" anchor, like the paginated listings on banggood.com.
+    """
+    handler = type('BoundFixtureHandler', (FixtureHandler,), {
+        'pages': load_fixture_rows(file_path),
+        'page_size': page_size,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def fixture_categories(base_url, file_path=FIXTURE_FILE):
+    """Category -> URL mapping pointing at the fixture server, like CATEGORIES in the scraper."""
+    return {cat: f"{base_url}/{cat}.html" for cat in load_fixture_rows(file_path)}
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve scraped rows back as local category pages.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--page-size", type=int, default=None, help="Split categories into pages of this many cards.")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(port=args.port, page_size=args.page_size)
+    print(f"✅ Serving fixture pages at {base_url}")
+    for cat, url in fixture_categories(base_url).items():
+        print(f"    - {cat}: {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
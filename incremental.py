@@ -0,0 +1,115 @@
+import os
+import json
+import argparse
+import pandas as pd
+
+from storage import remove_versions
+
+RAW_FILE = "banggood_5_categories.csv"
+STATE_FILE = "product_state.json"
+PENDING_STATE_FILE = "product_state.pending.json"  # State of the last scrape, until its changes are loaded
+CHANGES_FILE = "banggood_changed_products.csv"
+TRANSFORMED_CHANGES_FILE = "banggood_transformed_changes.csv"
+
+# Product URLs end in '-p-<id>.html', e.g. ...-Insulated-Cup-p-1975323.html?rmmds=...
+PRODUCT_ID_PATTERN = r'-p-(\d+)\.html'
+# A product counts as changed when any of these differ from the last run
+TRACKED_COLUMNS = ['Price', 'Rating', 'Reviews']
+# How a missing link looks in the raw scrape and after cleaning
+MISSING_URLS = ['', 'N/A', 'NO_URL_FOUND']
+
+# --- 1. Product Keys & Content Hashes ---
+def extract_product_ids(urls):
+    """Returns the Banggood product ID of each URL as a string (NaN when the URL has none)."""
+    return pd.Series(urls).astype(str).str.extract(PRODUCT_ID_PATTERN, expand=False)
+
+def product_keys(df):
+    """Stable key per row, the same in the state store and in the loaded table (ProductKey).
+
+    The product ID where the URL has one; otherwise 'u' plus a hash of the
+    URL, or of the name for rows scraped without a link. The raw scrape and
+    the cleaned data give the same key, and it fits the 20-character column.
+    """
+    urls = df['URL']
+    has_url = urls.notna() & ~urls.astype(str).isin(MISSING_URLS)
+    fallback = urls.astype(str).where(has_url, 'name:' + df['Name'].astype(str))
+    hashes = pd.util.hash_pandas_object(fallback, index=False).map('u{:016x}'.format)
+    return extract_product_ids(urls).fillna(hashes)
+
+def content_hashes(df):
+    """Hash of the tracked columns per row, as hex strings that fit in JSON."""
+    hashes = pd.util.hash_pandas_object(df[TRACKED_COLUMNS].astype(str), index=False)
+    return hashes.map('{:016x}'.format)
+
+# --- 2. State Store ---
+def load_state(file_path=STATE_FILE):
+    """Loads the {product key: content hash} map from the previous run."""
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state, file_path=STATE_FILE):
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, file_path)
+
+# --- 3. Change Detection ---
+def select_changed(df, state):
+    """Splits a fresh scrape into new/changed rows.
+
+    Returns (changed_df, new_state, counts) where counts has 'new', 'changed'
+    and 'unchanged'. `state` is not modified.
+    """
+    keys = product_keys(df)
+    hashes = content_hashes(df)
+    previous = keys.map(state)
+
+    is_new = previous.isna()
+    is_changed = ~is_new & (previous != hashes)
+
+    new_state = dict(state)
+    new_state.update(zip(keys, hashes))
+
+    counts = {
+        'new': int(is_new.sum()),
+        'changed': int(is_changed.sum()),
+        'unchanged': int((~is_new & ~is_changed).sum()),
+    }
+    return df[is_new | is_changed], new_state, counts
+
+def write_changes(df, state_file=STATE_FILE, changes_file=CHANGES_FILE, pending_file=PENDING_STATE_FILE):
+    """Writes the new/changed rows of a scrape to `changes_file`.
+
+    Rows are compared with the state of the last *loaded* scrape, so a
+    scrape whose changes never reached the database is picked up again by
+    the next one. The new state waits in `pending_file` until
+    load_to_sql.py loads the changes and calls commit_state().
+    """
+    changed_df, new_state, counts = select_changed(df, load_state(state_file))
+    changed_df.to_csv(changes_file, index=False)
+    save_state(new_state, pending_file)
+    # Transformed changes of an earlier scrape are superseded (changes_file includes them)
+    remove_versions(TRANSFORMED_CHANGES_FILE)
+
+    print("\n--- Incremental Changes ---")
+    print(f"New: {counts['new']} | Changed: {counts['changed']} | Unchanged: {counts['unchanged']}")
+    print(f"✅ {len(changed_df)} rows saved to '{changes_file}'")
+    return changed_df
+
+def commit_state(state_file=STATE_FILE, pending_file=PENDING_STATE_FILE):
+    """Makes the last scrape's state current, once its changes are committed to the database."""
+    if os.path.exists(pending_file):
+        os.replace(pending_file, state_file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract new/changed products from a full scrape.")
+    parser.add_argument("--input", default=RAW_FILE, help="Full scrape CSV (scraper or crawler output).")
+    args = parser.parse_args()
+
+    try:
+        # Read as text, exactly as the scraper produced it, so hashes match across runs
+        write_changes(pd.read_csv(args.input, dtype=str, keep_default_na=False))
+    except FileNotFoundError:
+        print(f"❌ Error: File not found at {args.input}. Ensure the scraping script ran.")
@@ -0,0 +1,198 @@
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+import pandas as pd
+
+EVENT_LOG_FILE = "pipeline_events.jsonl"  # One JSON object per line: spans and messages
+TEXT_LOG_FILE = "code_log.txt"            # Human-readable progress log (as before)
+FLUSH_INTERVAL = 0.5                      # Seconds the writer waits before flushing a partial batch
+TIMESTAMP_FORMAT = '%Y-%m-%d-%H:%M:%S'
+
+# --- 1. Buffered Asynchronous Writer ---
+class AsyncLogWriter:
+    """Appends log lines from a background thread, so callers never wait on file I/O.
+
+    Lines are queued and written in batches, each log file opened once per
+    batch instead of once per message. Write errors are counted and
+    reported once on stderr rather than raised into the pipeline.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self.failed_writes = 0
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, file_path, line):
+        if not self._closed:
+            self._queue.put((file_path, line))
+
+    def _run(self):
+        stop = False
+        while not stop:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while True:  # Take everything queued meanwhile as one batch
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch, waiters = {}, []
+            for item in items:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.setdefault(item[0], []).append(item[1])
+            self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, batch):
+        for file_path, lines in batch.items():
+            try:
+                with open(file_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(lines))
+            except OSError as e:
+                if self.failed_writes == 0:
+                    print(f"⚠️ Could not write to '{file_path}': {e}", file=sys.stderr)
+                self.failed_writes += len(lines)
+
+    def flush(self):
+        """Blocks until every line queued so far is written."""
+        if not self._closed:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+
+    def close(self):
+        """Flushes everything queued so far and stops the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+_writer = AsyncLogWriter()
+atexit.register(_writer.close)
+
+def log_event(event, **fields):
+    """Queues one structured event for the JSON-lines log."""
+    record = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'event': event, 'thread': threading.current_thread().name, **fields}
+    _writer.write(EVENT_LOG_FILE, json.dumps(record, default=str) + '\n')
+
+_print_lock = threading.Lock()
+
+def log_message(message):
+    """Prints a progress message and queues it for the text and JSON logs."""
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    with _print_lock:  # Workers log from several threads, so keep each line whole
+        print(f"{timestamp} : {message}")
+    _writer.write(TEXT_LOG_FILE, f"{timestamp} : {message}\n")
+    log_event('message', message=message)
+
+# --- 2. Timing Spans ---
+_stats_lock = threading.Lock()
+_stage_stats = {}     # Stage -> {'calls', 'seconds', 'rows', 'errors', 'max_seconds'}
+_run_start = time.perf_counter()
+
+class Span:
+    """One timed stage execution. Set `rows` (and any extra fields) before it ends."""
+
+    def __init__(self, stage, rows=None, **fields):
+        self.stage = stage
+        self.rows = rows
+        self.fields = fields
+        self.seconds = None
+
+def _record(span, status):
+    with _stats_lock:
+        stats = _stage_stats.setdefault(span.stage, {'calls': 0, 'seconds': 0.0, 'rows': 0, 'errors': 0, 'max_seconds': 0.0})
+        stats['calls'] += 1
+        stats['seconds'] += span.seconds
+        stats['rows'] += span.rows or 0
+        stats['errors'] += status == 'error'
+        stats['max_seconds'] = max(stats['max_seconds'], span.seconds)
+
+def _finish(current, status):
+    _record(current, status)
+    throughput = current.rows / current.seconds if current.rows and current.seconds > 0 else None
+    log_event('span', stage=current.stage, seconds=round(current.seconds, 6), rows=current.rows,
+              rows_per_sec=throughput, status=status, **current.fields)
+
+@contextmanager
+def span(stage, rows=None, **fields):
+    """Times the block as one execution of `stage` and logs it as a 'span' event.
+
+    Usage:
+        with span('parse', category=name) as s:
+            df = parse_cards(...)
+            s.rows = len(df)
+    """
+    current = Span(stage, rows, **fields)
+    start = time.perf_counter()
+    status = 'ok'
+    try:
+        yield current
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        current.seconds = time.perf_counter() - start
+        _finish(current, status)
+
+def record_span(stage, seconds, rows=None, status='ok', **fields):
+    """Records a stage timed elsewhere, e.g. in a worker process that returned its duration."""
+    current = Span(stage, rows, **fields)
+    current.seconds = seconds
+    _finish(current, status)
+
+# --- 3. End-of-Run Summary ---
+def stage_summary():
+    """Per-stage totals since the process started (or since reset_stats())."""
+    wall = time.perf_counter() - _run_start
+    with _stats_lock:
+        rows = {stage: dict(stats) for stage, stats in _stage_stats.items()}
+    if not rows:
+        return pd.DataFrame(columns=['calls', 'seconds', 'mean_ms', 'max_ms', 'rows', 'rows_per_sec', 'errors', 'share_of_wall'])
+    summary = pd.DataFrame.from_dict(rows, orient='index')
+    summary['mean_ms'] = summary['seconds'] / summary['calls'] * 1000
+    summary['max_ms'] = summary.pop('max_seconds') * 1000
+    summary['rows_per_sec'] = (summary['rows'] / summary['seconds']).where(summary['rows'] > 0)
+    # Stages overlap when they run on threads, so shares can add up to more than 100%
+    summary['share_of_wall'] = summary['seconds'] / wall
+    summary = summary[['calls', 'seconds', 'mean_ms', 'max_ms', 'rows', 'rows_per_sec', 'errors', 'share_of_wall']]
+    return summary.sort_values(by='seconds', ascending=False).rename_axis('stage')
+
+def print_summary(title="PIPELINE TIMING"):
+    """Prints the stage summary and logs it as a 'summary' event."""
+    summary = stage_summary()
+    wall = time.perf_counter() - _run_start
+    log_event('summary', wall_seconds=round(wall, 3), stages=json.loads(summary.reset_index().to_json(orient='records')))
+    print(f"\n--- {title} (wall clock {wall:.2f}s) ---")
+    if summary.empty:
+        print("No stages recorded.")
+    else:
+        formatted = summary.copy()
+        formatted['share_of_wall'] = formatted['share_of_wall'].map('{:.1%}'.format)
+        print(formatted.round(3).to_string())
+    return summary
+
+def reset_stats():
+    global _run_start
+    with _stats_lock:
+        _stage_stats.clear()
+    _run_start = time.perf_counter()
+
+def flush():
+    """Blocks until every queued line is written."""
+    _writer.flush()
\ No newline at end of file
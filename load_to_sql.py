@@ -1,78 +1,73 @@
 import pandas as pd
 import numpy as np
-import pyodbc
-from time import sleep
-
-# --- 1. Configuration (UPDATED with your server details) ---
-SQL_CONFIG = {
-    'DRIVER': '{ODBC Driver 17 for SQL Server}',
-    # CRITICAL FIX: Your identified Server Name
-    'SERVER': 'INTELPROGRAMER', 
-    
-    # Your identified Database Name
-    'DATABASE': 'Banggood_Final', 
-    
-    # Final Connection String using Windows Authentication
-    'CONNECTION_STRING': 'DRIVER={ODBC Driver 17 for SQL Server};SERVER=INTELPROGRAMER;DATABASE=Banggood_Final;Trusted_Connection=yes;'
-}
+from itertools import islice
+from time import sleep, perf_counter
+import argparse
 
+from incremental import TRANSFORMED_CHANGES_FILE, commit_state, product_keys
+from storage import latest_version, read_dataset
+from compact_frame import expand_frame, is_compact
+from db_backends import BACKENDS, DB_ERRORS, ConnectionPool, get_backend, load_db_config
+from instrumentation import print_summary, span
+
+# --- 1. Configuration ---
+# Connection settings come from db_config.ini / BANGGOOD_DB_* environment
+# variables (see db_backends.py); SQL Server on INTELPROGRAMER stays the default.
 DATA_FILE = "banggood_transformed_data.csv"
+CHANGES_FILE = TRANSFORMED_CHANGES_FILE  # Incremental mode input
 TABLE_NAME = "BanggoodProducts"
 
+# Column names must match the DataFrame and the SQL table structure exactly
+LOAD_COLUMNS = ['ProductKey', 'Category', 'Name', 'Price', 'Rating', 'Reviews', 'URL', 'Price_Segment', 'Name_Length', 'Price_Per_Char']
+BATCH_SIZE = 10_000  # Rows per executemany call and commit in bulk mode
+
 # --- 2. Database Connection ---
-def get_connection():
-    """Establishes and returns a pyodbc connection object."""
-    # The SERVER and DATABASE are now hardcoded in the CONNECTION_STRING above, 
-    # so we use that directly.
-    conn_str = SQL_CONFIG['CONNECTION_STRING']
-    try:
-        conn = pyodbc.connect(conn_str)
-        print("✅ Successfully connected to SQL Server.")
-        return conn
-    except pyodbc.Error as ex:
-        # We check the first part of the error message for better diagnosis
-        sqlstate = ex.args[0]
-        print(f"❌ Connection Error: {sqlstate}")
-        print("Please verify the SQL Server service is running and the name 'INTELPROGRAMER' is correct.")
-        return None
+# main() takes its connection from db_backends.ConnectionPool, so other stages can share it
 
 # --- 3. Database Schema (Table Creation) ---
-def create_table_schema(cursor):
-    """Creates the unified table schema, matching the DataFrame columns and types."""
-    
-    create_table_sql = f"""
-    -- Drop the table if it exists to allow fresh runs
-    IF OBJECT_ID('{TABLE_NAME}', 'U') IS NOT NULL 
-        DROP TABLE {TABLE_NAME};
-        
-    CREATE TABLE {TABLE_NAME} (
-        ProductID INT PRIMARY KEY IDENTITY(1,1),
-        Category NVARCHAR(50),
-        Name NVARCHAR(500) NOT NULL,
-        Price DECIMAL(10, 2),
-        Rating DECIMAL(3, 2),
-        Reviews INT,
-        URL NVARCHAR(1000),
-        Price_Segment NVARCHAR(50),
-        Name_Length INT,
-        Price_Per_Char DECIMAL(10, 4)
-    );
+def create_table_schema(cursor, drop_existing=True, backend=None):
+    """Creates the unified table schema, matching the DataFrame columns and types.
+
+    With drop_existing=False an existing table (and its rows) is kept, which
+    incremental and merge loads rely on.
     """
+    backend = backend or get_backend()
     try:
-        cursor.execute(create_table_sql)
+        for statement in backend.create_table_statements(TABLE_NAME, drop_existing):
+            cursor.execute(statement)
         cursor.connection.commit()
-        print(f"✅ Table '{TABLE_NAME}' created successfully in {SQL_CONFIG['DATABASE']}.")
-    except pyodbc.Error as ex:
+        print(f"✅ Table '{TABLE_NAME}' ready in {backend.describe()}.")
+    except DB_ERRORS as ex:
         print(f"❌ Error creating table: {ex}")
 
-# --- 4. Data Insertion ---
+# --- 4. Incremental Replace ---
+def delete_products(cursor, df):
+    """Deletes the stored rows of the products in `df`, so their new versions can be inserted.
+
+    Not committed here: the insert that follows commits the delete and the
+    insert together. Returns the number of products, or None on error
+    (rolled back).
+    """
+    product_ids = df['ProductKey'].dropna().unique()
+    if len(product_ids) == 0:
+        return 0
+
+    delete_sql = f"DELETE FROM {TABLE_NAME} WHERE ProductKey = ?"
+    try:
+        cursor.executemany(delete_sql, [(pid,) for pid in product_ids])
+        print(f"🔄 Removed previous rows for {len(product_ids)} changed products.")
+        return len(product_ids)
+    except DB_ERRORS as ex:
+        print(f"❌ Error removing changed products: {ex}")
+        cursor.connection.rollback()
+        return None
+
+# --- 5. Data Insertion ---
 def insert_data(cursor, df):
     """Inserts DataFrame rows into the SQL table using executemany."""
     
-    # Column names must match the DataFrame and the SQL table structure exactly
-    cols = ['Category', 'Name', 'Price', 'Rating', 'Reviews', 'URL', 'Price_Segment', 'Name_Length', 'Price_Per_Char']
-    placeholders = ', '.join(['?'] * len(cols))
-    insert_sql = f"INSERT INTO {TABLE_NAME} ({', '.join(cols)}) VALUES ({placeholders})"
+    cols = LOAD_COLUMNS
+    insert_sql = insert_statement(cols)
 
     # Prepare data: pyodbc requires None for SQL NULLs, so we convert NumPy NaNs
     data_to_insert = df[cols].replace({np.nan: None}).values.tolist()
@@ -85,12 +80,134 @@ def insert_data(cursor, df):
         cursor.connection.commit()
         print(f"✅ Data successfully inserted into {TABLE_NAME}.")
         return True
-    except pyodbc.Error as ex:
+    except DB_ERRORS as ex:
         print(f"❌ Error during data insertion: {ex}")
         cursor.connection.rollback()
         return False
 
-# --- 5. Validation ---
+def insert_statement(cols=LOAD_COLUMNS, table_name=TABLE_NAME):
+    placeholders = ', '.join(['?'] * len(cols))
+    return f"INSERT INTO {table_name} ({', '.join(cols)}) VALUES ({placeholders})"
+
+def iter_rows(df, cols=LOAD_COLUMNS):
+    """Yields one tuple per row, with NaN turned into None, without building the full list."""
+    for row in df[cols].itertuples(index=False, name=None):
+        yield tuple(None if value != value else value for value in row)  # NaN is the only value != itself
+
+def insert_data_bulk(cursor, df, batch_size=BATCH_SIZE, fast_executemany=True, table_name=TABLE_NAME, backend=None,
+                     commit_every_batch=True):
+    """Inserts DataFrame rows in batches, committing after each batch.
+
+    Rows are generated lazily, so only one batch is in memory at a time. With
+    pyodbc, fast_executemany sends each batch as one parameter array instead
+    of a round trip per row. Works with any DB-API cursor that uses '?'
+    placeholders (e.g. sqlite3). Backends that can insert a DataFrame
+    directly (DuckDB) get each batch as a frame slice instead. With
+    commit_every_batch=False everything (and any uncommitted statement
+    before it on the connection) is committed once at the end, or rolled
+    back as a whole.
+    """
+    if fast_executemany and hasattr(cursor, 'fast_executemany'):
+        cursor.fast_executemany = True
+
+    if backend is not None and backend.supports_frame_insert:
+        frame = df[LOAD_COLUMNS]
+        batches = (frame.iloc[i:i + batch_size] for i in range(0, len(frame), batch_size))
+        send = lambda batch: backend.insert_frame(cursor, batch, table_name)
+    else:
+        insert_sql = insert_statement(table_name=table_name)
+        rows = iter_rows(df)
+        batches = iter(lambda: list(islice(rows, batch_size)), [])
+        send = lambda batch: cursor.executemany(insert_sql, batch)
+    total = len(df)
+    inserted = 0
+
+    print(f"⏳ Starting bulk insertion of {total} rows in batches of {batch_size}...")
+    start = perf_counter()
+    try:
+        for batch in batches:
+            send(batch)
+            if commit_every_batch:
+                cursor.connection.commit()
+            inserted += len(batch)
+            elapsed = perf_counter() - start
+            print(f"    - {'Committed' if commit_every_batch else 'Sent'} {inserted:,}/{total:,} rows ({inserted / elapsed:,.0f} rows/sec)")
+        if not commit_every_batch:
+            cursor.connection.commit()
+    except DB_ERRORS as ex:
+        committed = inserted if commit_every_batch else 0
+        print(f"❌ Error during bulk insertion after {committed:,} committed rows: {ex}")
+        cursor.connection.rollback()
+        return False
+
+    elapsed = perf_counter() - start
+    rate = inserted / elapsed if elapsed > 0 else float('inf')
+    print(f"✅ {inserted:,} rows inserted into {table_name} in {elapsed:.2f}s ({rate:,.0f} rows/sec).")
+    return True
+
+# --- 6. Merge (Upsert) Load ---
+def add_product_keys(df):
+    """Adds the natural key column: the product ID from the URL ('-p-<id>.html'), or incremental.product_keys()'s hash."""
+    df['ProductKey'] = product_keys(df)
+    return df
+
+def merge_data(cursor, df, backend=None, batch_size=BATCH_SIZE, keep=()):
+    """Upserts DataFrame rows by ProductKey instead of dropping and reinserting the table.
+
+    Rows are bulk-loaded into a temp stage table (with the target's column
+    types, so values compare after the same rounding), then applied with the
+    backend's set-based MERGE (UPDATE ... FROM + INSERT on SQLite/DuckDB) and
+    one commit. Unchanged rows are not written and existing ProductIDs are
+    kept; readers see the old table until the commit. Columns in `keep` are
+    written for new products only and do not make a row count as updated.
+    Returns the counts per outcome, or None on error.
+    """
+    backend = backend or get_backend()
+    stage = backend.stage_table(TABLE_NAME)
+    # A product scraped twice (e.g. in two categories) is staged once; the last row wins
+    staged = df.drop_duplicates(subset='ProductKey', keep='last')
+    # Product IDs are digits; rows without one are keyed by the 'u' + hash fallback
+    counts = {'duplicates': len(df) - len(staged), 'hashed': int(staged['ProductKey'].str.startswith('u').sum())}
+
+    # Stage table with the target's column types
+    cursor.execute(backend.create_stage_statement(stage, TABLE_NAME, LOAD_COLUMNS))
+    try:
+        if not insert_data_bulk(cursor, staged, batch_size, table_name=stage, backend=backend):
+            return None
+
+        changed = ' OR '.join(backend.differs(f"t.{c}", f"s.{c}") for c in LOAD_COLUMNS if c != 'ProductKey' and c not in keep)
+        cursor.execute(f"""SELECT COUNT(*) FROM {stage} AS s WHERE NOT EXISTS
+                           (SELECT 1 FROM {TABLE_NAME} AS t WHERE t.ProductKey = s.ProductKey)""")
+        counts['inserted'] = cursor.fetchone()[0]
+        cursor.execute(f"""SELECT COUNT(*) FROM {stage} AS s WHERE EXISTS
+                           (SELECT 1 FROM {TABLE_NAME} AS t WHERE t.ProductKey = s.ProductKey AND ({changed}))""")
+        counts['updated'] = cursor.fetchone()[0]
+        counts['unchanged'] = len(staged) - counts['inserted'] - counts['updated']
+
+        for statement in backend.merge_statements(TABLE_NAME, stage, 'ProductKey', LOAD_COLUMNS, keep=keep):
+            cursor.execute(statement)
+        cursor.connection.commit()
+        return counts
+    except DB_ERRORS as ex:
+        print(f"❌ Error during merge: {ex}")
+        cursor.connection.rollback()
+        return None
+    finally:
+        cursor.execute(f"DROP TABLE {stage}")
+        cursor.connection.commit()
+
+def report_merge(counts):
+    """Prints the merge outcome in place of the bare row-count check."""
+    print("\n--- Merge Summary ---")
+    print(f"Inserted:  {counts['inserted']}")
+    print(f"Updated:   {counts['updated']}")
+    print(f"Unchanged: {counts['unchanged']}")
+    if counts['duplicates']:
+        print(f"Duplicate product rows collapsed: {counts['duplicates']}")
+    if counts['hashed']:
+        print(f"ℹ️ Keyed by URL/name hash (no product ID in URL): {counts['hashed']}")
+
+# --- 7. Validation ---
 def validate_insertion(cursor, expected_count):
     """Queries the database to confirm the number of inserted rows."""
     
@@ -100,7 +217,7 @@ def validate_insertion(cursor, expected_count):
     
     print("\n--- Validation ---")
     print(f"Expected rows (from CSV): {expected_count}")
-    print(f"Actual rows (in SQL Server): {actual_count}")
+    print(f"Actual rows (in database): {actual_count}")
     
     if actual_count == expected_count:
         print("✅ Validation successful: Row counts match.")
@@ -110,42 +227,107 @@ def validate_insertion(cursor, expected_count):
     return actual_count
 
 # --- Main Execution ---
-def main():
+# A compact Parquet/Arrow copy (Data_Cleaning_Transformation.py --compact) stores
+# only the product ID of each URL: expand_frame() rebuilds a canonical link
+# ('https://www.banggood.com/-p-<id>.html') without the name slug and the query
+# string. It opens the same product and gives the same ProductKey, but is not the
+# scraped URL, so a merge from such a copy leaves the URL of existing rows as it
+# is (and does not count it as a change); full and incremental loads store it.
+def main(incremental=False, bulk=False, batch_size=BATCH_SIZE, merge=False, backend=None):
+    """Runs one load. Returns True when the data was loaded (or there was nothing to load)."""
+    data_file = CHANGES_FILE if incremental else DATA_FILE
+    backend = backend or get_backend()
+
     # Load the cleaned data
     try:
-        df = pd.read_csv(DATA_FILE)
+        df = read_dataset(latest_version(data_file))
+        compact = is_compact(df)
+        if compact:
+            df = expand_frame(df)  # Compact Parquet/Arrow copy: URL rebuilt from Product_ID (see above)
+        # Categorical (from Parquet/Arrow) -> plain strings for the driver
+        df['Price_Segment'] = df['Price_Segment'].astype(object)
+        # The DECIMAL(10, 4) scale of SQL Server/DuckDB; SQLite's REAL would keep the last-digit
+        # differences between CSV and Parquet copies, and a merge would count them as updates
+        df['Price_Per_Char'] = df['Price_Per_Char'].round(4)
         # Drop rows where 'Category' or 'Name' is null just in case
         df.dropna(subset=['Category', 'Name'], inplace=True)
+        add_product_keys(df)
         expected_rows = len(df)
         print(f"Loaded {expected_rows} rows from CSV for insertion.")
     except FileNotFoundError:
-        print(f"❌ Data file '{DATA_FILE}' not found. Cannot proceed.")
-        return
+        if incremental:
+            print(f"ℹ️ No '{data_file}' found: nothing changed since the last load.")
+        else:
+            print(f"❌ Data file '{DATA_FILE}' not found. Cannot proceed.")
+        return incremental
 
-    # 1. Connect to SQL Server
-    conn = get_connection()
-    if conn is None:
-        return
+    # 1. Connect to the database
+    pool = ConnectionPool(backend)
+    try:
+        conn = pool.acquire()
+    except (ImportError,) + DB_ERRORS as ex:
+        print(f"❌ Connection Error: {ex.args[0] if ex.args else ex}")
+        print(f"Please verify the {backend.label} settings in db_config.ini or the BANGGOOD_DB_* variables.")
+        return False
+    print(f"✅ Successfully connected to {backend.describe()}.")
 
     try:
         cursor = conn.cursor()
+        # Incremental loads commit once, so the delete never lands without all of its inserts
+        load = (lambda cursor, df: insert_data_bulk(cursor, df, batch_size, backend=backend, commit_every_batch=not incremental)) if bulk else insert_data
         
-        # 2. Create Schema
-        create_table_schema(cursor)
+        # 2. Create Schema (incremental and merge runs keep the existing rows)
+        create_table_schema(cursor, drop_existing=not (incremental or merge), backend=backend)
         
-        # 3. Insert Data
-        if insert_data(cursor, df):
-            # 4. Validate Inserts
-            validate_insertion(cursor, expected_rows)
+        mode = 'merge' if merge else 'incremental' if incremental else 'bulk' if bulk else 'executemany'
+        with span('load', rows=expected_rows, mode=mode, backend=backend.name):
+            if merge:
+                # 3. Upsert by product ID; only new/changed rows are written
+                counts = merge_data(cursor, df, backend=backend, batch_size=batch_size, keep=['URL'] if compact else ())
+                ok = counts is not None
+                if ok:
+                    report_merge(counts)
+                    if incremental:
+                        commit_state()  # As below: the merged changes are the next scrape's baseline
+            elif incremental:
+                # 3. Replace only the changed products
+                ok = delete_products(cursor, df) is not None and load(cursor, df)
+                if ok:
+                    # The changes are in the table: the next scrape compares against this one
+                    commit_state()
+                    cursor.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}")
+                    print(f"✅ {expected_rows} new/changed rows loaded. Table now holds {cursor.fetchone()[0]} rows.")
+            # 3. Insert Data
+            else:
+                ok = load(cursor, df)
+                if ok:
+                    # 4. Validate Inserts
+                    ok = validate_insertion(cursor, expected_rows) == expected_rows
             
     finally:
         # Ensure the connection is closed
-        if conn:
-            conn.close()
-            print("🔌 Connection closed.")
+        pool.release(conn)
+        pool.close()
+        print("🔌 Connection closed.")
+    return ok
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the transformed Banggood data into the configured database.")
+    parser.add_argument("--incremental", action="store_true", help="Load only new/changed products and keep the rest of the table.")
+    parser.add_argument("--bulk", action="store_true", help="Stream rows in committed batches with fast_executemany.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per batch in --bulk and --merge modes.")
+    parser.add_argument("--merge", action="store_true", help="Upsert by product ID via a staged MERGE instead of DROP TABLE + reinsert.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), help="Override the configured database backend.")
+    parser.add_argument("--db-path", help="Database file for the sqlite/duckdb backends.")
+    args = parser.parse_args()
+
+    config = load_db_config()
+    if args.backend:
+        config['backend'] = args.backend
+    if args.db_path:
+        config['path'] = args.db_path
+
     print("\n\n*** STARTING SQL DATA LOADING PIPELINE ***")
     sleep(1) 
-    main()
-    
\ No newline at end of file
+    main(incremental=args.incremental, bulk=args.bulk, batch_size=args.batch_size, merge=args.merge, backend=get_backend(config))
+    print_summary("LOAD TIMING")
\ No newline at end of file
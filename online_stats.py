@@ -0,0 +1,328 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from storage import latest_version
+
+DATA_FILE = "banggood_transformed_data.csv"
+CHUNK_SIZE = 100_000
+STAT_COLUMNS = ['Price', 'Rating', 'Reviews', 'Name_Length']
+GROUP_COLUMNS = ['Category', 'Price_Segment']
+CORRELATION_PAIRS = [('Rating', 'Price')]
+SKETCH_K = 200  # KLL accuracy: rank error is roughly 1.7 / k
+
+# --- 1. Moments (Welford / Chan) ---
+class RunningMoments:
+    """Count, mean, variance, min and max of a stream, updated batch by batch.
+
+    Batches are combined with Chan's parallel form of Welford's update, so
+    two RunningMoments built on different chunks merge exactly.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _combine(self, count, mean, m2, min_value, max_value):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, min_value)
+        self.max = max(self.max, max_value)
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self._combine(len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1, like pandas)."""
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+# --- 2. Streaming Covariance ---
+class RunningCovariance:
+    """Co-moment of two columns over the rows where both are present; yields the Pearson correlation."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cxy = 0.0  # Sum of (x - mean_x) * (y - mean_y)
+        self.m2x = 0.0
+        self.m2y = 0.0
+
+    def _combine(self, count, mean_x, mean_y, cxy, m2x, m2y):
+        if count == 0:
+            return
+        total = self.count + count
+        dx, dy = mean_x - self.mean_x, mean_y - self.mean_y
+        weight = self.count * count / total
+        self.cxy += cxy + dx * dy * weight
+        self.m2x += m2x + dx * dx * weight
+        self.m2y += m2y + dy * dy * weight
+        self.mean_x += dx * count / total
+        self.mean_y += dy * count / total
+        self.count = total
+
+    def update(self, x, y):
+        x, y = np.asarray(x, dtype='float64'), np.asarray(y, dtype='float64')
+        both = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[both], y[both]
+        if len(x):
+            dx, dy = x - x.mean(), y - y.mean()
+            self._combine(len(x), x.mean(), y.mean(), (dx * dy).sum(), (dx * dx).sum(), (dy * dy).sum())
+
+    def merge(self, other):
+        self._combine(other.count, other.mean_x, other.mean_y, other.cxy, other.m2x, other.m2y)
+        return self
+
+    @property
+    def covariance(self):
+        return self.cxy / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def correlation(self):
+        denominator = np.sqrt(self.m2x * self.m2y)
+        return self.cxy / denominator if self.count > 1 and denominator > 0 else np.nan
+
+# --- 3. Quantile Sketch (KLL) ---
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang & Liberty) in a few KB regardless of stream length.
+
+    Level h holds items that each stand for 2**h inputs. A full level is
+    sorted and every other item (random offset) is promoted to the next
+    level; lower levels get smaller capacities, so memory is O(k).
+    """
+
+    def __init__(self, k=SKETCH_K, seed=0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays at this level, so total weight is preserved exactly
+                leftover, items = (items[-1:], items[:-1]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = leftover
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge KLL sketches with k={self.k} and k={other.k}")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Approximate q-quantile(s) (NaN for an empty sketch)."""
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(q, dtype='float64') * cumulative[-1]
+        return items[np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(items) - 1)]
+
+# --- 4. Grouped Summaries ---
+class ColumnSummary:
+    """Moments plus quantile sketch of one column."""
+
+    def __init__(self, k=SKETCH_K):
+        self.moments = RunningMoments()
+        self.sketch = KLLSketch(k)
+
+    def update(self, values):
+        self.moments.update(values)
+        self.sketch.update(values)
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+class OnlineSummary:
+    """One-pass summaries of a chunked dataset, overall and per value of each group column.
+
+    Feed chunks with update(); summaries of disjoint chunks (e.g. from
+    parallel workers) combine with merge(). Nothing but the sketches is
+    kept, so memory does not grow with the number of rows.
+    """
+
+    def __init__(self, columns=STAT_COLUMNS, group_columns=GROUP_COLUMNS, pairs=CORRELATION_PAIRS, k=SKETCH_K):
+        self.columns = list(columns)
+        self.group_columns = list(group_columns)
+        self.pairs = [tuple(pair) for pair in pairs]
+        self.k = k
+        self.rows = 0
+        # (group column, group value) -> stats; (None, None) is the whole dataset
+        self._columns = {}
+        self._pairs = {}
+
+    def _column(self, key, column):
+        return self._columns.setdefault((key, column), ColumnSummary(self.k))
+
+    def _pair(self, key, pair):
+        return self._pairs.setdefault((key, pair), RunningCovariance())
+
+    def _update_group(self, key, frame):
+        for column in self.columns:
+            if column in frame:
+                self._column(key, column).update(frame[column].to_numpy(dtype='float64', na_value=np.nan))
+        for x, y in self.pairs:
+            if x in frame and y in frame:
+                self._pair(key, (x, y)).update(frame[x].to_numpy(dtype='float64', na_value=np.nan), frame[y].to_numpy(dtype='float64', na_value=np.nan))
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        self._update_group((None, None), chunk)
+        for group_column in self.group_columns:
+            if group_column in chunk:
+                for value, frame in chunk.groupby(group_column, observed=True, sort=False):
+                    self._update_group((group_column, value), frame)
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for (key, column), stats in other._columns.items():
+            self._column(key, column).merge(stats)
+        for (key, pair), stats in other._pairs.items():
+            self._pair(key, pair).merge(stats)
+        return self
+
+    def _groups(self, by):
+        return sorted({key for key, _ in self._columns if key[0] == by}, key=lambda key: str(key[1]))
+
+    def describe(self, column='Price', by='Category'):
+        """count/mean/median/std/min/max of `column` per value of `by` (by=None: one overall row).
+
+        Everything is exact except the median, which comes from the sketch.
+        """
+        keys = self._groups(by) if by is not None else [(None, None)]
+        rows = {}
+        for key in keys:
+            stats = self._columns.get((key, column))
+            if stats is None:
+                continue
+            m = stats.moments
+            rows[key[1] if by is not None else 'All'] = {
+                'count': m.count, 'mean': m.mean if m.count else np.nan, 'median': stats.sketch.quantile(0.5),
+                'std': m.std, 'min': m.min if m.count else np.nan, 'max': m.max if m.count else np.nan,
+            }
+        return pd.DataFrame.from_dict(rows, orient='index').rename_axis(by)
+
+    def quantile(self, column, q, by=None, value=None):
+        """Approximate quantile(s) of `column`, overall or within one group (by=<column>, value=<group value>)."""
+        stats = self._columns.get(((by, value), column))
+        return stats.sketch.quantile(q) if stats is not None else np.nan
+
+    def correlation(self, pair=None, by=None):
+        """Pearson correlation of `pair` (default: the first configured pair), overall or per value of `by`."""
+        pair = tuple(pair or self.pairs[0])
+        if by is None:
+            return self._pairs[((None, None), pair)].correlation if ((None, None), pair) in self._pairs else np.nan
+        keys = sorted((key for key, p in self._pairs if key[0] == by and p == pair), key=lambda key: str(key[1]))
+        return pd.Series({key[1]: self._pairs[(key, pair)].correlation for key in keys}, name=f"{pair[0]} vs {pair[1]}").rename_axis(by)
+
+# --- 5. One Pass over Files ---
+def iter_chunks(file_path, chunksize=CHUNK_SIZE, columns=None):
+    """Yields the dataset chunk by chunk: CSV via read_csv(chunksize), Parquet by record batch."""
+    if file_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif file_path.endswith('.arrow'):
+        import pyarrow as pa
+        with pa.memory_map(file_path) as source:
+            table = pa.ipc.open_file(source).read_all()
+            for batch in table.select(columns).to_batches(chunksize) if columns else table.to_batches(chunksize):
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file_path, chunksize=chunksize, usecols=columns)
+
+def _summarize_chunk(chunk):
+    return OnlineSummary().update(chunk)
+
+def summarize_file(file_path=DATA_FILE, chunksize=CHUNK_SIZE, workers=1):
+    """Builds an OnlineSummary in one pass over `file_path` (its newest CSV/Parquet/Arrow copy).
+
+    With workers > 1, chunks are summarized in a process pool and the partial
+    summaries merged; at most a few chunks are in flight at a time.
+    """
+    file_path = latest_version(file_path)
+    columns = STAT_COLUMNS + GROUP_COLUMNS
+    summary = OnlineSummary()
+    if workers <= 1:
+        for chunk in iter_chunks(file_path, chunksize, columns):
+            summary.update(chunk)
+        return summary
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk in iter_chunks(file_path, chunksize, columns):
+            pending.append(executor.submit(_summarize_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                summary.merge(pending.pop(0).result())
+        for future in pending:
+            summary.merge(future.result())
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="One-pass price/rating summaries without loading the whole dataset.")
+    parser.add_argument("--input", default=DATA_FILE, help="Transformed dataset (its newest CSV/Parquet/Arrow copy is used).")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="Rows per chunk.")
+    parser.add_argument("--workers", type=int, default=1, help="Processes summarizing chunks in parallel (pays off only when per-chunk work outweighs shipping chunks).")
+    args = parser.parse_args()
+
+    try:
+        summary = summarize_file(args.input, args.chunksize, args.workers)
+    except FileNotFoundError:
+        print(f"❌ Error: File '{args.input}' not found.")
+        raise SystemExit(1)
+
+    print(f"--- ONLINE SUMMARY ({summary.rows:,} rows, one pass) ---")
+    for by in GROUP_COLUMNS:
+        print(f"\n--- Price per {by} (median approximate) ---")
+        print(summary.describe('Price', by).sort_values(by='mean', ascending=False))
+    print(f"\nPrice 95th percentile (approximate): {summary.quantile('Price', 0.95):.2f}")
+    print(f"Overall Pearson Correlation (Rating vs. Price): {summary.correlation():.3f}")
+    print("\nCorrelation by Price Segment:")
+    print(summary.correlation(by='Price_Segment'))
\ No newline at end of file
@@ -0,0 +1,254 @@
+import os
+import json
+import argparse
+import threading
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+
+from storage import FORMATS, latest_version, read_dataset, remove_versions, with_format, write_dataset
+from eda_cache import file_digest, params_digest
+from instrumentation import log_event, print_summary, span
+
+RAW_FILE = "banggood_5_categories.csv"
+TRANSFORMED_FILE = "banggood_transformed_data.csv"
+REPORT_DIR = "eda_report"
+STATE_FILE = "pipeline_state.json"
+
+# --- 1. Stage Graph ---
+class Stage:
+    """One pipeline step: runs after `deps`, reads `inputs`, writes `outputs`.
+
+    `run(options)` returns True on success. A stage whose input files,
+    options and outputs are unchanged since its last successful run is
+    skipped. `params` names the options that affect its result. `inputs`
+    and `outputs` are file lists, or functions of the options returning one.
+    """
+
+    def __init__(self, name, run, deps=(), inputs=(), outputs=(), params=(), always_run=False):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.inputs = inputs if callable(inputs) else list(inputs)
+        self.outputs = outputs if callable(outputs) else list(outputs)
+        self.params = list(params)
+        self.always_run = always_run  # For stages whose real input or output is external (the website, the database)
+
+def raw_file(options):
+    """Scrape output and transform input. Fixture runs use their own file: the fixture server serves RAW_FILE."""
+    if options['fixtures']:
+        from banggood_scraper import FIXTURE_OUTPUT_FILE
+        return FIXTURE_OUTPUT_FILE
+    return RAW_FILE
+
+def run_scrape(options):
+    from banggood_scraper import CATEGORIES, extract_all, new_driver
+
+    categories, fixture_server = CATEGORIES, None
+    if options['fixtures']:
+        from fixture_server import start_fixture_server, fixture_categories
+        fixture_server, base_url = start_fixture_server()
+        categories = fixture_categories(base_url)
+    try:
+        df = extract_all(categories, max_workers=options['workers'], min_interval=options['min_interval'],
+                         driver_factory=lambda: new_driver(headless=True), backend=options['backend'])
+    finally:
+        if fixture_server is not None:
+            fixture_server.shutdown()
+    if df.empty:
+        print("❌ No data extracted from any category.")
+        return False
+    remove_versions(raw_file(options), keep=['csv'])
+    write_dataset(df, raw_file(options))
+    return True
+
+def run_transform(options):
+    from Data_Cleaning_Transformation import ENGINES
+
+    clean, featurize = ENGINES[options['engine']]
+    df = read_dataset(latest_version(raw_file(options)))
+    if options['dedup']:
+        from dedup import deduplicate, report_duplicates
+        with span('dedup', rows=len(df), mode=options['dedup']):
+            deduped, duplicates = deduplicate(df, near=options['dedup'] == 'near')
+        report_duplicates(df, duplicates)
+        df = deduped
+    with span('clean', rows=len(df), engine=options['engine']):
+        df = clean(df)
+    with span('featurize', rows=len(df), engine=options['engine']):
+        df = featurize(df)
+    formats = set(options['format']) | {'csv'}
+    remove_versions(TRANSFORMED_FILE, keep=formats)
+    for fmt in sorted(formats):
+        write_dataset(df, with_format(TRANSFORMED_FILE, fmt))
+    return True
+
+def run_load(options):
+    import load_to_sql
+    from db_backends import get_backend, load_db_config
+
+    config = load_db_config()
+    if options['db_backend']:
+        config['backend'] = options['db_backend']
+    return load_to_sql.main(bulk=True, merge=options['merge'], backend=get_backend(config))
+
+def run_report(options):
+    from EDA_Report import generate_report
+    from eda_cache import AggregateCache
+
+    return generate_report(data_file=TRANSFORMED_FILE, output_dir=REPORT_DIR, cache=AggregateCache()) is not None
+
+def run_history(options):
+    if not options['history']:
+        print("ℹ️ Price history is off (--history); nothing recorded.")
+        return True
+    from price_history import append_snapshot, report_snapshot
+
+    report_snapshot(*append_snapshot(read_dataset(latest_version(TRANSFORMED_FILE))))
+    return True
+
+STAGES = [
+    Stage('scrape', run_scrape, outputs=lambda options: [raw_file(options)], params=['backend', 'fixtures'], always_run=True),
+    Stage('transform', run_transform, deps=['scrape'], inputs=lambda options: [raw_file(options)], outputs=[TRANSFORMED_FILE], params=['engine', 'format', 'dedup', 'fixtures']),
+    # load, report and history depend only on the transformed data, so they run side by side. The
+    # table is not a file the state can hash (it may be dropped, or --db-backend point elsewhere), so load always runs
+    Stage('load', run_load, deps=['transform'], inputs=[TRANSFORMED_FILE], params=['db_backend', 'merge'], always_run=True),
+    Stage('report', run_report, deps=['transform'], inputs=[TRANSFORMED_FILE], outputs=[os.path.join(REPORT_DIR, 'report.html')]),
+    Stage('history', run_history, deps=['transform'], inputs=[TRANSFORMED_FILE], params=['history']),
+]
+
+def downstream(stages, start):
+    """Names of `start` and every stage that depends on it, directly or not."""
+    names = {start}
+    for stage in stages:  # STAGES is in dependency order
+        if any(dep in names for dep in stage.deps):
+            names.add(stage.name)
+    return names
+
+# --- 2. Change Detection ---
+def load_state(file_path=STATE_FILE):
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state, file_path=STATE_FILE):
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, file_path)
+
+def file_hashes(paths):
+    """Content hash of the newest CSV/Parquet/Arrow copy of each path (None when missing)."""
+    hashes = {}
+    for path in paths:
+        actual = latest_version(path) if os.path.splitext(path)[1] in FORMATS.values() else path
+        hashes[path] = file_digest(actual) if os.path.exists(actual) else None
+    return hashes
+
+def stage_files(files, options):
+    return files(options) if callable(files) else files
+
+def fingerprint(stage, options):
+    return {
+        'inputs': file_hashes(stage_files(stage.inputs, options)),
+        'outputs': file_hashes(stage_files(stage.outputs, options)),
+        'params': params_digest({name: options[name] for name in stage.params}),
+    }
+
+def is_up_to_date(stage, options, state):
+    """True if the stage's last successful run saw the same inputs and options, and its outputs are untouched."""
+    previous = state.get(stage.name)
+    if stage.always_run or previous is None:
+        return False
+    current = fingerprint(stage, options)
+    outputs_ok = all(digest is not None for digest in current['outputs'].values())
+    return outputs_ok and current == previous
+
+# --- 3. Scheduler ---
+def run_pipeline(options, start_from=None, force=False, stages=STAGES, state_file=STATE_FILE, max_workers=2):
+    """Runs the stage DAG, starting each stage as soon as its dependencies are done.
+
+    With `start_from`, only it and everything downstream of it run (always);
+    the other stages, upstream or on sibling branches such as load for
+    `start_from='report'`, are kept as they are. Otherwise stages are
+    skipped when is_up_to_date(). A failed stage blocks its dependents. Returns
+    {stage: status} with status 'ran', 'skipped', 'kept', 'failed' or 'blocked'.
+    """
+    state = load_state(state_file)
+    state_lock = threading.Lock()
+    forced = downstream(stages, start_from) if start_from else set()
+    # Stages outside `start_from`'s subtree are not run: their current outputs are used as they are
+    status = {stage.name: 'kept' for stage in stages if start_from and stage.name not in forced}
+    pending = [stage for stage in stages if stage.name not in status]
+    wall_start = perf_counter()
+
+    def execute(stage):
+        if not (force or stage.name in forced) and is_up_to_date(stage, options, state):
+            print(f"⏭️ {stage.name}: inputs unchanged, skipped.")
+            return 'skipped'
+        print(f"\n⏳ Stage '{stage.name}' started.")
+        with span(f'pipeline.{stage.name}'):
+            ok = stage.run(options)
+        if not ok:
+            print(f"❌ Stage '{stage.name}' failed.")
+            return 'failed'
+        with state_lock:
+            state[stage.name] = fingerprint(stage, options)
+            save_state(state, state_file)
+        print(f"✅ Stage '{stage.name}' done.")
+        return 'ran'
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while pending or running:
+            for stage in list(pending):
+                dep_status = [status.get(dep) for dep in stage.deps]
+                if any(s in ('failed', 'blocked') for s in dep_status):
+                    status[stage.name] = 'blocked'
+                    pending.remove(stage)
+                elif all(s is not None for s in dep_status):
+                    running[executor.submit(execute, stage)] = stage
+                    pending.remove(stage)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    status[stage.name] = future.result()
+                except Exception as e:
+                    print(f"❌ Stage '{stage.name}' raised: {e}")
+                    status[stage.name] = 'failed'
+
+    wall = perf_counter() - wall_start
+    log_event('pipeline_run', wall_seconds=round(wall, 3), status=status, start_from=start_from, force=force)
+    print("\n--- PIPELINE RESULT ---")
+    print(pd.Series({stage.name: status[stage.name] for stage in stages if stage.name in status}, name='status').to_string())
+    print(f"⏱️ Total time from first to last stage: {wall:.2f}s")
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run scrape -> transform -> (load | report | history) as one pipeline.")
+    parser.add_argument("--from", dest="start_from", choices=[stage.name for stage in STAGES], help="Rerun from this stage (and everything after it); earlier stages are not run.")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if its inputs are unchanged.")
+    parser.add_argument("--backend", choices=["selenium", "http"], default="selenium", help="Scrape backend.")
+    parser.add_argument("--fixtures", action="store_true", help="Scrape local fixture pages instead of banggood.com.")
+    parser.add_argument("--workers", type=int, default=3, help="Parallel scrape workers.")
+    parser.add_argument("--min-interval", type=float, default=2.0, help="Seconds between page loads on the same host.")
+    parser.add_argument("--engine", choices=["python", "vectorized"], default="vectorized", help="Cleaning engine.")
+    parser.add_argument("--format", choices=sorted(FORMATS), nargs='+', default=["csv"], help="Extra formats for the transformed data.")
+    parser.add_argument("--dedup", choices=["exact", "near"], default=None, help="Drop repeated products before cleaning (see dedup.py).")
+    parser.add_argument("--history", action="store_true", help="Append each transformed scrape to the price history.")
+    parser.add_argument("--db-backend", default=None, help="Override the configured database backend (sqlserver, sqlite, duckdb).")
+    parser.add_argument("--merge", action="store_true", help="Upsert into the table instead of reloading it.")
+    args = parser.parse_args()
+
+    options = {
+        'backend': args.backend, 'fixtures': args.fixtures, 'workers': args.workers, 'min_interval': args.min_interval,
+        'engine': args.engine, 'format': sorted(args.format), 'dedup': args.dedup, 'history': args.history, 'db_backend': args.db_backend, 'merge': args.merge,
+    }
+    print("*** BANGGOOD PIPELINE ***")
+    status = run_pipeline(options, start_from=args.start_from, force=args.force)
+    print_summary("PIPELINE TIMING")
+    raise SystemExit(0 if all(s in ('ran', 'skipped', 'kept') for s in status.values()) else 1)
\ No newline at end of file
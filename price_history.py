@@ -0,0 +1,295 @@
+import io
+import os
+import re
+import glob
+import argparse
+import contextlib
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+from storage import latest_version, pa, read_dataset
+from compact_frame import canonical_urls, product_ids
+from eda_cache import params_digest
+from Data_Cleaning_Transformation import OUTPUT_FILE, ENGINES
+
+HISTORY_DIR = "price_history"
+KEYFRAME_DAYS = 7         # A full snapshot at least this often; the snapshots in between hold changed rows only
+ROW_GROUP_ROWS = 50_000   # Row groups carry Product_ID min/max, so one product's history skips most of each file
+VALUE_COLUMNS = ['Category', 'Name', 'Price', 'Rating', 'Reviews']
+SNAPSHOT_COLUMNS = ['Product_ID'] + VALUE_COLUMNS + ['Listed']
+TIME_FORMAT = '%Y%m%dT%H%M%SZ'
+SNAPSHOT_NAME = re.compile(r'^(\d{8}T\d{6}Z)-(full|delta)\.parquet$')
+
+# --- 1. Snapshot Files ---
+# price_history/scrape_date=2026-10-18/20261018T061500Z-delta.parquet
+#   full:  every listed product of that scrape
+#   delta: only products that are new, changed (any VALUE_COLUMNS) or delisted (Listed=False)
+def snapshot_files(history_dir=HISTORY_DIR):
+    """Every snapshot file as (path, scraped_at, kind), oldest first. Timestamps are UTC."""
+    files = []
+    for path in glob.glob(os.path.join(history_dir, 'scrape_date=*', '*.parquet')):
+        match = SNAPSHOT_NAME.match(os.path.basename(path))
+        if match:
+            files.append({'path': path, 'scraped_at': pd.Timestamp(match.group(1)).tz_localize(None), 'kind': match.group(2)})
+    return pd.DataFrame(files, columns=['path', 'scraped_at', 'kind']).sort_values('scraped_at', ignore_index=True)
+
+def files_for_window(files, start=None, end=None):
+    """The snapshots needed to know every product's state from `start` to `end`.
+
+    That is the newest full snapshot at or before `start` (or `end` when
+    there is no start) and everything after it up to `end`, so a window
+    never reads history older than one keyframe interval before it.
+    """
+    if end is not None:
+        files = files[files['scraped_at'] <= end]
+    base = start if start is not None else end
+    keyframes = files[files['kind'] == 'full']
+    if base is not None:
+        keyframes = keyframes[keyframes['scraped_at'] <= base]
+    if keyframes.empty:
+        return files
+    return files[files['scraped_at'] >= keyframes['scraped_at'].max()]
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the price history (Parquet). Install it to use price_history.py.")
+
+# --- 2. Append ---
+def snapshot_rows(df):
+    """One row per product ID of a transformed (or compact) frame, in the history's dtypes, sorted by Product_ID.
+
+    Rows without a product ID in the URL cannot be tracked and are left out;
+    a product listed in several categories keeps its first row.
+    """
+    ids = df['Product_ID'] if 'Product_ID' in df else product_ids(df['URL'])
+    rows = df[VALUE_COLUMNS].assign(Product_ID=ids.to_numpy())[ids.notna().to_numpy()]
+    rows = rows.drop_duplicates('Product_ID').sort_values('Product_ID', kind='stable')
+    return pd.DataFrame({
+        'Product_ID': rows['Product_ID'].astype('int64'),
+        'Category': rows['Category'].astype(object),
+        'Name': rows['Name'].astype(object),
+        'Price': rows['Price'].astype('float64'),
+        'Rating': rows['Rating'].astype('float64'),
+        'Reviews': rows['Reviews'].astype('int64'),
+        'Listed': True,
+    }).reset_index(drop=True)
+
+def changed_rows(current, previous):
+    """Delta of `current` against the last known state: new and changed products, plus delisted ones (Listed=False)."""
+    previous = previous.set_index('Product_ID')
+    current = current.set_index('Product_ID')
+    listed_before = previous.index[previous['Listed'].to_numpy()]
+    seen = current.index.isin(listed_before)
+    before = previous.reindex(current.index[seen])
+    # One 64-bit hash per row instead of comparing column by column; NaN hashes equal to NaN
+    same = pd.util.hash_pandas_object(current.loc[seen, VALUE_COLUMNS], index=False).to_numpy() \
+        == pd.util.hash_pandas_object(before[VALUE_COLUMNS], index=False).to_numpy()
+    keep = ~seen
+    keep[seen] = ~same
+    delisted = previous.loc[listed_before.difference(current.index)].assign(Listed=False)
+    delta = pd.concat([current[keep], delisted]).sort_index(kind='stable')
+    return delta.reset_index()[SNAPSHOT_COLUMNS]
+
+def write_snapshot(rows, file_path):
+    """Writes one snapshot file atomically; a snapshot that already exists is never overwritten."""
+    if os.path.exists(file_path):
+        raise FileExistsError(f"Snapshot '{file_path}' already exists; the price history is append-only.")
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = file_path + '.tmp'
+    # Sorted IDs delta-encode to a few bits each; text columns get dictionaries
+    rows.to_parquet(tmp_path, index=False, row_group_size=ROW_GROUP_ROWS,
+                    use_dictionary=['Category', 'Name'], column_encoding={'Product_ID': 'DELTA_BINARY_PACKED'})
+    os.replace(tmp_path, file_path)
+    return file_path
+
+def append_snapshot(df, scraped_at=None, history_dir=HISTORY_DIR, full=None):
+    """Adds one scrape (a transformed frame) to the history. Returns (file written, counts).
+
+    Writes a full snapshot when `full` is True, or by default when the last
+    one is KEYFRAME_DAYS old or there is none; otherwise only the rows that
+    differ from the last known state. `scraped_at` (UTC) must be newer than
+    every snapshot already stored.
+    """
+    require_pyarrow()
+    scraped_at = pd.Timestamp(scraped_at if scraped_at is not None else pd.Timestamp.now(tz='UTC'))
+    scraped_at = (scraped_at.tz_convert('UTC').tz_localize(None) if scraped_at.tzinfo else scraped_at).floor('s')
+    files = snapshot_files(history_dir)
+    if not files.empty and scraped_at <= files['scraped_at'].max():
+        raise ValueError(f"Snapshot time {scraped_at} is not after the newest stored snapshot ({files['scraped_at'].max()}).")
+
+    current = snapshot_rows(df)
+    last_full = files.loc[files['kind'] == 'full', 'scraped_at'].max()
+    if full is None:
+        full = pd.isna(last_full) or scraped_at - last_full >= pd.Timedelta(days=KEYFRAME_DAYS)
+    rows = current if full else changed_rows(current, state_at(files, scraped_at))
+
+    kind = 'full' if full else 'delta'
+    file_path = os.path.join(history_dir, f"scrape_date={scraped_at:%Y-%m-%d}", f"{scraped_at.strftime(TIME_FORMAT)}-{kind}.parquet")
+    write_snapshot(rows, file_path)
+    counts = {'products': len(current), 'untracked': len(df) - len(current), 'written': len(rows),
+              'delisted': int((~rows['Listed']).sum()), 'kind': kind}
+    return file_path, counts
+
+def report_snapshot(file_path, counts):
+    print("\n--- Price History ---")
+    print(f"Products: {counts['products']:,} | Rows written: {counts['written']:,} ({counts['kind']}) | Delisted: {counts['delisted']:,}")
+    if counts['untracked']:
+        print(f"ℹ️ {counts['untracked']:,} rows without a product ID (or repeated IDs) were not recorded.")
+    print(f"✅ Snapshot saved to '{file_path}'.")
+
+# --- 3. Reading ---
+def read_snapshots(files, columns=None, product_id=None):
+    """Rows of the given snapshot files with their Scraped_At, optionally for one product only."""
+    require_pyarrow()
+    columns = None if columns is None else ['Product_ID'] + [c for c in columns if c != 'Product_ID']
+    filters = [('Product_ID', '==', int(product_id))] if product_id is not None else None
+    parts = [pd.read_parquet(f.path, columns=columns, filters=filters).assign(Scraped_At=f.scraped_at)
+             for f in files.itertuples()]
+    if not parts:
+        return pd.DataFrame(columns=(columns or SNAPSHOT_COLUMNS) + ['Scraped_At'])
+    return pd.concat(parts, ignore_index=True)
+
+def latest_rows(rows, until=None):
+    """Each product's newest row at or before `until` (files are read oldest first)."""
+    if until is not None:
+        rows = rows[rows['Scraped_At'] <= until]
+    return rows.drop_duplicates('Product_ID', keep='last')
+
+def state_at(files, when=None, columns=None):
+    """Every product's last known row at `when` (default: now), delisted ones included."""
+    return latest_rows(read_snapshots(files_for_window(files, None, when), columns), when)
+
+def snapshot_at(when=None, history_dir=HISTORY_DIR, columns=None):
+    """The products listed at `when`, with their values then."""
+    state = state_at(snapshot_files(history_dir), when, columns + ['Listed'] if columns else None)
+    return state[state['Listed'].astype(bool)].drop(columns='Listed').sort_values('Product_ID', ignore_index=True)
+
+def load_window(start=None, end=None, history_dir=HISTORY_DIR):
+    """Every product listed at some point in [start, end], with its last values in the window, in the transformed layout.
+
+    Only the snapshots from the keyframe before `start` onwards are read.
+    Price_Segment, Name_Length, Price_Per_Char and URL are derived as
+    Data_Cleaning_Transformation.py does, so the EDA modules run on it unchanged.
+    """
+    rows = read_snapshots(files_for_window(snapshot_files(history_dir), start, end))
+    if end is not None:
+        rows = rows[rows['Scraped_At'] <= end]
+    if start is not None:
+        rows = pd.concat([latest_rows(rows, start), rows[rows['Scraped_At'] > start]])
+    rows = latest_rows(rows[rows['Listed'].astype(bool)]).sort_values('Product_ID', ignore_index=True)
+    _, featurize = ENGINES['vectorized']
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = featurize(rows[VALUE_COLUMNS + ['Scraped_At']].copy())
+    df['URL'] = canonical_urls(rows['Product_ID'])
+    return df
+
+def window_fingerprint(start=None, end=None, history_dir=HISTORY_DIR):
+    """Cache key of load_window(): snapshot files are never rewritten, so their names identify the data."""
+    files = files_for_window(snapshot_files(history_dir), start, end)
+    return params_digest({'snapshots': [os.path.basename(path) for path in files['path']], 'start': start, 'end': end})
+
+# --- 4. Queries ---
+def price_history(product_id, start=None, end=None, history_dir=HISTORY_DIR):
+    """One row per recorded change of a product (plus its state at `start`), oldest first.
+
+    Without `start` the whole history is read; Product_ID row-group
+    statistics let each file skip all but one row group.
+    """
+    files = snapshot_files(history_dir)
+    files = files_for_window(files, start, end) if start is not None else files
+    rows = read_snapshots(files, product_id=product_id)
+    if end is not None:
+        rows = rows[rows['Scraped_At'] <= end]
+    if start is not None:
+        rows = pd.concat([latest_rows(rows, start), rows[rows['Scraped_At'] > start]])
+    # Every full snapshot repeats the product; keep the rows where something changed
+    changed = pd.util.hash_pandas_object(rows[VALUE_COLUMNS + ['Listed']], index=False)
+    rows = rows[changed.ne(changed.shift()).to_numpy()]
+    return rows[['Scraped_At', 'Listed'] + VALUE_COLUMNS].reset_index(drop=True)
+
+def price_changes(start=None, end=None, history_dir=HISTORY_DIR):
+    """Products listed at both `start` (default: first snapshot) and `end` (default: now), with both prices."""
+    files = snapshot_files(history_dir)
+    if start is None and not files.empty:
+        start = files['scraped_at'].min()
+    rows = read_snapshots(files_for_window(files, start, end), ['Category', 'Name', 'Price', 'Listed'])
+    before, after = latest_rows(rows, start), latest_rows(rows, end)
+    changes = before[before['Listed'].astype(bool)].merge(after[after['Listed'].astype(bool)], on='Product_ID', suffixes=('_Start', '_End'))
+    changes['Change'] = changes['Price_End'] / changes['Price_Start'].where(changes['Price_Start'] > 0) - 1
+    return changes
+
+def category_price_movement(start=None, end=None, history_dir=HISTORY_DIR):
+    """Per category: products listed at both ends of the window, median prices then and now, and how many moved."""
+    changes = price_changes(start, end, history_dir)
+    movement = changes.groupby('Category_End').agg(
+        Products=('Product_ID', 'size'),
+        Median_Start=('Price_Start', 'median'),
+        Median_End=('Price_End', 'median'),
+        Mean_Change=('Change', 'mean'),
+        Up=('Change', lambda c: (c > 0).mean()),
+        Down=('Change', lambda c: (c < 0).mean()),
+    )
+    return movement.rename_axis('Category').sort_values('Mean_Change')
+
+def largest_drops(start=None, end=None, top=10, history_dir=HISTORY_DIR):
+    """The `top` products whose price fell the most (relative) between `start` and `end`."""
+    changes = price_changes(start, end, history_dir)
+    drops = changes[changes['Change'] < 0].nsmallest(top, 'Change')
+    return drops[['Product_ID', 'Category_End', 'Name_End', 'Price_Start', 'Price_End', 'Change']] \
+        .rename(columns={'Category_End': 'Category', 'Name_End': 'Name'}).reset_index(drop=True)
+
+def store_summary(history_dir=HISTORY_DIR):
+    """Snapshots, rows and bytes on disk per kind (full/delta)."""
+    files = snapshot_files(history_dir)
+    files['bytes'] = [os.path.getsize(path) for path in files['path']]
+    files['rows'] = [pq.ParquetFile(path).metadata.num_rows for path in files['path']] if pq is not None else 0
+    return files.groupby('kind').agg(snapshots=('path', 'size'), rows=('rows', 'sum'), bytes=('bytes', 'sum'),
+                                     first=('scraped_at', 'min'), last=('scraped_at', 'max'))
+
+def parse_time(text, end=False):
+    """'2026-10-18' or '2026-10-18 06:15' as a UTC timestamp; a bare date used as an end means the whole day."""
+    if text is None:
+        return None
+    when = pd.Timestamp(text)
+    if end and re.fullmatch(r'\d{4}-\d{2}-\d{2}', text.strip()):
+        when += pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    return when
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append scrape snapshots to the price history and query it.")
+    parser.add_argument("--append", action="store_true", help="Add the transformed data as a new snapshot.")
+    parser.add_argument("--input", default=OUTPUT_FILE, help="Transformed data to append (its newest CSV/Parquet/Arrow copy is used).")
+    parser.add_argument("--scraped-at", default=None, help="Snapshot time in UTC (default: now).")
+    parser.add_argument("--full", action="store_true", help="Write a full snapshot instead of a delta.")
+    parser.add_argument("--product", type=int, default=None, help="Print the price history of this product ID.")
+    parser.add_argument("--movement", action="store_true", help="Print the price movement per category between --since and --until.")
+    parser.add_argument("--drops", type=int, default=None, help="Print this many products with the largest price drops between --since and --until.")
+    parser.add_argument("--since", default=None, help="Window start (UTC date or time; default: first snapshot).")
+    parser.add_argument("--until", default=None, help="Window end (UTC date or time; default: now).")
+    parser.add_argument("--history-dir", default=HISTORY_DIR)
+    args = parser.parse_args()
+    since, until = parse_time(args.since), parse_time(args.until, end=True)
+
+    if args.append:
+        try:
+            df = read_dataset(latest_version(args.input))
+        except FileNotFoundError:
+            print(f"❌ Error: File not found at {args.input}. Run Data_Cleaning_Transformation.py first.")
+            raise SystemExit(1)
+        report_snapshot(*append_snapshot(df, args.scraped_at, args.history_dir, full=args.full or None))
+    if args.product is not None:
+        print(f"\n--- Price History of Product {args.product} ---")
+        print(price_history(args.product, since, until, args.history_dir).to_string(index=False))
+    if args.movement:
+        print("\n--- Price Movement per Category ---")
+        print(category_price_movement(since, until, args.history_dir).round(3))
+    if args.drops:
+        print(f"\n--- Top {args.drops} Price Drops ---")
+        print(largest_drops(since, until, args.drops, args.history_dir).round(3).to_string(index=False))
+    if not (args.append or args.product is not None or args.movement or args.drops):
+        print("--- PRICE HISTORY ---")
+        print(store_summary(args.history_dir))
\ No newline at end of file
@@ -0,0 +1,119 @@
+import heapq
+import itertools
+import numpy as np
+import pandas as pd
+
+# --- 1. Metrics ---
+def per_dollar(values, prices):
+    """values / price; free products (division by zero) score 0."""
+    return (values / prices).replace([np.inf, -np.inf], 0)
+
+# Metric name -> function of the frame
+METRICS = {
+    'Reviews': lambda df: df['Reviews'],
+    'Value_Metric': lambda df: per_dollar(df['Reviews'], df['Price']),  # Reviews per dollar
+    'Rating_Per_Price': lambda df: per_dollar(df['Rating'], df['Price']),
+}
+
+def check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown ranking metric '{metric}'. Choose one of: {', '.join(METRICS)}")
+
+def metric_values(df, metric):
+    check_metric(metric)
+    return METRICS[metric](df)
+
+# --- 2. Partial Selection ---
+def top_positions(values, n):
+    """Positions of the n largest values, largest first, without sorting the whole array.
+
+    np.argpartition finds the n largest in O(len), then only the values
+    strictly above the n-th largest are sorted; the rest of the n are its
+    ties, taken in position order. NaN ranks last; ties keep their
+    original order, even when most of the column is tied (Reviews is 0
+    for every scraped row).
+    """
+    values = np.asarray(values, dtype='float64')
+    n = min(n, len(values))
+    if n <= 0:
+        return np.array([], dtype='int64')
+    filled = np.where(np.isnan(values), -np.inf, values)
+    if n == len(filled):
+        return np.lexsort((np.arange(n), -filled))
+    threshold = filled[np.argpartition(filled, len(filled) - n)[len(filled) - n]]
+    above = np.flatnonzero(filled > threshold)  # Fewer than n
+    above = above[np.lexsort((above, -filled[above]))]
+    tied = np.flatnonzero(filled == threshold)[:n - len(above)]  # Already in position order
+    return np.concatenate([above, tied])
+
+def grouped_top_positions(values, groups, n):
+    """top_positions() within each group (sorted by group label; missing labels are skipped).
+
+    Meant for a handful of groups such as Category or Price_Segment: each
+    group is one vectorized mask plus a partial selection.
+    """
+    codes, labels = pd.factorize(groups, sort=True)
+    positions = []
+    for code in range(len(labels)):
+        members = np.flatnonzero(codes == code)
+        positions.append(members[top_positions(values[members], n)])
+    return np.concatenate(positions) if positions else np.array([], dtype='int64')
+
+def top_n(df, metric='Reviews', n=5, by=None, columns=None):
+    """Top `n` rows of `df` by `metric`, globally or per group of column `by`.
+
+    The metric is added as a column to the returned rows (not to `df`). Per
+    group, rows come back group by group, each group largest first.
+    """
+    values = metric_values(df, metric)
+    if by is None:
+        positions = top_positions(values.to_numpy(), n)
+    else:
+        positions = grouped_top_positions(values.to_numpy(), df[by], n)
+    rows = df.iloc[positions] if columns is None else df.iloc[positions][columns]
+    return rows.assign(**{metric: values.iloc[positions].to_numpy()})
+
+# --- 3. Streaming Top-N ---
+class StreamingTopN:
+    """Keeps the top `n` rows by `metric` (per group of `by`, or overall) while chunks arrive.
+
+    Each chunk is first cut down to its own top n per group with partial
+    selection, then merged into a bounded min-heap, so memory stays at
+    n rows per group however many rows stream through. Ties keep the row
+    that arrived first.
+    """
+
+    def __init__(self, metric='Reviews', n=5, by=None, columns=None):
+        check_metric(metric)
+        self.metric = metric
+        self.n = n
+        self.by = by
+        if columns is not None and by is not None and by not in columns:
+            columns = [by] + list(columns)
+        self.columns = columns
+        self.rows_seen = 0
+        self._heaps = {}               # Group -> min-heap of (value, -arrival, row dict)
+        self._arrival = itertools.count()
+
+    def update(self, chunk):
+        """Adds a chunk of new rows (e.g. one scraped page or one CSV chunk)."""
+        self.rows_seen += len(chunk)
+        if chunk.empty:
+            return
+        candidates = top_n(chunk, self.metric, self.n, by=self.by, columns=self.columns)
+        groups = candidates[self.by] if self.by is not None else itertools.repeat(None)
+        for group, value, row in zip(groups, candidates[self.metric], candidates.to_dict('records')):
+            value = -np.inf if pd.isna(value) else float(value)
+            heap = self._heaps.setdefault(group, [])
+            entry = (value, -next(self._arrival), row)
+            if len(heap) < self.n:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+    def result(self):
+        """Current top rows as a DataFrame, in the same order as top_n()."""
+        rows = []
+        for group in sorted(self._heaps, key=lambda g: (g is None, g)):
+            rows += [row for *_, row in sorted(self._heaps[group], key=lambda e: e[:2], reverse=True)]
+        return pd.DataFrame(rows)
\ No newline at end of file
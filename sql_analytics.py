@@ -0,0 +1,156 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+from db_backends import BACKENDS, DB_ERRORS, get_backend, load_db_config
+from load_to_sql import TABLE_NAME
+from Data_Cleaning_Transformation import PRICE_LABELS
+from instrumentation import print_summary, span
+
+# Index name suffix -> columns. Category leads (Category, <value>) indexes, so the per-category
+# aggregates and the per-category ORDER BY <value> of the median read an index only.
+INDEXES = {
+    'Category': ['Category', 'Price'],
+    'Name_Length': ['Category', 'Name_Length'],
+    'Reviews': ['Reviews'],
+    'Price': ['Price'],
+}
+STATS = ['count', 'mean', 'median', 'std', 'min', 'max']
+
+# --- 1. Queries & Indexes ---
+def query_frame(cursor, sql):
+    """Runs `sql` and returns its (small) result set as a DataFrame."""
+    cursor.execute(sql)
+    columns = [column[0] for column in cursor.description]
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+def ensure_indexes(cursor, backend, table_name=TABLE_NAME):
+    """Creates the analytics indexes if they are missing.
+
+    A full (non-merge) load drops and recreates the table, indexes included,
+    so this runs before every set of queries; it is a no-op when they exist.
+    """
+    for suffix, columns in INDEXES.items():
+        cursor.execute(backend.create_index_statement(table_name, f"IX_{table_name}_{suffix}", columns))
+    cursor.connection.commit()
+
+# --- 2. Aggregates ---
+def column_stats(cursor, column, by, stats=STATS, table_name=TABLE_NAME):
+    """count/mean/median/std/min/max of `column` per value of `by`, computed in the database.
+
+    Only one row per group comes back. The standard deviation takes two
+    passes (deviations from the group mean, ddof=1 like pandas) rather than
+    the less precise sum-of-squares shortcut; the median is the middle row(s)
+    of each group by ROW_NUMBER, since SQLite and SQL Server have no MEDIAN().
+    Averages are taken over DOUBLE PRECISION: SQL Server's AVG of an INT
+    column (Name_Length) is an INT. (FLOAT is single precision in DuckDB.)
+    """
+    value = f"CAST(t.{column} AS DOUBLE PRECISION)"
+    moments = query_frame(cursor, f"""
+        SELECT t.{by} AS grp, COUNT(t.{column}) AS n, AVG({value}) AS mean_value,
+               MIN(t.{column}) AS min_value, MAX(t.{column}) AS max_value,
+               SUM((t.{column} - g.mean_value) * (t.{column} - g.mean_value)) AS m2
+        FROM {table_name} AS t
+        JOIN (SELECT {by}, AVG(CAST({column} AS DOUBLE PRECISION)) AS mean_value FROM {table_name} GROUP BY {by}) AS g ON t.{by} = g.{by}
+        GROUP BY t.{by}""").set_index('grp')
+    # DECIMAL columns (DuckDB, SQL Server) come back as Decimal objects
+    result = pd.DataFrame({
+        'count': moments['n'].astype('int64'),
+        'mean': moments['mean_value'].astype(float),
+        'std': np.sqrt(moments['m2'].astype(float) / (moments['n'] - 1).where(moments['n'] > 1)),
+        'min': moments['min_value'].astype(float),
+        'max': moments['max_value'].astype(float),
+    })
+    if 'median' in stats:
+        medians = query_frame(cursor, f"""
+            SELECT grp, AVG(value) AS median_value FROM (
+                SELECT {by} AS grp, CAST({column} AS DOUBLE PRECISION) AS value,
+                       ROW_NUMBER() OVER (PARTITION BY {by} ORDER BY {column}) AS rn,
+                       COUNT(*) OVER (PARTITION BY {by}) AS n
+                FROM {table_name} WHERE {column} IS NOT NULL AND {by} IS NOT NULL
+            ) AS ranked
+            WHERE 2 * rn BETWEEN n AND n + 2
+            GROUP BY grp""").set_index('grp')
+        result['median'] = medians['median_value'].astype(float)
+    return result[stats].rename_axis(by)
+
+def category_summary(cursor, table_name=TABLE_NAME):
+    """Product count, average price and average rating per category (README Part 5)."""
+    summary = query_frame(cursor, f"""
+        SELECT Category, COUNT(*) AS Products, AVG(Price) AS Avg_Price, AVG(Rating) AS Avg_Rating
+        FROM {table_name} GROUP BY Category""").set_index('Category')
+    return summary.astype({'Avg_Price': float, 'Avg_Rating': float}).sort_values('Avg_Price', ascending=False)
+
+# --- 3. EDA Summaries in SQL ---
+# Each returns the same dict as the pandas summarize_* function of its EDA module
+def summarize_price_distribution(cursor, backend):
+    return {'price_summary': column_stats(cursor, 'Price', 'Category').sort_values(by='mean', ascending=False)}
+
+def summarize_top_reviewed(cursor, backend, n=5):
+    # ProductID follows insertion order, so ties resolve like the stable pandas ranking
+    top_reviewed = query_frame(cursor, backend.limit(
+        f"SELECT Category, Name, Reviews, Price, Rating FROM {TABLE_NAME} ORDER BY Reviews DESC, ProductID", n))
+    return {'n': n, 'top_reviewed': top_reviewed.astype({'Price': float, 'Rating': float})}
+
+def summarize_stock_proxy(cursor, backend):
+    name_length_summary = column_stats(cursor, 'Name_Length', 'Category', stats=['mean', 'median', 'std', 'count'])
+    segments = pd.CategoricalIndex(PRICE_LABELS, categories=PRICE_LABELS, ordered=True, name='Price_Segment')
+    name_length_segment = column_stats(cursor, 'Name_Length', 'Price_Segment', stats=['mean'])['mean']
+    return {
+        'name_length_summary': name_length_summary.sort_values(by='mean', ascending=False),
+        'name_length_segment': name_length_segment.reindex(segments).rename('Name_Length'),
+    }
+
+# Analysis name (as in EDA_Runner.ANALYSES) -> SQL summarize function
+SQL_SUMMARIES = {
+    'price_distribution': summarize_price_distribution,
+    'top_reviewed': summarize_top_reviewed,
+    'stock_proxy': summarize_stock_proxy,
+}
+
+def sql_summaries(names, backend):
+    """Runs the SQL version of each named analysis against the loaded table. Returns {name: summary}."""
+    conn = backend.connect()
+    try:
+        cursor = conn.cursor()
+        with span('sql.indexes', backend=backend.name):
+            ensure_indexes(cursor, backend)
+        summaries = {}
+        for name in names:
+            with span(f'sql.{name}', backend=backend.name):
+                summaries[name] = SQL_SUMMARIES[name](cursor, backend)
+        return summaries
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the EDA aggregates as SQL against the loaded BanggoodProducts table.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), help="Override the configured database backend.")
+    parser.add_argument("--db-path", help="Database file for the sqlite/duckdb backends.")
+    args = parser.parse_args()
+
+    config = load_db_config()
+    if args.backend:
+        config['backend'] = args.backend
+    if args.db_path:
+        config['path'] = args.db_path
+    backend = get_backend(config)
+
+    from EDA_Runner import ANALYSES
+    try:
+        summaries = sql_summaries(list(SQL_SUMMARIES), backend)
+        conn = backend.connect()
+        try:
+            by_category = category_summary(conn.cursor())
+        finally:
+            conn.close()
+    except (ImportError,) + DB_ERRORS as ex:
+        print(f"❌ Query failed on {backend.describe()}: {ex}")
+        print("Load the data first (load_to_sql.py) and check the database settings.")
+        raise SystemExit(1)
+
+    print(f"--- SQL AGGREGATES ({backend.describe()}) ---")
+    print(by_category.round(2))
+    for name, summary in summaries.items():
+        ANALYSES[name][2](None, summary=summary, plot=False)
+    print_summary("SQL ANALYTICS TIMING")
\ No newline at end of file
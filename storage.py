@@ -0,0 +1,87 @@
+import os
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None  # Only CSV is available without pyarrow
+
+# Format name -> file extension
+FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+# Copy readers use when a dataset has several; fastest to read first
+PREFERENCE = ['arrow', 'parquet', 'csv']
+
+# --- 1. Paths ---
+def with_format(file_path, fmt):
+    """Swaps the extension of `file_path` for the one of `fmt` ('csv', 'parquet' or 'arrow')."""
+    return os.path.splitext(file_path)[0] + FORMATS[fmt]
+
+def format_of(file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    for fmt, fmt_ext in FORMATS.items():
+        if ext == fmt_ext:
+            return fmt
+    raise ValueError(f"Unsupported dataset format: '{file_path}'")
+
+def latest_version(file_path, fmt=None):
+    """Returns the copy of a dataset to read among its CSV/Parquet/Arrow siblings.
+
+    Lets readers keep their CSV file name while picking up a columnar copy
+    when the previous stage wrote one: `fmt`'s copy if given, otherwise the
+    first existing one in PREFERENCE order. Modification times play no part;
+    writers call remove_versions() for the formats they did not rewrite, so
+    every copy left is current. Falls back to `file_path` if none exist.
+    """
+    if fmt is not None:
+        return with_format(file_path, fmt)
+    for candidate in PREFERENCE:
+        path = with_format(file_path, candidate)
+        if os.path.exists(path):
+            return path
+    return file_path
+
+def remove_versions(file_path, keep=()):
+    """Deletes the CSV/Parquet/Arrow copies of a dataset except the formats in `keep`."""
+    for fmt in FORMATS:
+        path = with_format(file_path, fmt)
+        if fmt not in keep and os.path.exists(path):
+            os.remove(path)
+
+def _require_pyarrow(file_path):
+    if pa is None:
+        raise ImportError(f"pyarrow is required to read or write '{file_path}'. Install it or use CSV.")
+
+# --- 2. Write ---
+def write_dataset(df, file_path):
+    """Writes `df` in the format given by the file extension.
+
+    Parquet is compressed and the smallest on disk; Arrow IPC is written
+    uncompressed so it can be memory-mapped. Both keep dtypes, including
+    the categorical Price_Segment.
+    """
+    fmt = format_of(file_path)
+    if fmt == 'csv':
+        df.to_csv(file_path, index=False)
+    elif fmt == 'parquet':
+        _require_pyarrow(file_path)
+        df.to_parquet(file_path, index=False)
+    else:
+        _require_pyarrow(file_path)
+        feather.write_feather(df.reset_index(drop=True), file_path, compression='uncompressed')
+    return file_path
+
+# --- 3. Read ---
+def read_dataset(file_path, columns=None):
+    """Reads a dataset written by write_dataset(), optionally only the given columns.
+
+    Columnar formats read just the requested columns from disk; Arrow files are
+    memory-mapped instead of copied into memory.
+    """
+    fmt = format_of(file_path)
+    if fmt == 'csv':
+        return pd.read_csv(file_path, usecols=columns)
+    _require_pyarrow(file_path)
+    if fmt == 'parquet':
+        return pd.read_parquet(file_path, columns=columns)
+    return feather.read_table(file_path, columns=columns, memory_map=True).to_pandas()
@@ -0,0 +1,183 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+RAW_FILE = "banggood_5_categories.csv"
+CHUNK_SIZE = 100_000
+# Product URLs look like https://www.banggood.com/<Name-Slug>-p-<id>.html?rmmds=...
+PRODUCT_URL_PATTERN = r'^(https?://[^/]+/).*-p-(\d+)(\.html.*)$'
+PRICE_JITTER = 0.15           # Sigma of the log-normal factor applied to sampled prices
+ZERO_REVIEW_SHARE = 0.35      # Products nobody has reviewed yet (Rating stays 'N/A')
+RATING_LABELS = np.array([f'{tenths / 10:.1f}' for tenths in range(10, 51)], dtype=object)  # '1.0' .. '5.0'
+
+# --- 1. Profile of the Real Scrape ---
+def slugify(names):
+    """'LAOTIE ES10  ES18 Lite' -> 'LAOTIE-ES10-ES18-Lite', as in the product URLs."""
+    return names.str.replace(r'[^0-9A-Za-z]+', '-', regex=True).str.strip('-')
+
+class CatalogProfile:
+    """Empirical distributions of a real scrape, per category.
+
+    Everything the generator draws comes from here: category shares, words
+    per name and the word vocabulary, price dollars and cents, the share of
+    'N/A' prices and missing names, and the URL host and query strings.
+    """
+
+    def __init__(self, categories, shares, per_category, url_host, first_product_id):
+        self.categories = categories
+        self.shares = shares
+        self.per_category = per_category
+        self.url_host = url_host
+        self.first_product_id = first_product_id
+
+    @classmethod
+    def from_file(cls, file_path=RAW_FILE):
+        base = pd.read_csv(file_path, dtype=str, keep_default_na=False)  # Keep 'N/A' as the scraper wrote it
+        urls = base['URL'].str.extract(PRODUCT_URL_PATTERN)
+        shares = base['Category'].value_counts(normalize=True)
+        per_category = {}
+        for category, rows in base.groupby('Category'):
+            names = rows['Name'][~rows['Name'].isin(['', 'N/A'])]
+            words = names.str.split().explode().value_counts(normalize=True)
+            slugs = slugify(words.index.to_series()).to_numpy(dtype=object)
+            price_text = rows['Price'].str.replace(r'[^\d.]', '', regex=True)
+            prices = pd.to_numeric(price_text, errors='coerce').dropna()
+            per_category[category] = {
+                'word_counts': names.str.split().str.len().to_numpy(),
+                'vocabulary': words.index.to_numpy(dtype=object),
+                'word_p': words.to_numpy(),
+                # Each word's URL slug plus its '-' separator ('' for words that are all punctuation)
+                'slug_parts': np.where(slugs != '', slugs + '-', ''),
+                'dollars': np.floor(prices).to_numpy(),
+                'cents': np.round(prices % 1 * 100).astype(int).to_numpy(),
+                'na_price_rate': (rows['Price'] == 'N/A').mean(),
+                'missing_name_rate': 1 - len(names) / len(rows),
+                'url_suffixes': urls.loc[rows.index, 2].dropna().to_numpy(dtype=object),
+            }
+        url_host = urls[0].mode().iloc[0] if urls[0].notna().any() else 'https://www.banggood.com/'
+        first_product_id = int(urls[1].dropna().astype('int64').max()) + 1 if urls[1].notna().any() else 1
+        return cls(shares.index.to_numpy(dtype=object), shares.to_numpy(), per_category, url_host, first_product_id)
+
+# --- 2. Row Generator ---
+def synthetic_reviews(rng, n_rows):
+    """Reviews and Rating strings; the scraper only writes placeholders for these, so they are not sampled."""
+    reviews = np.where(rng.random(n_rows) < ZERO_REVIEW_SHARE, 0, np.floor(rng.lognormal(2.5, 1.5, n_rows)).astype('int64') + 1)
+    tenths = np.clip(np.round(rng.normal(4.5, 0.4, n_rows) * 10), 10, 50).astype(int)
+    rating = np.where(reviews > 0, RATING_LABELS[tenths - 10], 'N/A')
+    return reviews, rating
+
+def generate_chunk(profile, n_rows, rng, first_id, placeholder_reviews=False, na_price_rate=None, missing_name_rate=None):
+    """`n_rows` raw scrape rows, with product IDs first_id .. first_id + n_rows - 1 in random order."""
+    category_codes = rng.choice(len(profile.categories), size=n_rows, p=profile.shares)
+    names = np.empty(n_rows, dtype=object)
+    slugs = np.empty(n_rows, dtype=object)
+    dollars = np.empty(n_rows)
+    cents = np.empty(n_rows, dtype=int)
+    na_price = np.empty(n_rows, dtype=bool)
+    missing_name = np.empty(n_rows, dtype=bool)
+    suffixes = np.empty(n_rows, dtype=object)
+
+    for code, category in enumerate(profile.categories):
+        rows = np.flatnonzero(category_codes == code)
+        if rows.size == 0:
+            continue
+        p = profile.per_category[category]
+        counts = rng.choice(p['word_counts'], size=rows.size)
+        word_ids = rng.choice(len(p['vocabulary']), size=int(counts.sum()), p=p['word_p'])
+        words, slug_parts = p['vocabulary'][word_ids].tolist(), p['slug_parts'][word_ids].tolist()
+        bounds = list(zip((np.cumsum(counts) - counts).tolist(), np.cumsum(counts).tolist()))
+        # Slugs are joined from per-word slugs, which is much faster than a regex over every name
+        names[rows] = [' '.join(words[start:end]) for start, end in bounds]
+        slugs[rows] = [''.join(slug_parts[start:end]).rstrip('-') for start, end in bounds]
+        picks = rng.integers(len(p['dollars']), size=rows.size)
+        dollars[rows] = np.floor(p['dollars'][picks] * rng.lognormal(0.0, PRICE_JITTER, rows.size))
+        cents[rows] = rng.choice(p['cents'], size=rows.size)
+        na_price[rows] = rng.random(rows.size) < (p['na_price_rate'] if na_price_rate is None else na_price_rate)
+        missing_name[rows] = rng.random(rows.size) < (p['missing_name_rate'] if missing_name_rate is None else missing_name_rate)
+        suffixes[rows] = rng.choice(p['url_suffixes'], size=rows.size)
+
+    product_ids = pd.Series(first_id + rng.permutation(n_rows)).astype(str)
+    urls = profile.url_host + pd.Series(slugs) + '-p-' + product_ids + pd.Series(suffixes)
+    prices = pd.Series(dollars + cents / 100).map('US${:.2f}'.format)
+    prices[na_price] = 'N/A'
+
+    if placeholder_reviews:
+        reviews, rating = np.zeros(n_rows, dtype='int64'), np.full(n_rows, 'N/A', dtype=object)
+    else:
+        reviews, rating = synthetic_reviews(rng, n_rows)
+    return pd.DataFrame({
+        'Category': profile.categories[category_codes],
+        'Name': pd.Series(names).where(~missing_name),
+        'Price': prices,
+        'Rating': rating,
+        'Reviews': reviews,
+        'URL': urls,
+    })
+
+def iter_catalog(n_rows, seed=42, chunksize=CHUNK_SIZE, profile=None, **options):
+    """Yields `n_rows` synthetic raw rows in chunks; the same seed gives the same rows.
+
+    Product IDs continue after the largest ID in the real scrape and are
+    unique across the whole catalog. `options` go to generate_chunk().
+    """
+    profile = profile or CatalogProfile.from_file()
+    rng = np.random.default_rng(seed)
+    next_id = profile.first_product_id
+    for start in range(0, n_rows, chunksize):
+        size = min(chunksize, n_rows - start)
+        chunk = generate_chunk(profile, size, rng, next_id, **options)
+        chunk.index = pd.RangeIndex(start, start + size)
+        next_id += size
+        yield chunk
+
+def generate_catalog(n_rows, seed=42, chunksize=CHUNK_SIZE, profile=None, **options):
+    """The whole synthetic catalog as one DataFrame (see iter_catalog())."""
+    chunks = list(iter_catalog(n_rows, seed, chunksize, profile, **options))
+    if not chunks:
+        return pd.DataFrame(columns=['Category', 'Name', 'Price', 'Rating', 'Reviews', 'URL'])
+    return pd.concat(chunks)
+
+def write_catalog(n_rows, file_path, seed=42, chunksize=CHUNK_SIZE, profile=None, **options):
+    """Streams the synthetic catalog to a CSV shaped like the scraper's output; one chunk in memory at a time."""
+    with open(file_path, 'w', encoding='utf-8', newline='') as out:
+        for i, chunk in enumerate(iter_catalog(n_rows, seed, chunksize, profile, **options)):
+            chunk.to_csv(out, header=i == 0, index=False)
+    return n_rows
+
+# --- 3. Fidelity Check ---
+def compare_profiles(real, synthetic):
+    """Side-by-side shape statistics of the real and the synthetic raw data."""
+    def describe(df):
+        names = df['Name'].dropna()
+        prices = pd.to_numeric(df['Price'].str.replace('US$', '', regex=False), errors='coerce')
+        return {
+            'name_chars_median': names.str.len().median(),
+            'name_words_mean': names.str.split().str.len().mean(),
+            'price_median': prices.median(),
+            'price_p90': prices.quantile(0.9),
+            'price_na_share': (df['Price'] == 'N/A').mean(),
+            'price_us_prefix_share': df['Price'].str.startswith('US$').mean(),
+            'url_product_id_share': df['URL'].str.contains(r'-p-\d+\.html', regex=True).mean(),
+            **{f'share_{cat}': share for cat, share in df['Category'].value_counts(normalize=True).items()},
+        }
+    return pd.DataFrame({'real': describe(real), 'synthetic': describe(synthetic)})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate realistic raw scrape rows at any size, sampled from the real scrape.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of rows to generate.")
+    parser.add_argument("--output", default="banggood_synthetic_catalog.csv", help="CSV file to write.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="Rows generated and written at a time.")
+    parser.add_argument("--placeholder-reviews", action="store_true", help="Write 'N/A' ratings and 0 reviews, exactly like the scraper.")
+    args = parser.parse_args()
+
+    profile = CatalogProfile.from_file()
+    print(f"⏳ Generating {args.rows:,} rows into '{args.output}'...")
+    write_catalog(args.rows, args.output, args.seed, args.chunksize, profile, placeholder_reviews=args.placeholder_reviews)
+    print(f"✅ Wrote {args.rows:,} rows to '{args.output}'.")
+
+    sample = next(iter_catalog(min(args.rows, CHUNK_SIZE), args.seed, profile=profile), None)
+    if sample is not None:
+        real = pd.read_csv(RAW_FILE, dtype=str, keep_default_na=False)
+        print("\n--- Real vs Synthetic (first chunk) ---")
+        print(compare_profiles(real, sample).round(3).to_string())
\ No newline at end of file
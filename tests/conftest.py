@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+# The scripts live at the repository root and import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import instrumentation
+
+@pytest.fixture(autouse=True, scope='session')
+def test_logs(tmp_path_factory):
+    """Sends code_log.txt and the event log of the code under test to a temp dir, not the repository."""
+    log_dir = tmp_path_factory.mktemp('logs')
+    saved = instrumentation.TEXT_LOG_FILE, instrumentation.EVENT_LOG_FILE
+    instrumentation.TEXT_LOG_FILE = str(log_dir / 'code_log.txt')
+    instrumentation.EVENT_LOG_FILE = str(log_dir / 'pipeline_events.jsonl')
+    yield log_dir
+    instrumentation.flush()  # Lines queued before the paths are restored still go to log_dir
+    instrumentation.TEXT_LOG_FILE, instrumentation.EVENT_LOG_FILE = saved
@@ -0,0 +1,50 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from banggood_crawler import crawl_all
+from fixture_server import fixture_categories, start_fixture_server
+
+FIXTURE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "banggood_5_categories.csv")
+PAGE_SIZE = 7
+
+def no_browser():
+    raise AssertionError("The HTTP backend should not need Chrome for the fixture pages.")
+
+@pytest.fixture
+def paginated_site():
+    """(categories, source rows as str) of a fixture server with PAGE_SIZE cards per page."""
+    server, base_url = start_fixture_server(FIXTURE_FILE, page_size=PAGE_SIZE)
+    yield fixture_categories(base_url, FIXTURE_FILE), pd.read_csv(FIXTURE_FILE, dtype=str, keep_default_na=False)
+    server.shutdown()
+
+def crawl(categories, tmp_path, max_pages=None):
+    return crawl_all(categories, output_file=str(tmp_path / 'crawl.csv'), checkpoint_file=str(tmp_path / 'checkpoint.json'),
+                     max_pages=max_pages, max_workers=2, min_interval=0, driver_factory=no_browser, backend='http')
+
+def test_complete_crawl_matches_source(paginated_site, tmp_path):
+    categories, expected = paginated_site
+    rows = crawl(categories, tmp_path)
+    assert rows == expected['Category'].value_counts().to_dict()
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'crawl.csv', dtype=str, keep_default_na=False), expected)
+    assert not (tmp_path / 'checkpoint.json').exists()
+
+def test_resumed_crawl_writes_no_duplicates(paginated_site, tmp_path):
+    """Stop after two pages per category, lose a half-written page, then resume to the end."""
+    categories, expected = paginated_site
+    rows = crawl(categories, tmp_path, max_pages=2)
+    totals = expected['Category'].value_counts()
+    assert rows == {cat: min(2 * PAGE_SIZE, totals[cat]) for cat in categories}
+    state = json.loads((tmp_path / 'checkpoint.json').read_text())
+    assert len(state['done']) == 2 * len(categories)
+
+    # A crash while appending a page leaves rows the checkpoint doesn't cover
+    with open(tmp_path / 'crawl.csv', 'a', encoding='utf-8') as f:
+        f.write(expected.iloc[[0]].to_csv(header=False, index=False))
+
+    assert crawl(categories, tmp_path) == totals.to_dict()
+    crawled = pd.read_csv(tmp_path / 'crawl.csv', dtype=str, keep_default_na=False)
+    assert not crawled.duplicated().any()
+    pd.testing.assert_frame_equal(crawled, expected)
@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+
+from banggood_scraper import extract_all, parse_cards_bs4, parse_cards_lxml
+from fixture_server import fixture_categories, load_fixture_rows, render_category_page, start_fixture_server
+
+FIXTURE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "banggood_5_categories.csv")
+
+# Card markup the fixture pages don't use: the alt/.p-wrap/.price-box fallbacks, relative and missing links
+EDGE_CASE_PAGE = """<html><body>
+<div class="p-wrap"><a href="/Relative-Item-p-42.html"><img alt="Alt &amp; only name"></a><span class="price-box"> US$1.00 </span></div>
+<div class="p-wrap"><span class="name">No link, no name</span></div>
+<div class="p-wrap"><img alt="Image without link"><span class="price">US$2.50</span></div>
+<div class="p-wrap"><a href="https://www.banggood.com/Full-p-7.html" title="Titled"><img alt="Ignored alt"></a></div>
+</body></html>"""
+
+def no_browser():
+    raise AssertionError("The HTTP backend should not need Chrome for the fixture pages.")
+
+@pytest.fixture(scope='module')
+def fixture_site():
+    """(base_url, source rows as str) of a fixture server over the tracked scrape."""
+    server, base_url = start_fixture_server(FIXTURE_FILE)
+    yield base_url, pd.read_csv(FIXTURE_FILE, dtype=str, keep_default_na=False)
+    server.shutdown()
+
+@pytest.mark.parametrize('max_workers', [1, 3])
+def test_http_extraction_returns_every_category(fixture_site, max_workers):
+    """Every card of every category comes back, categories in the order they were given."""
+    base_url, expected = fixture_site
+    categories = fixture_categories(base_url, FIXTURE_FILE)
+    df = extract_all(categories, max_workers=max_workers, min_interval=0, driver_factory=no_browser, backend='http')
+
+    assert list(df['Category'].unique()) == list(categories)
+    assert df['Category'].value_counts().to_dict() == expected['Category'].value_counts().to_dict()
+    pd.testing.assert_frame_equal(df[expected.columns].reset_index(drop=True), expected)
+
+def test_failed_category_is_skipped(fixture_site):
+    base_url, expected = fixture_site
+    categories = {'Missing': f"{base_url}/Missing.html", **fixture_categories(base_url, FIXTURE_FILE)}
+    # The 404 page has no cards, so the HTTP backend hands it to Chrome, which fails here
+    df = extract_all(categories, max_workers=2, min_interval=0, driver_factory=no_browser, backend='http')
+    assert 'Missing' not in set(df['Category'])
+    assert len(df) == len(expected)
+
+@pytest.mark.parametrize('category', list(load_fixture_rows(FIXTURE_FILE)))
+def test_lxml_parser_matches_bs4_on_fixture_pages(category):
+    pytest.importorskip('lxml')
+    page_html = render_category_page(category, load_fixture_rows(FIXTURE_FILE)[category])
+    assert parse_cards_lxml(page_html, category) == parse_cards_bs4(page_html, category)
+
+def test_lxml_parser_matches_bs4_on_fallback_markup():
+    pytest.importorskip('lxml')
+    rows = parse_cards_bs4(EDGE_CASE_PAGE, 'Edge')
+    assert [row['Name'] for row in rows] == ['Alt & only name', 'Image without link', 'Titled']
+    assert parse_cards_lxml(EDGE_CASE_PAGE, 'Edge') == rows
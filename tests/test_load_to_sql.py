@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+import load_to_sql
+from db_backends import get_backend
+from load_to_sql import (TABLE_NAME, add_product_keys, create_table_schema, delete_products, insert_data_bulk,
+                         validate_insertion)
+
+BACKEND_NAMES = ['sqlite', 'duckdb']
+
+def transformed_frame(n, price=10.0):
+    """`n` rows shaped like banggood_transformed_data.csv, product IDs 1000..1000+n-1."""
+    names = [f"Product {i}" for i in range(n)]
+    df = pd.DataFrame({
+        'Category': ['Tools', 'Toys'] * (n // 2) + ['Tools'] * (n % 2),
+        'Name': names,
+        'Price': price,
+        'Rating': 4.5,
+        'Reviews': range(n),
+        'URL': [f"https://www.banggood.com/Product-{i}-p-{1000 + i}.html?rmmds=search" for i in range(n)],
+        'Price_Segment': 'Low',
+        'Name_Length': [len(name) for name in names],
+        'Price_Per_Char': [price / len(name) for name in names],
+    })
+    return add_product_keys(df)
+
+def table_rows(cursor, where=''):
+    cursor.execute(f"SELECT COUNT(*) FROM {TABLE_NAME} {where}")
+    return cursor.fetchone()[0]
+
+@pytest.fixture(params=BACKEND_NAMES)
+def db(request, tmp_path):
+    """(backend, cursor) on an empty BanggoodProducts table in a fresh database file."""
+    if request.param == 'duckdb':
+        pytest.importorskip('duckdb')
+    backend = get_backend({'backend': request.param, 'path': str(tmp_path / f"test.{request.param}")})
+    conn = backend.connect()
+    cursor = conn.cursor()
+    create_table_schema(cursor, backend=backend)
+    yield backend, cursor
+    conn.close()
+
+@pytest.mark.parametrize('batch_size', [1, 7, 100, 1000])
+@pytest.mark.parametrize('commit_every_batch', [True, False])
+def test_bulk_insert_loads_every_row(db, batch_size, commit_every_batch):
+    backend, cursor = db
+    df = transformed_frame(250)
+    assert insert_data_bulk(cursor, df, batch_size, backend=backend, commit_every_batch=commit_every_batch)
+    assert validate_insertion(cursor, len(df)) == len(df)
+    cursor.execute(f"SELECT SUM(Reviews), COUNT(DISTINCT ProductKey) FROM {TABLE_NAME}")
+    assert tuple(cursor.fetchone()) == (sum(range(250)), 250)
+
+@pytest.mark.parametrize('commit_every_batch, kept', [(True, 60), (False, 0)])
+def test_failing_batch_is_rolled_back(db, commit_every_batch, kept):
+    """Name is NOT NULL: the batch holding row 75 fails; only the batches committed before it stay."""
+    backend, cursor = db
+    df = transformed_frame(100)
+    df.loc[75, 'Name'] = None
+    assert not insert_data_bulk(cursor, df, batch_size=30, backend=backend, commit_every_batch=commit_every_batch)
+    assert table_rows(cursor) == kept
+
+def test_incremental_replace_is_atomic(db):
+    """A failed insert after delete_products() leaves the old rows of the changed products in place."""
+    backend, cursor = db
+    assert insert_data_bulk(cursor, transformed_frame(100), batch_size=30, backend=backend)
+
+    changes = transformed_frame(40, price=20.0)
+    changes.loc[35, 'Name'] = None
+    assert delete_products(cursor, changes) == 40
+    assert not insert_data_bulk(cursor, changes, batch_size=30, backend=backend, commit_every_batch=False)
+    assert table_rows(cursor) == 100
+    assert table_rows(cursor, "WHERE Price = 10") == 100
+
+def test_incremental_main_replaces_changed_products(db, tmp_path, monkeypatch):
+    """main(incremental=True) swaps in the changed rows and makes the pending scrape state current."""
+    backend, cursor = db
+    monkeypatch.chdir(tmp_path)
+    transformed_frame(100).to_csv('transformed.csv', index=False)
+    transformed_frame(40, price=20.0).to_csv('changes.csv', index=False)
+    monkeypatch.setattr(load_to_sql, 'DATA_FILE', 'transformed.csv')
+    monkeypatch.setattr(load_to_sql, 'CHANGES_FILE', 'changes.csv')
+    cursor.connection.commit()
+
+    assert load_to_sql.main(bulk=True, batch_size=30, backend=backend)
+    (tmp_path / 'product_state.pending.json').write_text('{}')
+    assert load_to_sql.main(incremental=True, bulk=True, batch_size=30, backend=backend)
+
+    assert table_rows(cursor) == 100
+    assert table_rows(cursor, "WHERE Price = 20") == 40
+    assert (tmp_path / 'product_state.json').exists()
+    assert not (tmp_path / 'product_state.pending.json').exists()